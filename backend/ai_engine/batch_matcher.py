@@ -0,0 +1,171 @@
+import multiprocessing
+import os
+from collections import deque
+
+import numpy as np
+
+
+# Memory one block's score arrays may take; sets how many resumes go in a block
+BATCH_MATCH_BLOCK_MB = int(os.environ.get('BATCH_MATCH_BLOCK_MB', '64'))
+# Worker processes scoring blocks; 1 scores them in the calling process
+BATCH_MATCH_WORKERS = int(os.environ.get('BATCH_MATCH_WORKERS', str(min(4, os.cpu_count() or 1))))
+
+# Bytes per resume/job cell across the arrays a block holds at once: the
+# jobs x 4 component array plus the text and skill scores it is built from
+# and the sparse product behind the text scores
+_BYTES_PER_CELL = 64
+_MAX_BLOCK_SIZE = 1024
+
+_worker_batch = None
+
+
+def _init_worker(batch):
+    """Set up a pool process with the batch it was forked from"""
+    global _worker_batch
+    _worker_batch = batch
+
+
+def _score_block_in_worker(block):
+    """Runs in a pool process: winners for one block of resumes"""
+    return _worker_batch.score_block(block)
+
+
+class BatchMatcher:
+    """Matches many resumes against every job, a block of resumes at a time.
+
+    Each block is scored against all jobs with one sparse matrix-matrix
+    product for text and one for skills (JobIndex.score_block), so a block
+    costs about as much as a single resume; experience and education only
+    depend on each job's requirement and are scored once per distinct
+    resume value. Rankings are identical to JobMatcher.rank_jobs.
+
+    Block size follows from BATCH_MATCH_BLOCK_MB and the number of jobs,
+    which bounds the memory each block needs. Blocks are scored in a pool of
+    forked worker processes that share the job index with the parent
+    copy-on-write; only the resumes go out and only the top k winners per
+    resume come back. Results are yielded in input order as blocks finish,
+    with at most two blocks per worker in flight, so the input can be a
+    generator over more resumes than fit in memory.
+    """
+
+    def __init__(self, matcher, jobs_data, job_index=None, top_k=10, weights=None, block_size=None,
+                 workers=None, start_method='fork'):
+        self.matcher = matcher
+        self.jobs = list(jobs_data)
+        self.top_k = top_k
+        self.weight_vector = matcher.weight_vector(weights)
+        self.weights_used = matcher.weights_dict(self.weight_vector)
+        self.workers = BATCH_MATCH_WORKERS if workers is None else workers
+        # Workers inherit the index by forking; without fork they would need it pickled
+        self.start_method = start_method if start_method in multiprocessing.get_all_start_methods() else None
+
+        if job_index is None or any(job['id'] not in job_index for job in self.jobs):
+            job_index = matcher.build_job_index(self.jobs)
+        self.job_index = job_index
+        # One snapshot for the whole batch, so every block sees the same jobs;
+        # when they are only part of the index the others are left out of it
+        self.snapshot = job_index.snapshot()
+        if len(self.jobs) < len(self.snapshot.job_ids):
+            self.snapshot = job_index.narrow(self.snapshot, [job['id'] for job in self.jobs])
+        positions = {job_id: i for i, job_id in enumerate(self.snapshot.job_ids)}
+        self.columns = np.array([positions[job['id']] for job in self.jobs], dtype=np.int64)
+
+        self.block_size = block_size or max(1, min(
+            _MAX_BLOCK_SIZE, BATCH_MATCH_BLOCK_MB * 1024 * 1024 // (_BYTES_PER_CELL * max(1, len(self.jobs)))
+        ))
+
+        self._experience = self._requirements('min_experience_years', 0)
+        self._education = self._requirements('education_required', '')
+
+    def _requirements(self, field, default):
+        # Distinct requirement values, and for every job the index of its own
+        values, keys, inverse = [], {}, []
+        for job in self.jobs:
+            value = job.get(field, default)
+            key = repr(value)
+            if key not in keys:
+                keys[key] = len(values)
+                values.append(value)
+            inverse.append(keys[key])
+        return values, np.array(inverse, dtype=np.int64), {}
+
+    def _requirement_scores(self, requirements, similarity, resume_value):
+        # Similarity of one resume value against every job, via its distinct requirements
+        values, inverse, memo = requirements
+        key = repr(resume_value)
+        if key not in memo:
+            memo[key] = np.array([similarity(resume_value, value) for value in values])[inverse]
+        return memo[key]
+
+    def _blocks(self, resumes_data):
+        block = []
+        for resume in resumes_data:
+            block.append(resume)
+            if len(block) == self.block_size:
+                yield block
+                block = []
+        if block:
+            yield block
+
+    def score_block(self, resumes):
+        """(row, match percentage, component row) of the top k jobs for each resume in a block"""
+        n_jobs = len(self.jobs)
+        if not n_jobs:
+            return [[] for _ in resumes]
+        components = np.empty((len(resumes), n_jobs, len(self.matcher.COMPONENTS)))
+
+        _, text_scores, skill_scores = self.job_index.score_block(
+            [resume.get('raw_text', '') for resume in resumes],
+            [resume.get('extracted_skills', []) for resume in resumes],
+            snapshot=self.snapshot
+        )
+        components[:, :, 0] = text_scores[:, self.columns]
+        components[:, :, 1] = skill_scores[:, self.columns]
+        del text_scores, skill_scores
+
+        winners = []
+        for i, resume in enumerate(resumes):
+            components[i, :, 2] = self._requirement_scores(
+                self._experience, self.matcher.calculate_experience_similarity, resume.get('total_experience_years', 0)
+            )
+            components[i, :, 3] = self._requirement_scores(
+                self._education, self.matcher.calculate_education_similarity, resume.get('education', '')
+            )
+            match_percentages = self.matcher.weighted_scores(components[i], self.weight_vector)
+            winners.append([
+                (int(row), float(match_percentages[row]), components[i, row].copy())
+                for row in self.matcher.rank_order(match_percentages, self.top_k)
+            ])
+        return winners
+
+    def _results(self, resumes, winners):
+        # Skill lists are worked out here, for the winners only
+        for resume, resume_winners in zip(resumes, winners):
+            resume_skills = resume.get('extracted_skills', [])
+            yield {
+                'resume_id': resume.get('id'),
+                'matched_jobs': [
+                    self.matcher.ranked_job(self.job_index, resume_skills, self.jobs[row], match_percentage,
+                                            component_row, self.weights_used)
+                    for row, match_percentage, component_row in resume_winners
+                ]
+            }
+
+    def iter_matches(self, resumes_data):
+        """Yield {'resume_id', 'matched_jobs'} for every resume, in input order, as blocks finish"""
+        if self.workers <= 1 or self.start_method is None:
+            for block in self._blocks(resumes_data):
+                yield from self._results(block, self.score_block(block))
+            return
+
+        context = multiprocessing.get_context(self.start_method)
+        with context.Pool(processes=self.workers, initializer=_init_worker, initargs=(self,)) as pool:
+            pending = deque()
+            for block in self._blocks(resumes_data):
+                pending.append((block, pool.apply_async(_score_block_in_worker, (block,))))
+                if len(pending) >= 2 * self.workers:
+                    block, result = pending.popleft()
+                    yield from self._results(block, result.get())
+            while pending:
+                block, result = pending.popleft()
+                yield from self._results(block, result.get())
@@ -0,0 +1,254 @@
+import os
+import shutil
+import struct
+import subprocess
+import tempfile
+import threading
+
+
+# antiword binary; set RESUME_ANTIWORD_PATH to an empty string to always use
+# the built-in reader
+ANTIWORD_PATH = os.environ.get('RESUME_ANTIWORD_PATH', 'antiword')
+ANTIWORD_TIMEOUT = int(os.environ.get('RESUME_ANTIWORD_TIMEOUT', 10))  # seconds per document
+ANTIWORD_MAX_PROCESSES = int(os.environ.get('RESUME_ANTIWORD_PROCESSES', 2))  # concurrent converters per process
+
+# Caps the antiword processes this process can have running at once, however
+# many request or batch threads are extracting .doc files
+_antiword_slots = threading.BoundedSemaphore(max(1, ANTIWORD_MAX_PROCESSES))
+
+OLE_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+WORD_IDENT = 0xA5EC
+
+# FAT entries at or above this mark free sectors and chain ends
+_MAX_REGULAR_SECTOR = 0xFFFFFFFA
+
+
+class DocFormatError(Exception):
+    """Raised when a file is not a readable Word 97-2003 document"""
+
+
+def _u16(data, offset):
+    return struct.unpack_from('<H', data, offset)[0]
+
+
+def _u32(data, offset):
+    return struct.unpack_from('<I', data, offset)[0]
+
+
+class OleReader:
+    """Minimal reader for OLE2 compound files (the .doc container).
+
+    Only what is needed to pull named streams out of the file: the FAT (via
+    the header and DIFAT sectors), the directory, and the mini stream for
+    small streams. Every sector chain is bounded by the number of sectors in
+    the file, so a corrupt or hostile file cannot loop forever.
+    """
+
+    def __init__(self, data):
+        if len(data) < 512 or data[:8] != OLE_SIGNATURE:
+            raise DocFormatError("Not an OLE2 compound file")
+        self.data = data
+        self.sector_size = 1 << _u16(data, 0x1E)
+        self.mini_sector_size = 1 << _u16(data, 0x20)
+        self.mini_cutoff = _u32(data, 0x38)
+        if self.sector_size not in (512, 4096) or self.mini_sector_size != 64:
+            raise DocFormatError("Unsupported sector size")
+        self.sector_count = max(0, (len(data) - self.sector_size) // self.sector_size)
+
+        self.fat = self._read_fat()
+        self.entries = self._read_directory(_u32(data, 0x30))
+        if not self.entries:
+            raise DocFormatError("Empty directory")
+
+        root = self.entries[0]
+        self.mini_stream = self._read_chain(root['start'], self.fat, self.sector_size)[:root['size']]
+        self.mini_fat = self._read_table(self._read_chain(_u32(data, 0x3C), self.fat, self.sector_size))
+
+    def _sector(self, number):
+        offset = (number + 1) * self.sector_size
+        return self.data[offset:offset + self.sector_size]
+
+    @staticmethod
+    def _read_table(raw):
+        return struct.unpack(f'<{len(raw) // 4}I', raw[:len(raw) // 4 * 4])
+
+    def _read_fat(self):
+        fat_count = _u32(self.data, 0x2C)
+        fat_sectors = list(self._read_table(self.data[0x4C:0x200]))
+
+        # Header holds the first 109 FAT sector numbers; the rest live in a
+        # chain of DIFAT sectors
+        per_sector = self.sector_size // 4 - 1
+        difat = _u32(self.data, 0x44)
+        for _ in range(min(_u32(self.data, 0x48), self.sector_count)):
+            if difat >= _MAX_REGULAR_SECTOR:
+                break
+            entries = self._read_table(self._sector(difat))
+            fat_sectors.extend(entries[:per_sector])
+            difat = entries[per_sector]
+
+        fat_sectors = [sector for sector in fat_sectors if sector < _MAX_REGULAR_SECTOR][:fat_count]
+        return self._read_table(b''.join(self._sector(sector) for sector in fat_sectors))
+
+    def _chain(self, start, table):
+        sector = start
+        for _ in range(len(table) + 1):
+            if sector >= _MAX_REGULAR_SECTOR or sector >= len(table):
+                return
+            yield sector
+            sector = table[sector]
+        raise DocFormatError("Sector chain does not terminate")
+
+    def _read_chain(self, start, table, sector_size):
+        if sector_size == self.sector_size:
+            return b''.join(self._sector(sector) for sector in self._chain(start, table))
+        return b''.join(self.mini_stream[sector * sector_size:(sector + 1) * sector_size]
+                        for sector in self._chain(start, table))
+
+    def _read_directory(self, start):
+        raw = self._read_chain(start, self.fat, self.sector_size)
+        entries = []
+        for offset in range(0, len(raw) - 127, 128):
+            name_length = _u16(raw, offset + 64)
+            entries.append({
+                'name': raw[offset:offset + max(0, name_length - 2)].decode('utf-16-le', errors='replace'),
+                'type': raw[offset + 66],
+                'start': _u32(raw, offset + 116),
+                'size': _u32(raw, offset + 120),
+            })
+        return entries
+
+    def stream(self, name):
+        """Contents of the named stream"""
+        for entry in self.entries:
+            if entry['type'] == 2 and entry['name'] == name:
+                if entry['size'] < self.mini_cutoff:
+                    raw = self._read_chain(entry['start'], self.mini_fat, self.mini_sector_size)
+                else:
+                    raw = self._read_chain(entry['start'], self.fat, self.sector_size)
+                return raw[:entry['size']]
+        raise DocFormatError(f"Stream {name} not found")
+
+
+def _strip_word_markup(text):
+    """Turn Word's in-text control characters into plain text"""
+    output = []
+    fields = []  # per open field: True while reading its instruction code
+    for char in text:
+        if char == '\x13':  # field begin
+            fields.append(True)
+        elif char == '\x14':  # field separator: the displayed result follows
+            if fields:
+                fields[-1] = False
+        elif char == '\x15':  # field end
+            if fields:
+                fields.pop()
+        elif fields and fields[-1]:
+            continue
+        elif char in '\r\x07\x0b\x0c':  # paragraph, cell, line and page breaks
+            output.append('\n')
+        elif char == '\x1e':  # non-breaking hyphen
+            output.append('-')
+        elif char == '\t' or char >= ' ':
+            output.append(char)
+    return ''.join(output)
+
+
+def ole_doc_text(data, max_chars=None):
+    """Main document text of a Word 97-2003 file, read in pure Python
+
+    Follows the piece table (the Clx in the table stream) so both 8-bit and
+    UTF-16 text pieces are decoded in document order.
+    """
+    ole = OleReader(data)
+    word = ole.stream('WordDocument')
+    if len(word) < 0x1AA or _u16(word, 0) != WORD_IDENT:
+        raise DocFormatError("Not a Word 97-2003 document")
+
+    flags = _u16(word, 0x0A)
+    if flags & 0x0100:
+        raise DocFormatError("Document is encrypted")
+    table = ole.stream('1Table' if flags & 0x0200 else '0Table')
+
+    text_length = _u32(word, 0x4C)  # ccpText: characters in the main document
+    if max_chars is not None:
+        text_length = min(text_length, max_chars)
+    clx_offset, clx_length = _u32(word, 0x1A2), _u32(word, 0x1A6)
+    clx = table[clx_offset:clx_offset + clx_length]
+
+    # Skip any property modifiers (Prc) in front of the piece table (Pcdt)
+    position = 0
+    while position + 3 <= len(clx) and clx[position] == 0x01:
+        position += 3 + _u16(clx, position + 1)
+    if position + 5 > len(clx) or clx[position] != 0x02:
+        raise DocFormatError("Piece table not found")
+    plc_length = _u32(clx, position + 1)
+    plc = clx[position + 5:position + 5 + plc_length]
+
+    n_pieces = (len(plc) - 4) // 12
+    positions = struct.unpack_from(f'<{n_pieces + 1}I', plc, 0)
+    pieces = []
+    remaining = text_length
+    for index in range(n_pieces):
+        length = min(positions[index + 1] - positions[index], remaining)
+        if length <= 0:
+            break
+        fc = _u32(plc, 4 * (n_pieces + 1) + 8 * index + 2)
+        if fc & 0x40000000:
+            # Compressed piece: one cp1252 byte per character
+            start = (fc & 0x3FFFFFFF) // 2
+            pieces.append(word[start:start + length].decode('cp1252', errors='replace'))
+        else:
+            pieces.append(word[fc:fc + 2 * length].decode('utf-16-le', errors='replace'))
+        remaining -= length
+
+    return _strip_word_markup(''.join(pieces))
+
+
+def antiword_text(file_path, timeout=None):
+    """Run antiword on a file, holding one of the process slots
+
+    Returns None when antiword is unavailable, busy for longer than the
+    timeout, fails, or runs out of time; the process is killed on timeout.
+    """
+    executable = shutil.which(ANTIWORD_PATH) if ANTIWORD_PATH else None
+    if executable is None:
+        return None
+
+    timeout = timeout or ANTIWORD_TIMEOUT
+    if not _antiword_slots.acquire(timeout=timeout):
+        print("All antiword slots busy, using the built-in .doc reader")
+        return None
+    try:
+        result = subprocess.run([executable, file_path], capture_output=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        print(f"antiword exceeded {timeout} seconds, using the built-in .doc reader")
+        return None
+    finally:
+        _antiword_slots.release()
+
+    if result.returncode != 0 or not result.stdout.strip():
+        return None
+    return result.stdout.decode('utf-8', errors='replace')
+
+
+def extract_doc_text(source, max_chars=None):
+    """Text of a .doc file given as a path or bytes: antiword, else the built-in reader"""
+    if isinstance(source, (str, os.PathLike)):
+        text = antiword_text(source)
+        if text is None:
+            with open(source, 'rb') as f:
+                text = ole_doc_text(f.read(), max_chars)
+    else:
+        data = bytes(source)
+        text = None
+        if ANTIWORD_PATH and shutil.which(ANTIWORD_PATH):
+            # antiword only reads from a file on disk
+            with tempfile.NamedTemporaryFile(suffix='.doc') as tmp:
+                tmp.write(data)
+                tmp.flush()
+                text = antiword_text(tmp.name)
+        if text is None:
+            text = ole_doc_text(data, max_chars)
+
+    return text[:max_chars] if max_chars else text
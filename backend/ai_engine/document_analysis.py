@@ -0,0 +1,133 @@
+from functools import cached_property
+
+from ai_engine import patterns
+from ai_engine.patterns import segment_sections, section_text
+
+
+def clean_text(text):
+    """Collapse whitespace and drop control characters"""
+    # Remove extra whitespaces
+    text = patterns.WHITESPACE.sub(' ', text)
+
+    # Remove special characters but keep essential ones
+    text = patterns.CONTROL_CHARS.sub('', text)
+
+    return text.strip()
+
+
+def find_contact_info(text):
+    """First email, phone, address and LinkedIn URL in the text"""
+    contact_info = {}
+    for field, pattern in (('email', patterns.EMAIL), ('phone', patterns.PHONE),
+                           ('address', patterns.ADDRESS), ('linkedin', patterns.LINKEDIN)):
+        match = pattern.search(text)
+        if match:
+            contact_info[field] = match.group(0)
+    return contact_info
+
+
+class DocumentAnalysis:
+    """Everything derived from one resume text, computed at most once.
+
+    The parser, analyze_resume_sections and calculate_ats_score used to
+    lowercase, split and regex-scan the same text independently. Each of them
+    now reads from one DocumentAnalysis per resume: every derived view is
+    computed the first time it is asked for and memoized for the rest of the
+    request. `passes` records the whole-text computations that actually ran.
+    """
+
+    # Leading characters of the cleaned text searched for contact details
+    CONTACT_REGION_CHARS = 1000
+
+    def __init__(self, text, cleaned_text=None, section_spans=None, contact_info=None):
+        self.text = text or ""
+        self.passes = []
+        # Seed views that were already computed elsewhere (e.g. by the parser,
+        # possibly in another process or a cached parse result)
+        if cleaned_text is not None:
+            self.__dict__['cleaned_text'] = cleaned_text
+        if section_spans is not None:
+            self.__dict__['section_spans'] = section_spans
+        if contact_info is not None:
+            self.__dict__['contact_info'] = contact_info
+        self._keywords = {}
+
+    @classmethod
+    def from_parsed(cls, parsed_data):
+        """Rebuild the analysis of a ResumeParser result without redoing its work"""
+        return cls(
+            parsed_data['raw_text'],
+            cleaned_text=parsed_data.get('cleaned_text'),
+            section_spans=parsed_data.get('section_spans'),
+            contact_info=parsed_data.get('contact_info')
+        )
+
+    @cached_property
+    def lower(self):
+        self.passes.append('lower')
+        return self.text.lower()
+
+    @cached_property
+    def tokens(self):
+        """Whitespace-delimited tokens of the text"""
+        self.passes.append('tokens')
+        return self.text.split()
+
+    @cached_property
+    def cleaned_text(self):
+        self.passes.append('cleaned_text')
+        return clean_text(self.text)
+
+    @cached_property
+    def section_spans(self):
+        """Section -> [start, end] offsets into `text`"""
+        self.passes.append('section_spans')
+        return segment_sections(self.text)
+
+    @cached_property
+    def sections(self):
+        """Section -> content, for the sections present in the text"""
+        return {section: section_text(self.text, self.section_spans, section) for section in self.section_spans}
+
+    @cached_property
+    def contact_info(self):
+        """Email, phone, address and LinkedIn URL found in the cleaned text
+
+        Contact details sit at the top of almost every resume, so only the
+        first CONTACT_REGION_CHARS are scanned; the whole text is scanned
+        only when that region holds none of them.
+        """
+        text = self.cleaned_text
+
+        # End the region on a space so no email or URL is cut in half
+        region_end = text.find(' ', self.CONTACT_REGION_CHARS)
+        if region_end == -1:
+            region_end = len(text)
+
+        self.passes.append('contact_info.region')
+        contact_info = find_contact_info(text[:region_end])
+        if not contact_info and region_end < len(text):
+            self.passes.append('contact_info.full')
+            contact_info = find_contact_info(text)
+        return contact_info
+
+    @cached_property
+    def structure_indicators(self):
+        """Which of the ATS structure indicators (years, names, months, ...) appear"""
+        indicators = []
+        for indicator in patterns.ATS_STRUCTURE_INDICATORS:
+            self.passes.append('structure_indicators')
+            indicators.append(indicator.search(self.text) is not None)
+        return indicators
+
+    @property
+    def word_count(self):
+        return len(self.tokens)
+
+    def contains(self, keyword):
+        """Case-insensitive substring test, memoized per keyword"""
+        keyword = keyword.lower()
+        if keyword not in self._keywords:
+            self.passes.append(f'contains.{keyword}')
+            self._keywords[keyword] = keyword in self.lower
+        return self._keywords[keyword]
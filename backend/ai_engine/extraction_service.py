@@ -0,0 +1,169 @@
+import itertools
+import multiprocessing
+import os
+import signal
+import threading
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from ai_engine.resume_parser import ResumeParser
+
+
+class ExtractionError(Exception):
+    """Raised when a document could not be extracted"""
+
+
+class ExtractionTimeout(ExtractionError):
+    """Raised when a document takes longer than the allowed wall-clock time"""
+
+
+class _WorkerAlarm(BaseException):
+    # Derives from BaseException so the broad `except Exception` blocks in
+    # ResumeParser cannot swallow it
+    pass
+
+
+_worker_parser = None
+_worker_started = None
+_worker_timeout = None
+
+
+def _on_alarm(signum, frame):
+    raise _WorkerAlarm()
+
+
+def _init_worker(started_queue, timeout, memory_limit_bytes):
+    """Set up a pool process: memory cap, alarm handler and its own parser"""
+    global _worker_parser, _worker_started, _worker_timeout
+    _worker_started = started_queue
+    _worker_timeout = timeout
+    _worker_parser = ResumeParser()
+
+    if memory_limit_bytes and resource is not None:
+        # Cap the address space so a pathological document fails with
+        # MemoryError instead of growing the worker without bound
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit_bytes, memory_limit_bytes))
+
+    signal.signal(signal.SIGALRM, _on_alarm)
+
+
+def _describe(source):
+    return os.path.basename(source) if isinstance(source, (str, os.PathLike)) else 'document'
+
+
+def _extract_in_worker(token, file_path, file_extension):
+    """Runs in a pool process: extract the text of one document (path or bytes)"""
+    # Tell the parent which process holds this task so it can be killed
+    _worker_started.put((token, os.getpid()))
+
+    # The alarm bounds the task even if it sat in the queue before starting
+    signal.alarm(_worker_timeout)
+    try:
+        return _worker_parser.extract_text(file_path, file_extension)
+    except _WorkerAlarm:
+        raise ExtractionTimeout(
+            f"Extraction of {_describe(file_path)} exceeded {_worker_timeout} seconds"
+        )
+    except MemoryError:
+        raise ExtractionError(f"Extraction of {_describe(file_path)} exceeded the memory limit")
+    finally:
+        signal.alarm(0)
+
+
+class ExtractionService:
+    """Runs document text extraction in a bounded pool of worker processes.
+
+    PDF/DOCX/DOC extraction is CPU-bound and a hostile file can spin forever,
+    so it is kept out of the request thread. Each task gets a hard wall-clock
+    timeout, each worker process has a capped address space, and workers are
+    recycled after `max_tasks_per_child` documents to shed leaked memory.
+    """
+
+    # Extra time the caller waits beyond the task timeout, to cover queueing
+    # behind other documents and worker start-up
+    QUEUE_GRACE_SECONDS = 5
+
+    def __init__(self, max_workers=2, timeout=30, memory_limit_mb=1024, max_tasks_per_child=25,
+                 start_method='fork'):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_tasks_per_child = max_tasks_per_child
+        self.start_method = start_method
+        self._pool = None
+        self._started = None
+        self._task_pids = {}
+        self._abandoned = set()
+        self._tokens = itertools.count()
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    context = multiprocessing.get_context(self.start_method)
+                    self._started = context.SimpleQueue()
+                    memory_limit_bytes = self.memory_limit_mb * 1024 * 1024 if self.memory_limit_mb else None
+                    self._pool = context.Pool(
+                        processes=self.max_workers,
+                        initializer=_init_worker,
+                        initargs=(self._started, self.timeout, memory_limit_bytes),
+                        maxtasksperchild=self.max_tasks_per_child
+                    )
+        return self._pool
+
+    def _drain_started(self):
+        with self._lock:
+            while not self._started.empty():
+                token, pid = self._started.get()
+                if token in self._abandoned:
+                    # Timed out before it started; the worker alarm bounds it
+                    self._abandoned.discard(token)
+                    continue
+                self._task_pids[token] = pid
+
+    def _forget(self, token):
+        self._drain_started()
+        with self._lock:
+            return self._task_pids.pop(token, None)
+
+    def extract_text(self, file_path, file_extension=None):
+        """Extract text from a document (path or bytes) in a worker process.
+
+        Raises ExtractionTimeout if the document is not done in time.
+        """
+        if file_extension is None:
+            file_extension = os.path.splitext(file_path)[1].lower()
+
+        token = next(self._tokens)
+        pending = self._get_pool().apply_async(_extract_in_worker, (token, file_path, file_extension))
+        try:
+            return pending.get(self.timeout + self.QUEUE_GRACE_SECONDS)
+        except multiprocessing.TimeoutError:
+            # The alarm did not fire (e.g. stuck in C code): kill the worker
+            # outright, the pool replaces it with a fresh process
+            pid = self._forget(token)
+            if pid is not None:
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+            else:
+                with self._lock:
+                    self._abandoned.add(token)
+            raise ExtractionTimeout(
+                f"Extraction of {_describe(file_path)} exceeded {self.timeout} seconds"
+            )
+        finally:
+            self._forget(token)
+
+    def shutdown(self):
+        """Terminate the worker processes"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.terminate()
+                self._pool.join()
+                self._pool = None
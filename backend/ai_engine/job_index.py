@@ -0,0 +1,585 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from ai_engine.skill_index import SkillVocabulary, normalize_skills, stack_skill_rows
+
+
+# Scoring state for the current set of jobs, rebuilt lazily after changes.
+# Every array is aligned with job_ids; skill_matrix is the binary job x skill
+# matrix over the `skills` vocabulary and skill_counts the number of skills
+# each job requires
+IndexSnapshot = namedtuple('IndexSnapshot', 'job_ids matrix idf row_norms skills skill_matrix skill_counts')
+
+
+class JobIndex:
+    """In-memory TF-IDF index over the descriptions of active jobs.
+
+    Job descriptions are hashed into a fixed feature space, so there is no
+    vocabulary to refit and a single job can be added, replaced or removed
+    without touching the others. Document frequencies are maintained as jobs
+    come and go, and IDF weights are applied at query time, which keeps the
+    scores identical to a from-scratch TF-IDF fit over the current corpus;
+    resume terms no job uses are ignored, as a fitted vocabulary drops them.
+    Scoring a resume is one transform plus one sparse matrix-vector product;
+    a block of resumes is scored with one sparse matrix-matrix product.
+
+    Required skills are interned into integer ids and held as a binary
+    job x skill matrix alongside, so the skills each job has in common with a
+    resume are counted for every job with one more matrix-vector product.
+
+    The scoring state can be saved as a versioned on-disk artifact and loaded
+    back memory-mapped (see `save` and `load`), so a worker starts from the
+    last build instead of re-vectorising every job description.
+    """
+
+    # Bump whenever the artifact layout, the hashing parameters or the text
+    # preprocessing change, so artifacts written by older code are ignored
+    ARTIFACT_VERSION = 4
+    ARTIFACT_ARRAYS = ['data', 'indices', 'indptr', 'df', 'idf', 'row_norms', 'skill_indices', 'skill_indptr']
+
+    def __init__(self, preprocess=None, n_features=2 ** 20):
+        self.preprocess = preprocess or (lambda text: text or "")
+        self.n_features = n_features
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            stop_words='english',
+            ngram_range=(1, 2),
+            lowercase=True,
+            strip_accents='unicode',
+            alternate_sign=False,
+            norm=None
+        )
+        self._lock = threading.RLock()
+        # job_id -> 1 x n_features CSR term counts; None while the rows only
+        # exist inside a loaded artifact's matrix
+        self._rows = {}
+        self._fingerprints = {}
+        self._df = np.zeros(n_features, dtype=np.int32)
+        self.skills = SkillVocabulary()
+        self._skill_rows = {}  # job_id -> sorted skill ids
+        self._snapshot = None
+        self.built_at = None
+        self.updated_at = None
+
+    @staticmethod
+    def fingerprint(description, skills=None):
+        """Cheap change marker for a job's description and required skills, stable across processes"""
+        payload = json.dumps([description or "", sorted(normalize_skills(skills))])
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()
+
+    def _vectorize(self, description):
+        processed = self.preprocess(description)
+        if not processed:
+            return None
+        row = self.vectorizer.transform([processed]).tocsr()
+        row.sum_duplicates()
+        return row if row.nnz else None
+
+    def _add_row(self, job_id, row):
+        self._rows[job_id] = row
+        if row is not None:
+            self._df[row.indices] += 1
+
+    def _drop_row(self, job_id):
+        row = self._rows.pop(job_id, None)
+        if row is not None:
+            self._df[row.indices] -= 1
+
+    def _ensure_rows(self):
+        # A loaded artifact keeps its rows in the read-only mapped matrix; split
+        # them out, with a private copy of the document frequencies, before the
+        # first change
+        if self._rows is None:
+            job_ids, matrix = self._snapshot.job_ids, self._snapshot.matrix
+            indptr = matrix.indptr
+            self._rows = {
+                job_id: matrix[i] if indptr[i + 1] > indptr[i] else None
+                for i, job_id in enumerate(job_ids)
+            }
+            self._df = np.array(self._df)
+
+    def build(self, jobs):
+        """Index all jobs from scratch.
+
+        `jobs` is an iterable of dicts with at least 'id' and 'description', and
+        optionally 'skills_required'.
+        """
+        rows = {}
+        fingerprints = {}
+        df = np.zeros(self.n_features, dtype=np.int32)
+        skills = SkillVocabulary()
+        skill_rows = {}
+        for job in jobs:
+            row = self._vectorize(job.get('description', ''))
+            rows[job['id']] = row
+            fingerprints[job['id']] = self.fingerprint(job.get('description', ''), job.get('skills_required'))
+            skill_rows[job['id']] = skills.intern(job.get('skills_required'))
+            if row is not None:
+                df[row.indices] += 1
+
+        with self._lock:
+            self._rows = rows
+            self._fingerprints = fingerprints
+            self._df = df
+            self.skills = skills
+            self._skill_rows = skill_rows
+            self._snapshot = None
+            self.built_at = self.updated_at = time.time()
+        return self
+
+    def upsert_job(self, job):
+        """Add a job, or replace it if its description or required skills have changed"""
+        fingerprint = self.fingerprint(job.get('description', ''), job.get('skills_required'))
+        if self._fingerprints.get(job['id']) == fingerprint:
+            return False
+
+        # Vectorise outside the lock so readers are not held up by preprocessing;
+        # re-vectorising one description after a skills-only edit is cheap
+        row = self._vectorize(job.get('description', ''))
+        with self._lock:
+            self._ensure_rows()
+            self._drop_row(job['id'])
+            self._add_row(job['id'], row)
+            self._fingerprints[job['id']] = fingerprint
+            self._skill_rows[job['id']] = self.skills.intern(job.get('skills_required'))
+            self._snapshot = None
+            self.updated_at = time.time()
+        return True
+
+    def remove_job(self, job_id):
+        """Drop a job from the index"""
+        with self._lock:
+            if job_id not in self._fingerprints:
+                return False
+            self._ensure_rows()
+            self._drop_row(job_id)
+            self._fingerprints.pop(job_id, None)
+            self._skill_rows.pop(job_id, None)
+            self._snapshot = None
+            self.updated_at = time.time()
+        return True
+
+    def is_current(self, jobs):
+        """Check whether the index holds exactly these jobs, with these descriptions and skills"""
+        if len(self._fingerprints) != len(jobs):
+            return False
+        for job in jobs:
+            if self._fingerprints.get(job['id']) != self.fingerprint(job.get('description', ''), job.get('skills_required')):
+                return False
+        return True
+
+    def ensure_current(self, jobs):
+        """Apply the difference between the index and these jobs"""
+        wanted = {job['id'] for job in jobs}
+        for job_id in set(self._fingerprints) - wanted:
+            self.remove_job(job_id)
+        for job in jobs:
+            self.upsert_job(job)
+        return self
+
+    @property
+    def job_ids(self):
+        if self._rows is None:
+            return list(self._snapshot.job_ids)
+        return list(self._rows.keys())
+
+    def __len__(self):
+        return len(self._fingerprints)
+
+    def __contains__(self, job_id):
+        return job_id in self._fingerprints
+
+    def idf(self):
+        """Smoothed IDF weights for the current corpus, as TfidfVectorizer computes them.
+
+        Terms no job uses get 0: a fitted TfidfVectorizer has no column for
+        them, so they must not count towards a resume's norm either.
+        """
+        n_docs = len(self._fingerprints)
+        idf = np.log((1.0 + n_docs) / (1.0 + self._df)) + 1.0
+        idf[self._df == 0] = 0.0
+        return idf
+
+    def _get_snapshot(self):
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is None:
+                job_ids = list(self._rows.keys())
+                rows = [self._rows[job_id] for job_id in job_ids]
+                matrix = self._stack_rows(rows)
+
+                idf = self.idf()
+                # |tf * idf| per job, cached until the corpus changes
+                row_norms = np.sqrt(matrix.multiply(matrix) @ (idf ** 2))
+
+                skill_matrix = stack_skill_rows([self._skill_rows[job_id] for job_id in job_ids], len(self.skills))
+                skill_counts = np.diff(skill_matrix.indptr).astype(np.float64)
+                self._snapshot = IndexSnapshot(job_ids, matrix, idf, row_norms, self.skills, skill_matrix, skill_counts)
+            return self._snapshot
+
+    def _stack_rows(self, rows):
+        # Concatenating the CSR arrays directly is much cheaper than sp.vstack
+        # over thousands of single-row matrices. Term counts are small integers,
+        # so float32 holds them exactly at half the memory
+        present = [row for row in rows if row is not None]
+        nnz = np.cumsum([row.nnz if row is not None else 0 for row in rows])
+        index_dtype = np.int32 if len(nnz) == 0 or nnz[-1] < 2 ** 31 else np.int64
+        indptr = np.zeros(len(rows) + 1, dtype=index_dtype)
+        indptr[1:] = nnz
+        if present:
+            data = np.concatenate([row.data for row in present]).astype(np.float32, copy=False)
+            indices = np.concatenate([row.indices for row in present]).astype(index_dtype, copy=False)
+        else:
+            data = np.zeros(0, dtype=np.float32)
+            indices = np.zeros(0, dtype=index_dtype)
+        return sp.csr_matrix((data, indices, indptr), shape=(len(rows), self.n_features))
+
+    def snapshot(self):
+        """The current scoring state; it is never modified, later changes build a new one"""
+        return self._get_snapshot()
+
+    @staticmethod
+    def narrow(snapshot, job_ids):
+        """A snapshot holding only these jobs, in this order, to score a few jobs without the rest.
+
+        IDF weights stay those of the whole corpus, so the scores are the ones
+        the full snapshot gives for the same jobs.
+        """
+        positions = {job_id: i for i, job_id in enumerate(snapshot.job_ids)}
+        rows = np.array([positions[job_id] for job_id in job_ids], dtype=np.int64)
+        return snapshot._replace(
+            job_ids=list(job_ids),
+            matrix=snapshot.matrix[rows],
+            row_norms=snapshot.row_norms[rows],
+            skill_matrix=snapshot.skill_matrix[rows],
+            skill_counts=snapshot.skill_counts[rows]
+        )
+
+    def _score_block(self, snapshot, resume_texts):
+        job_ids, matrix, idf, row_norms = snapshot.job_ids, snapshot.matrix, snapshot.idf, snapshot.row_norms
+        scores = np.zeros((len(resume_texts), len(job_ids)))
+        if not job_ids or not resume_texts:
+            return scores
+
+        queries = self.vectorizer.transform([self.preprocess(text) for text in resume_texts]).tocsr()
+        queries.sum_duplicates()
+        if not queries.nnz:
+            return scores
+
+        # cos(j, q) = sum(tf_j * tf_q * idf^2) / (|tf_j * idf| * |tf_q * idf|),
+        # with idf^2 only needed at the resumes' own terms
+        weights = queries.data * idf[queries.indices] ** 2
+        query_norms = np.sqrt(np.bincount(
+            np.repeat(np.arange(len(resume_texts)), np.diff(queries.indptr)),
+            weights=queries.data * weights, minlength=len(resume_texts)
+        ))
+
+        # Only the block's own terms can contribute: narrow the job matrix to
+        # those columns and multiply by the block as a dense terms x resumes
+        # array, which beats a sparse x sparse product with a near-dense result
+        terms, term_rows = np.unique(queries.indices, return_inverse=True)
+        block = np.zeros((len(terms), len(resume_texts)))
+        block[term_rows, np.repeat(np.arange(len(resume_texts)), np.diff(queries.indptr))] = weights
+        dots = (matrix[:, terms] @ block).T
+
+        denominator = np.outer(query_norms, row_norms)
+        np.divide(dots, denominator, out=scores, where=denominator > 0)
+        return scores
+
+    def score(self, resume_text):
+        """Cosine similarity of the resume against every indexed job.
+
+        Returns a numpy array aligned with `job_ids`.
+        """
+        return self._score_block(self._get_snapshot(), [resume_text])[0]
+
+    def similarities(self, resume_text):
+        """Cosine similarity of the resume keyed by job id"""
+        snapshot = self._get_snapshot()
+        scores = self._score_block(snapshot, [resume_text])[0]
+        return {job_id: float(scores[i]) for i, job_id in enumerate(snapshot.job_ids)}
+
+    def _skill_score_block(self, snapshot, resume_skill_lists):
+        job_ids, skill_matrix, skill_counts = snapshot.job_ids, snapshot.skill_matrix, snapshot.skill_counts
+        scores = np.zeros((len(resume_skill_lists), len(job_ids)))
+        if not job_ids:
+            return scores
+
+        # Skills interned after the snapshot was taken have no column yet, and
+        # no job in the snapshot requires them
+        resumes = np.zeros((skill_matrix.shape[1], len(resume_skill_lists)), dtype=np.float32)
+        for column, resume_skills in enumerate(resume_skill_lists):
+            resume_ids = snapshot.skills.lookup(resume_skills)
+            resumes[resume_ids[resume_ids < skill_matrix.shape[1]], column] = 1.0
+        if not resumes.any():
+            return scores
+
+        matched = (skill_matrix @ resumes).T
+        np.divide(matched, skill_counts, out=scores, where=skill_counts > 0)
+        return scores
+
+    def skill_scores(self, resume_skills):
+        """Share of each job's required skills the resume has, aligned with `job_ids`
+
+        Same value as JobMatcher.calculate_skills_similarity for every job, from
+        one sparse product over the job x skill matrix.
+        """
+        return self._skill_score_block(self._get_snapshot(), [resume_skills])[0]
+
+    def skill_similarities(self, resume_skills):
+        """Skill match ratio of the resume keyed by job id"""
+        snapshot = self._get_snapshot()
+        scores = self._skill_score_block(snapshot, [resume_skills])[0]
+        return {job_id: float(scores[i]) for i, job_id in enumerate(snapshot.job_ids)}
+
+    def score_components(self, resume_text, resume_skills):
+        """(job_ids, text scores, skill scores) for a resume, all from the same snapshot"""
+        job_ids, text_scores, skill_scores = self.score_block([resume_text], [resume_skills])
+        return job_ids, text_scores[0], skill_scores[0]
+
+    def score_block(self, resume_texts, resume_skill_lists, snapshot=None):
+        """(job_ids, text scores, skill scores) for a block of resumes.
+
+        Both score arrays are len(resume_texts) x len(job_ids), each from one
+        sparse matrix-matrix product over the snapshot (the current one unless
+        given), so memory grows with the block size times the number of jobs.
+        """
+        snapshot = snapshot or self._get_snapshot()
+        return (
+            snapshot.job_ids,
+            self._score_block(snapshot, resume_texts),
+            self._skill_score_block(snapshot, resume_skill_lists)
+        )
+
+    def skill_overlap(self, job_id, resume_skills):
+        """(matched, missing) required skill names of one indexed job, or None if it is not indexed"""
+        with self._lock:
+            job_skills = self._skill_rows.get(job_id)
+            skills = self.skills
+        if job_skills is None:
+            return None
+        # Jobs require a handful of skills; plain sets beat numpy's set routines here
+        resume_ids = set(skills.lookup(resume_skills).tolist())
+        job_skills = job_skills.tolist()
+        matched = [skill_id for skill_id in job_skills if skill_id in resume_ids]
+        missing = [skill_id for skill_id in job_skills if skill_id not in resume_ids]
+        return skills.names(matched), skills.names(missing)
+
+    def _tfidf_similarities(self, jobs, probe_texts):
+        # Reference scores from a TfidfVectorizer fitted on the same jobs. Its
+        # tokens are the hashed feature of each term, so terms that collide in
+        # the index are one term here too and the scores must agree exactly
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.utils import murmurhash3_32
+
+        analyze = self.vectorizer.build_analyzer()
+        n_features = self.n_features
+        vectorizer = TfidfVectorizer(
+            analyzer=lambda text: [str(abs(murmurhash3_32(term, seed=0)) % n_features) for term in analyze(text)]
+        )
+        try:
+            matrix = vectorizer.fit_transform([self.preprocess(job.get('description', '')) for job in jobs])
+        except ValueError:
+            # No job description has a single term left
+            return [{job['id']: 0.0 for job in jobs} for _ in probe_texts]
+        scores = (vectorizer.transform([self.preprocess(text) for text in probe_texts]) @ matrix.T).toarray()
+        return [{job['id']: float(row[i]) for i, job in enumerate(jobs)} for row in scores]
+
+    def verify_against_rebuild(self, jobs, probe_texts, tolerance=1e-9):
+        """Compare this (incrementally maintained) index with a fresh build and a real TF-IDF fit.
+
+        Returns a report with the job ids that differ and the largest score
+        differences seen over the probe texts, against a fresh index and
+        against a TfidfVectorizer fitted on the same descriptions.
+        """
+        fresh = JobIndex(preprocess=self.preprocess, n_features=self.n_features).build(jobs)
+
+        indexed = set(self._fingerprints)
+        expected = set(fresh._fingerprints)
+        report = {
+            'missing_jobs': sorted(expected - indexed),
+            'unexpected_jobs': sorted(indexed - expected),
+            'document_frequencies_match': bool(np.array_equal(self._df, fresh._df)),
+            'skills_match': all(
+                set(self.skills.names(self._skill_rows[job_id])) == set(fresh.skills.names(fresh._skill_rows[job_id]))
+                for job_id in expected & indexed
+            ),
+            'max_score_difference': 0.0,
+            'max_tfidf_difference': 0.0
+        }
+
+        for text, reference in zip(probe_texts, self._tfidf_similarities(jobs, probe_texts)):
+            ours = self.similarities(text)
+            theirs = fresh.similarities(text)
+            for job_id in expected & indexed:
+                difference = abs(ours[job_id] - theirs[job_id])
+                report['max_score_difference'] = max(report['max_score_difference'], difference)
+                difference = abs(ours[job_id] - reference[job_id])
+                report['max_tfidf_difference'] = max(report['max_tfidf_difference'], difference)
+
+        report['consistent'] = (
+            not report['missing_jobs'] and
+            not report['unexpected_jobs'] and
+            report['document_frequencies_match'] and
+            report['skills_match'] and
+            report['max_score_difference'] <= tolerance and
+            report['max_tfidf_difference'] <= tolerance
+        )
+        return report
+
+    # Artifacts live in one directory per build under the artifact root; the
+    # CURRENT file names the build to load and is switched atomically
+    CURRENT_FILE = 'CURRENT'
+    ABANDONED_BUILD_SECONDS = 3600
+
+    @classmethod
+    def current_build(cls, directory):
+        """Path of the build CURRENT points at, or None when there is none"""
+        try:
+            with open(os.path.join(directory, cls.CURRENT_FILE)) as f:
+                name = f.read().strip()
+        except OSError:
+            return None
+        build = os.path.join(directory, name)
+        return build if name and os.path.isdir(build) else None
+
+    @classmethod
+    def read_manifest(cls, directory):
+        """Manifest of the current build, or None when missing or unreadable"""
+        build = cls.current_build(directory)
+        if build is None:
+            return None
+        try:
+            with open(os.path.join(build, 'manifest.json')) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, directory, watermark=None):
+        """Write the index to a new build under `directory` and make it current.
+
+        `watermark` is the latest job change the index reflects (an ISO
+        timestamp); it is stored in the manifest for staleness checks and
+        incremental catch-up. Builds are never modified in place, so readers
+        that have an older build mapped are unaffected. Returns the build path.
+        """
+        with self._lock:
+            snapshot = self._get_snapshot()
+            job_ids = snapshot.job_ids
+            fingerprints = [self._fingerprints[job_id] for job_id in job_ids]
+            df = np.array(self._df)
+            skills = snapshot.skills.to_list()[:snapshot.skill_matrix.shape[1]]
+            built_at = self.built_at
+
+        os.makedirs(directory, exist_ok=True)
+        name = f"build-{int(time.time() * 1000)}-{os.getpid()}"
+        build = os.path.join(directory, name)
+        os.makedirs(build)
+
+        arrays = {
+            'data': snapshot.matrix.data,
+            'indices': snapshot.matrix.indices,
+            'indptr': snapshot.matrix.indptr,
+            'df': df,
+            'idf': snapshot.idf,
+            'row_norms': snapshot.row_norms,
+            # The skill matrix is binary, so its data array is not stored
+            'skill_indices': snapshot.skill_matrix.indices,
+            'skill_indptr': snapshot.skill_matrix.indptr,
+        }
+        for array_name in self.ARTIFACT_ARRAYS:
+            np.save(os.path.join(build, f'{array_name}.npy'), np.ascontiguousarray(arrays[array_name]))
+        with open(os.path.join(build, 'manifest.json'), 'w') as f:
+            json.dump({
+                'version': self.ARTIFACT_VERSION,
+                'n_features': self.n_features,
+                'job_ids': job_ids,
+                'fingerprints': fingerprints,
+                'skills': skills,
+                'watermark': watermark,
+                'built_at': built_at,
+                'saved_at': time.time(),
+            }, f)
+
+        pointer = os.path.join(directory, f'{self.CURRENT_FILE}.{os.getpid()}.tmp')
+        with open(pointer, 'w') as f:
+            f.write(name)
+        os.replace(pointer, os.path.join(directory, self.CURRENT_FILE))
+
+        # Older builds can go. Builds without a manifest may still be being
+        # written by another process, so only abandoned ones are removed. On
+        # Windows a build still mapped by another process cannot be deleted,
+        # and is left for a later save
+        for entry in os.listdir(directory):
+            path = os.path.join(directory, entry)
+            if not entry.startswith('build-') or entry == name:
+                continue
+            try:
+                complete = os.path.exists(os.path.join(path, 'manifest.json'))
+                if complete or time.time() - os.path.getmtime(path) > self.ABANDONED_BUILD_SECONDS:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError:
+                continue
+        return build
+
+    def load(self, directory):
+        """Replace the index contents with the current build under `directory`.
+
+        The arrays are memory-mapped read-only, so loading takes milliseconds
+        whatever the number of jobs and every process that loads the same
+        build shares its pages. Returns the manifest, or None when there is no
+        build or it was written for a different version or feature space.
+        """
+        manifest = self.read_manifest(directory)
+        if (manifest is None or manifest.get('version') != self.ARTIFACT_VERSION or
+                manifest.get('n_features') != self.n_features):
+            return None
+
+        build = self.current_build(directory)
+        arrays = {
+            array_name: np.load(os.path.join(build, f'{array_name}.npy'), mmap_mode='r')
+            for array_name in self.ARTIFACT_ARRAYS
+        }
+        job_ids = manifest['job_ids']
+        matrix = sp.csr_matrix(
+            (arrays['data'], arrays['indices'], arrays['indptr']),
+            shape=(len(job_ids), self.n_features),
+            copy=False
+        )
+        skills = SkillVocabulary(manifest['skills'])
+        skill_indices, skill_indptr = arrays['skill_indices'], arrays['skill_indptr']
+        skill_matrix = sp.csr_matrix(
+            (np.ones(len(skill_indices), dtype=np.float32), skill_indices, skill_indptr),
+            shape=(len(job_ids), len(skills)),
+            copy=False
+        )
+        # Per-job rows are views into the mapped indices, not copies
+        skill_rows = {
+            job_id: skill_indices[skill_indptr[i]:skill_indptr[i + 1]] for i, job_id in enumerate(job_ids)
+        }
+
+        with self._lock:
+            self._rows = None
+            self._fingerprints = dict(zip(job_ids, manifest['fingerprints']))
+            self._df = arrays['df']
+            self.skills = skills
+            self._skill_rows = skill_rows
+            self._snapshot = IndexSnapshot(
+                job_ids, matrix, arrays['idf'], arrays['row_norms'], skills, skill_matrix,
+                np.diff(skill_indptr).astype(np.float64)
+            )
+            self.built_at = manifest.get('built_at')
+            self.updated_at = time.time()
+        return manifest
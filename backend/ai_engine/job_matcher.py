@@ -1,7 +1,7 @@
+from sklearn.base import clone
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-import pandas as pd
 import re
 import nltk
 from nltk.corpus import stopwords
@@ -10,8 +10,22 @@ from nltk.stem import WordNetLemmatizer
 import json
 from collections import Counter
 
+from ai_engine.job_index import JobIndex
+from ai_engine.batch_matcher import BatchMatcher
+from ai_engine.skill_index import normalize_skills
+from ai_engine.nlp_resources import configure_nltk
+
 
 class JobMatcher:
+    # Columns of the component-score arrays, and the weights that blend them
+    COMPONENTS = ['text_similarity', 'skills_similarity', 'experience_similarity', 'education_similarity']
+    DEFAULT_WEIGHTS = {
+        'text_similarity': 0.4,  # TF-IDF based text similarity
+        'skills_similarity': 0.3,  # Skills matching
+        'experience_similarity': 0.2,  # Experience matching
+        'education_similarity': 0.1   # Education matching
+    }
+    
     def __init__(self):
         self.vectorizer = TfidfVectorizer(
             stop_words='english',
@@ -21,22 +35,9 @@ class JobMatcher:
             strip_accents='unicode'
         )
         
-        # Initialize NLTK resources
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt')
-        
-        try:
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('stopwords')
-        
-        try:
-            nltk.data.find('corpora/wordnet')
-        except LookupError:
-            nltk.download('wordnet')
-        
+        # NLTK data is bootstrapped ahead of time (ai_engine.nlp_resources);
+        # only the vendored directory needs to be on the search path
+        configure_nltk()
         self.lemmatizer = WordNetLemmatizer()
         self.stop_words = set(stopwords.words('english'))
     
@@ -69,9 +70,10 @@ class JobMatcher:
         if not processed_resume or not processed_job:
             return 0.0
         
-        # Fit and transform the texts
+        # Fit and transform the texts on a private copy of the vectorizer so a
+        # matcher shared between request threads is never mutated concurrently
         try:
-            tfidf_matrix = self.vectorizer.fit_transform([processed_resume, processed_job])
+            tfidf_matrix = clone(self.vectorizer).fit_transform([processed_resume, processed_job])
             
             # Calculate cosine similarity
             similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])
@@ -103,19 +105,8 @@ class JobMatcher:
             return 0.0
         
         # Convert to sets for easier comparison
-        if isinstance(resume_skills, str):
-            resume_skills = set(resume_skills.lower().split(','))
-        elif isinstance(resume_skills, list):
-            resume_skills = set([skill.lower().strip() for skill in resume_skills])
-        else:
-            resume_skills = set()
-        
-        if isinstance(job_skills, str):
-            job_skills = set(job_skills.lower().split(','))
-        elif isinstance(job_skills, list):
-            job_skills = set([skill.lower().strip() for skill in job_skills])
-        else:
-            job_skills = set()
+        resume_skills = set(normalize_skills(resume_skills))
+        job_skills = set(normalize_skills(job_skills))
         
         if not resume_skills or not job_skills:
             return 0.0
@@ -170,27 +161,35 @@ class JobMatcher:
         else:
             return 0.3
     
-    def match_resume_to_job(self, resume_data, job_data, weights=None):
-        """Match a resume to a job position with different similarity metrics"""
+    def match_resume_to_job(self, resume_data, job_data, weights=None, text_similarity=None,
+                            skills_similarity=None, include_skill_lists=True):
+        """Match a resume to a job position with different similarity metrics
+
+        `text_similarity` and `skills_similarity` can be passed in when they were
+        already scored against a JobIndex, which skips the pairwise TF-IDF fit
+        and skill set comparison. With `include_skill_lists` off the matched and
+        missing skill lists are left out, for callers that only need them for
+        the jobs they end up returning.
+        """
         if weights is None:
-            # Default weights for different components
-            weights = {
-                'text_similarity': 0.4,  # TF-IDF based text similarity
-                'skills_similarity': 0.3,  # Skills matching
-                'experience_similarity': 0.2,  # Experience matching
-                'education_similarity': 0.1   # Education matching
-            }
+            weights = dict(self.DEFAULT_WEIGHTS)
         
         # Calculate individual similarities
-        text_sim = self.calculate_tfidf_similarity(
-            resume_data.get('raw_text', ''), 
-            job_data.get('description', '')
-        )
+        if text_similarity is not None:
+            text_sim = text_similarity
+        else:
+            text_sim = self.calculate_tfidf_similarity(
+                resume_data.get('raw_text', ''), 
+                job_data.get('description', '')
+            )
         
-        skills_sim = self.calculate_skills_similarity(
-            resume_data.get('extracted_skills', []), 
-            job_data.get('skills_required', [])
-        )
+        if skills_similarity is not None:
+            skills_sim = skills_similarity
+        else:
+            skills_sim = self.calculate_skills_similarity(
+                resume_data.get('extracted_skills', []), 
+                job_data.get('skills_required', [])
+            )
         
         experience_sim = self.calculate_experience_similarity(
             resume_data.get('total_experience_years', 0),
@@ -213,7 +212,7 @@ class JobMatcher:
         # Convert to percentage
         match_percentage = min(100, max(0, total_similarity * 100))
         
-        return {
+        result = {
             'match_percentage': round(match_percentage, 2),
             'detailed_scores': {
                 'text_similarity': round(text_sim * 100, 2),
@@ -221,76 +220,188 @@ class JobMatcher:
                 'experience_similarity': round(experience_sim * 100, 2),
                 'education_similarity': round(education_sim * 100, 2)
             },
-            'weights_used': weights,
-            'matched_skills': self.get_matched_skills(
-                resume_data.get('extracted_skills', []),
-                job_data.get('skills_required', [])
-            ),
-            'missing_skills': self.get_missing_skills(
+            'weights_used': weights
+        }
+        if include_skill_lists:
+            result['matched_skills'], result['missing_skills'] = self.get_skill_overlap(
                 resume_data.get('extracted_skills', []),
                 job_data.get('skills_required', [])
             )
-        }
+        return result
+    
+    def get_skill_overlap(self, resume_skills, job_skills):
+        """Get (matched, missing) skills between resume and job requirements, normalising each list once"""
+        resume_set = set(normalize_skills(resume_skills))
+        job_set = set(normalize_skills(job_skills))
+        
+        return list(resume_set.intersection(job_set)), list(job_set.difference(resume_set))
     
     def get_matched_skills(self, resume_skills, job_skills):
         """Get skills that match between resume and job requirements"""
-        if isinstance(resume_skills, str):
-            resume_skills = [skill.strip() for skill in resume_skills.split(',')]
-        if isinstance(job_skills, str):
-            job_skills = [skill.strip() for skill in job_skills.split(',')]
-        
-        resume_set = set([skill.lower().strip() for skill in resume_skills])
-        job_set = set([skill.lower().strip() for skill in job_skills])
-        
-        return list(resume_set.intersection(job_set))
+        return self.get_skill_overlap(resume_skills, job_skills)[0]
     
     def get_missing_skills(self, resume_skills, job_skills):
         """Get skills required by job but missing in resume"""
-        if isinstance(resume_skills, str):
-            resume_skills = [skill.strip() for skill in resume_skills.split(',')]
-        if isinstance(job_skills, str):
-            job_skills = [skill.strip() for skill in job_skills.split(',')]
+        return self.get_skill_overlap(resume_skills, job_skills)[1]
+    
+    def component_scores(self, resume_data, jobs_list, job_index=None):
+        """Similarity components of the resume against every job, as a len(jobs_list) x 4 array
+
+        Columns follow COMPONENTS and hold 0-1 similarities. Text and skill
+        similarities come from the job index when one is given, one sparse
+        product each for all jobs; jobs it does not hold yet are scored
+        pairwise. Experience and education only depend on the job's
+        requirement, so each distinct requirement is scored once. Blend the
+        result with `weighted_scores`, as often as needed, without recomputing.
+        """
+        scores = np.zeros((len(jobs_list), len(self.COMPONENTS)))
+        resume_text = resume_data.get('raw_text', '')
+        resume_skills = resume_data.get('extracted_skills', [])
+        
+        positions = {}
+        if job_index is not None:
+            job_ids, text_scores, skill_scores = job_index.score_components(resume_text, resume_skills)
+            positions = {job_id: i for i, job_id in enumerate(job_ids)}
+        
+        experience_scores = {}
+        education_scores = {}
+        for row, job in enumerate(jobs_list):
+            position = positions.get(job.get('id'))
+            if position is not None:
+                scores[row, 0] = text_scores[position]
+                scores[row, 1] = skill_scores[position]
+            else:
+                scores[row, 0] = self.calculate_tfidf_similarity(resume_text, job.get('description', ''))
+                scores[row, 1] = self.calculate_skills_similarity(resume_skills, job.get('skills_required', []))
+            
+            scores[row, 2] = self._scored_once(
+                experience_scores, self.calculate_experience_similarity,
+                resume_data.get('total_experience_years', 0), job.get('min_experience_years', 0)
+            )
+            scores[row, 3] = self._scored_once(
+                education_scores, self.calculate_education_similarity,
+                resume_data.get('education', ''), job.get('education_required', '')
+            )
         
-        resume_set = set([skill.lower().strip() for skill in resume_skills])
-        job_set = set([skill.lower().strip() for skill in job_skills])
+        return scores
+    
+    @staticmethod
+    def _scored_once(memo, similarity, resume_value, job_value):
+        try:
+            if job_value not in memo:
+                memo[job_value] = similarity(resume_value, job_value)
+            return memo[job_value]
+        except TypeError:  # Unhashable requirement
+            return similarity(resume_value, job_value)
+    
+    def weight_vector(self, weights=None):
+        """Weights as an array in COMPONENTS order
+
+        Custom weights may name any subset of the components (the rest count
+        as 0) and are scaled to sum to 1, so match percentages stay on the same
+        0-100 scale. Raises ValueError for unknown components or bad values.
+        """
+        if weights is None:
+            weights = self.DEFAULT_WEIGHTS
         
-        return list(job_set.difference(resume_set))
+        unknown = set(weights) - set(self.COMPONENTS)
+        if unknown:
+            raise ValueError(f"Unknown weight components: {', '.join(sorted(unknown))}")
+        try:
+            vector = np.array([float(weights.get(component, 0.0)) for component in self.COMPONENTS])
+        except (TypeError, ValueError):
+            raise ValueError("Weights must be numbers")
+        if not np.all(np.isfinite(vector)) or (vector < 0).any():
+            raise ValueError("Weights must be non-negative numbers")
+        if vector.sum() <= 0:
+            raise ValueError("At least one weight must be positive")
+        return vector / vector.sum()
+    
+    def weights_dict(self, weight_vector):
+        """Weight array back to the {component: weight} form reported in responses"""
+        return {component: round(float(weight), 4) for component, weight in zip(self.COMPONENTS, weight_vector)}
+    
+    def detailed_scores(self, component_row):
+        """One row of a component-score array as the percentages reported per component"""
+        return {component: round(float(score) * 100, 2) for component, score in zip(self.COMPONENTS, component_row)}
+    
+    def weighted_scores(self, component_scores, weights=None):
+        """Match percentages for every row of a component-score array, one matrix-vector product
+
+        `weights` is a dict (see weight_vector) or an array from weight_vector.
+        """
+        if weights is None or isinstance(weights, dict):
+            weights = self.weight_vector(weights)
+        return np.round(np.clip(component_scores @ weights * 100, 0, 100), 2)
+    
+    def rank_order(self, match_percentages, top_n=None):
+        """Row indices of the top_n match percentages, best first, ties in input order
+
+        With top_n set, argpartition picks the winners in linear time and only
+        those are sorted; the result is the same as a stable full sort cut to
+        top_n.
+        """
+        match_percentages = np.asarray(match_percentages)
+        if not top_n or top_n >= len(match_percentages):
+            return np.argsort(-match_percentages, kind='stable')
+        
+        candidates = np.argpartition(-match_percentages, top_n - 1)[:top_n]
+        # argpartition breaks ties at the cut arbitrarily; take the earliest
+        # rows scoring exactly the cut-off so results stay deterministic
+        cutoff = match_percentages[candidates].min()
+        above = np.flatnonzero(match_percentages > cutoff)
+        tied = np.flatnonzero(match_percentages == cutoff)[:top_n - len(above)]
+        winners = np.concatenate([above, tied])
+        return winners[np.lexsort((winners, -match_percentages[winners]))]
     
-    def rank_jobs(self, resume_data, jobs_list, top_n=None):
+    def build_job_index(self, jobs_list):
+        """Fit a JobIndex over the descriptions of the given jobs"""
+        return JobIndex(preprocess=self.preprocess_text).build(jobs_list)
+    
+    def rank_jobs(self, resume_data, jobs_list, top_n=None, job_index=None, weights=None):
         """Rank a list of jobs based on match with resume"""
-        job_matches = []
-        
-        for job in jobs_list:
-            match_result = self.match_resume_to_job(resume_data, job)
-            job_matches.append({
-                'job_id': job.get('id'),
-                'job_title': job.get('title'),
-                'company': job.get('company', 'Unknown'),
-                'match_percentage': match_result['match_percentage'],
-                'details': match_result
-            })
-        
-        # Sort by match percentage in descending order
-        ranked_jobs = sorted(job_matches, key=lambda x: x['match_percentage'], reverse=True)
-        
-        # Return top N if specified
-        if top_n:
-            ranked_jobs = ranked_jobs[:top_n]
-        
-        return ranked_jobs
+        resume_skills = resume_data.get('extracted_skills', [])
+        
+        # Components once for all jobs, then one weighted product to rank them
+        weight_vector = self.weight_vector(weights)
+        components = self.component_scores(resume_data, jobs_list, job_index=job_index)
+        match_percentages = self.weighted_scores(components, weight_vector)
+        weights_used = self.weights_dict(weight_vector)
+        
+        # Details and skill lists are only worked out for the jobs being returned
+        return [
+            self.ranked_job(job_index, resume_skills, jobs_list[row], match_percentages[row], components[row], weights_used)
+            for row in self.rank_order(match_percentages, top_n)
+        ]
     
-    def batch_match(self, resumes_data, jobs_data):
-        """Match multiple resumes to multiple jobs"""
-        results = []
-        
-        for resume in resumes_data:
-            resume_results = {
-                'resume_id': resume.get('id'),
-                'matched_jobs': self.rank_jobs(resume, jobs_data)
+    def ranked_job(self, job_index, resume_skills, job, match_percentage, component_row, weights_used):
+        """One entry of a ranking, with the job's matched and missing skills"""
+        overlap = job_index.skill_overlap(job.get('id'), resume_skills) if job_index else None
+        if overlap is None:
+            overlap = self.get_skill_overlap(resume_skills, job.get('skills_required', []))
+        match_percentage = float(match_percentage)
+        return {
+            'job_id': job.get('id'),
+            'job_title': job.get('title'),
+            'company': job.get('company', 'Unknown'),
+            'match_percentage': match_percentage,
+            'details': {
+                'match_percentage': match_percentage,
+                'detailed_scores': self.detailed_scores(component_row),
+                'weights_used': weights_used,
+                'matched_skills': overlap[0],
+                'missing_skills': overlap[1]
             }
-            results.append(resume_results)
-        
-        return results
+        }
+    
+    def batch_match(self, resumes_data, jobs_data, top_n=None, weights=None, workers=1):
+        """Match multiple resumes to multiple jobs
+
+        Resumes are scored in blocks against all jobs at once (see
+        BatchMatcher); use BatchMatcher.iter_matches directly to stream results.
+        """
+        batch = BatchMatcher(self, jobs_data, top_k=top_n, weights=weights, workers=workers)
+        return list(batch.iter_matches(resumes_data))
 
 
 # Example usage
@@ -0,0 +1,149 @@
+import importlib
+import importlib.metadata
+import importlib.util
+import os
+import subprocess
+import sys
+
+
+# One-time, networked setup of the NLTK corpora and the spaCy model:
+#
+#     python -m ai_engine.nlp_resources bootstrap   (from the backend directory)
+#     python -m ai_engine.nlp_resources check
+#
+# Everything is written under NLP_DATA_DIR so it can be baked into an image or
+# copied to hosts without network access. The app verifies the resources at
+# startup and never downloads anything while serving requests.
+#
+# Importing nltk or spacy costs seconds, so this module only imports them
+# when it has to: the startup check looks in the data directory first.
+
+NLP_DATA_DIR = os.environ.get(
+    'NLP_DATA_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'nlp_data')
+)
+NLTK_DATA_DIR = os.path.join(NLP_DATA_DIR, 'nltk_data')
+# spaCy pipeline used for skill extraction; set SPACY_MODEL to an empty string
+# to run on the NLTK path only
+SPACY_MODEL = os.environ.get('SPACY_MODEL', 'en_core_web_sm')
+SPACY_MODEL_DIR = os.path.join(NLP_DATA_DIR, 'spacy', SPACY_MODEL) if SPACY_MODEL else None
+
+
+class MissingResourceError(RuntimeError):
+    """Raised at startup when NLP resources have not been bootstrapped"""
+
+
+def _nltk_version():
+    version = importlib.metadata.version('nltk')
+    return tuple(int(part) for part in version.split('.')[:3] if part.isdigit())
+
+
+def nltk_resources():
+    """NLTK packages the engine uses, mapped to the path nltk.data.find looks for"""
+    # NLTK 3.8.2 moved word_tokenize from the pickled punkt models to punkt_tab
+    if _nltk_version() >= (3, 8, 2):
+        punkt = ('punkt_tab', 'tokenizers/punkt_tab/english/')
+    else:
+        punkt = ('punkt', 'tokenizers/punkt')
+    return dict([
+        punkt,
+        ('stopwords', 'corpora/stopwords'),
+        ('wordnet', 'corpora/wordnet'),
+    ])
+
+
+def configure_nltk():
+    """Search the vendored data directory first, so lookups hit on the first probe"""
+    import nltk
+    if NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, NLTK_DATA_DIR)
+
+
+def spacy_model_source():
+    """What spacy.load should be given: the vendored copy if present, else the package name"""
+    if SPACY_MODEL_DIR and os.path.isfile(os.path.join(SPACY_MODEL_DIR, 'config.cfg')):
+        return SPACY_MODEL_DIR
+    return SPACY_MODEL
+
+
+def _vendored(path):
+    """Whether an NLTK resource is in the data directory, unpacked or as its zip"""
+    package = os.path.join(NLTK_DATA_DIR, *path.strip('/').split('/')[:2])
+    return os.path.exists(package) or os.path.exists(package + '.zip')
+
+
+def _spacy_package_installed(name):
+    # Same answer as spacy.util.is_package without importing spacy
+    try:
+        importlib.metadata.distribution(name)
+    except importlib.metadata.PackageNotFoundError:
+        return importlib.util.find_spec(name.replace('-', '_')) is not None
+    return True
+
+
+def missing_resources():
+    """Names of the required resources that cannot be found locally"""
+    missing = []
+    for name, path in nltk_resources().items():
+        if _vendored(path):
+            continue
+        # Not bootstrapped here; it may still be in one of NLTK's default
+        # directories
+        import nltk
+        configure_nltk()
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            missing.append(f"nltk:{name}")
+
+    if SPACY_MODEL and spacy_model_source() == SPACY_MODEL and not _spacy_package_installed(SPACY_MODEL):
+        missing.append(f"spacy:{SPACY_MODEL}")
+    return missing
+
+
+def verify_resources():
+    """Fail fast when anything the engine needs is missing"""
+    missing = missing_resources()
+    if missing:
+        raise MissingResourceError(
+            f"Missing NLP resources: {', '.join(missing)}. Run "
+            f"'python -m ai_engine.nlp_resources bootstrap' on a host with network access "
+            f"(data directory: {NLP_DATA_DIR})"
+        )
+
+
+def bootstrap():
+    """Download every required resource into NLP_DATA_DIR"""
+    import nltk
+
+    os.makedirs(NLTK_DATA_DIR, exist_ok=True)
+    for name in nltk_resources():
+        print(f"Fetching NLTK {name} into {NLTK_DATA_DIR}")
+        nltk.download(name, download_dir=NLTK_DATA_DIR, quiet=True, raise_on_error=True)
+
+    if SPACY_MODEL and spacy_model_source() == SPACY_MODEL:
+        import spacy
+        if not _spacy_package_installed(SPACY_MODEL):
+            print(f"Installing spaCy model {SPACY_MODEL}")
+            subprocess.run([sys.executable, '-m', 'spacy', 'download', SPACY_MODEL], check=True)
+            importlib.invalidate_caches()
+
+        # Keep a copy next to the corpora so the data directory is self-contained
+        print(f"Saving spaCy model {SPACY_MODEL} into {SPACY_MODEL_DIR}")
+        spacy.load(SPACY_MODEL).to_disk(SPACY_MODEL_DIR)
+
+    verify_resources()
+    print("NLP resources ready")
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else 'check'
+    if command == 'bootstrap':
+        bootstrap()
+    elif command == 'check':
+        missing = missing_resources()
+        print(f"Missing: {', '.join(missing)}" if missing else "NLP resources ready")
+        sys.exit(1 if missing else 0)
+    else:
+        print("Usage: python -m ai_engine.nlp_resources [bootstrap|check]")
+        sys.exit(2)
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ParseCache:
+    """Size-bounded on-disk cache of ResumeParser results.
+
+    Entries are keyed by the SHA-256 of the file content together with the
+    parser version, so re-analysing an unchanged file or a duplicate upload
+    skips extraction entirely, and a parser upgrade never serves results
+    produced by older parsing code. The least recently used entries are
+    evicted once the stored payloads exceed `max_bytes`.
+    """
+
+    def __init__(self, path, parser_version, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.parser_version = str(parser_version)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            # WAL lets readers in other workers proceed while one of them writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS parse_cache (
+                    digest TEXT NOT NULL,
+                    parser_version TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (digest, parser_version)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_parse_cache_last_access ON parse_cache (last_access)")
+        self.invalidate_other_versions()
+
+    @contextmanager
+    def _connect(self):
+        # One short-lived connection per operation keeps the cache safe to
+        # share between threads and worker processes
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def digest(content):
+        """SHA-256 of the raw file bytes"""
+        return hashlib.sha256(content).hexdigest()
+
+    def get(self, digest):
+        """Return the cached parse result, or None on a miss"""
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT payload FROM parse_cache WHERE digest = ? AND parser_version = ?",
+                    (digest, self.parser_version)
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE parse_cache SET last_access = ? WHERE digest = ? AND parser_version = ?",
+                        (time.time(), digest, self.parser_version)
+                    )
+        except sqlite3.Error as e:
+            print(f"Error reading parse cache: {str(e)}")
+            row = None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, digest, result):
+        """Store a parse result and evict old entries if over budget"""
+        payload = json.dumps(result, ensure_ascii=False, default=str)
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO parse_cache (digest, parser_version, payload, size, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (digest, self.parser_version, payload, len(payload), time.time())
+                )
+                self._evict(conn)
+        except sqlite3.Error as e:
+            print(f"Error writing parse cache: {str(e)}")
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM parse_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for digest, parser_version, size in conn.execute(
+                "SELECT digest, parser_version, size FROM parse_cache ORDER BY last_access ASC").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute(
+                "DELETE FROM parse_cache WHERE digest = ? AND parser_version = ?",
+                (digest, parser_version)
+            )
+            total -= size
+            evicted += 1
+
+        with self._lock:
+            self.evictions += evicted
+
+    def invalidate_other_versions(self):
+        """Drop entries written by any other parser version"""
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM parse_cache WHERE parser_version != ?", (self.parser_version,))
+        except sqlite3.Error as e:
+            print(f"Error invalidating parse cache: {str(e)}")
+
+    def clear(self):
+        """Remove every entry"""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM parse_cache")
+
+    def stats(self):
+        """Hit/miss counters for this process plus the current cache size"""
+        try:
+            with self._connect() as conn:
+                entries, size = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parse_cache"
+                ).fetchone()
+        except sqlite3.Error:
+            entries, size = None, None
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'parser_version': self.parser_version,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+                'evictions': self.evictions,
+                'entries': entries,
+                'size_bytes': size,
+                'max_bytes': self.max_bytes
+            }
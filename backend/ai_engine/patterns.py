@@ -0,0 +1,119 @@
+import re
+
+
+# Every regular expression used by the parser and the analysis helpers is
+# compiled once here, at import, instead of being looked up in the `re` cache
+# (or recompiled once it overflows) on every call.
+
+# Section headings, keyed by the section they open
+SECTION_HEADERS = {
+    'summary': ('summary', 'objective', 'profile'),
+    'experience': ('experience', 'work experience', 'professional experience', 'employment history',
+                   'work history'),
+    'education': ('education', 'academic background'),
+    'skills': ('skills', 'technical skills', 'core competencies'),
+    'certifications': ('certifications', 'certificates'),
+    'projects': ('projects', 'project experience'),
+    'awards': ('awards', 'honors'),
+}
+_SECTION_BY_HEADER = {
+    header: section for section, headers in SECTION_HEADERS.items() for header in headers
+}
+
+# A heading is a line holding only a known header, or starting with one
+# followed by a colon ("Skills: Python, SQL"). Longest alternatives first so
+# 'project experience' is not read as 'experience'.
+SECTION_HEADING = re.compile(
+    r'^[ \t]*(' +
+    '|'.join(re.escape(header) for header in sorted(_SECTION_BY_HEADER, key=len, reverse=True)) +
+    r')[ \t]*(?::|$)',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Text cleaning
+WHITESPACE = re.compile(r'\s+')
+CONTROL_CHARS = re.compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]')
+NON_DIGITS = re.compile(r'\D')
+
+# Contact information. Every repetition is bounded and no two adjacent
+# quantifiers can match the same characters, so a failed match costs a
+# constant amount of work per starting position however long the text is.
+EMAIL = re.compile(r'\b[A-Za-z0-9._%+-]{1,64}@(?:[A-Za-z0-9-]{1,63}\.){1,8}[A-Za-z]{2,24}\b')
+PHONE = re.compile(r'(?:\+?\d{1,3}[\s-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}')
+# Number, two to eight words, a comma, then 'City 12345'
+ADDRESS = re.compile(r'\b\d{1,6}(?:\s+\w{1,30}){2,8}\s{0,3},\s{0,3}\w{1,30}\s{1,3}\d{5}\b')
+LINKEDIN = re.compile(r'linkedin\.com/(?:in|pub)/[^\s/]{1,100}', re.IGNORECASE)
+
+# Education
+DEGREE_LINES = [
+    re.compile(
+        r'((?:Bachelor|Master|Doctor|PhD|B\.?[A-Z]*|M\.?[A-Z]*|B\.Sc|M\.Sc|B\.Tech|M\.Tech|B\.A|M\.A)[^\n]+?)\n',
+        re.IGNORECASE | re.DOTALL
+    ),
+    re.compile(
+        r'((?:Bachelors?|Masters?|Doctorate|PhD)[^\n]+?)(?:\n|\b(?:skills|experience|summary)\b)',
+        re.IGNORECASE | re.DOTALL
+    ),
+]
+INSTITUTION = re.compile(r'(University|College|Institute|School)[\w\s,.-]*', re.IGNORECASE)
+DEGREE = re.compile(
+    r'(?:Bachelor|Master|Doctor|PhD|B\.?[A-Z]*|M\.?[A-Z]*|B\.Sc|M\.Sc|B\.Tech|M\.Tech|B\.A|M\.A|'
+    r'Bachelors?|Masters?|Doctorate)[\w\s&-]*',
+    re.IGNORECASE
+)
+YEAR = re.compile(r'(?:\d{4}|\d{2})[\s/-]?(?:present|\d{4}|\d{2})?')
+
+# Experience entries. Each quantifier is bounded by a single word or a run of
+# spaces, so matching a line never backtracks more than a word
+_MONTH = r'(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?'
+_DATE = r'(?:' + _MONTH + r'[ \t]+)?(?:\d{1,2}/)?(?:19|20)\d{2}'
+EXPERIENCE_DATE_RANGE = re.compile(
+    _DATE + r'[ \t]*(?:-|–|—|to)[ \t]*(?:' + _DATE + r'|present|current|now)\b',
+    re.IGNORECASE
+)
+EXPERIENCE_SEPARATOR = re.compile(r'[ \t]+(?:at|@|\||-|–|—)[ \t]+', re.IGNORECASE)
+
+# ATS structure indicators
+ATS_STRUCTURE_INDICATORS = [
+    re.compile(r'\d{4}'),  # years
+    re.compile(r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b'),  # proper names
+    re.compile(r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\b'),  # months
+    re.compile(r'\b(?:Bachelor|Master|PhD|B\.?[A-Z]*|M\.?[A-Z]*)\b'),  # degrees
+    re.compile(r'\b(?:Inc|LLC|Corp|Company|Ltd)\b'),  # company indicators
+]
+FALLBACK_KEYWORD = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+
+def segment_sections(text):
+    """Locate every section heading in one scan of the text.
+
+    Returns {section: [start, end]} offsets of each section's content, which
+    runs from its heading to the next heading of any section. Only the first
+    heading of a section counts. The offsets refer to the text exactly as
+    given, so they stay valid wherever that text is stored alongside them.
+    """
+    if not text:
+        return {}
+
+    headings = [(match.start(), match.end(), _SECTION_BY_HEADER[match.group(1).lower()])
+                for match in SECTION_HEADING.finditer(text)]
+
+    spans = {}
+    for i, (_, content_start, section) in enumerate(headings):
+        if section in spans:
+            continue
+        content_end = headings[i + 1][0] if i + 1 < len(headings) else len(text)
+        content = text[content_start:content_end]
+        # Trim the surrounding whitespace off the span itself
+        start = content_start + len(content) - len(content.lstrip())
+        end = max(start, content_end - len(content) + len(content.rstrip()))
+        spans[section] = [start, end]
+    return spans
+
+
+def section_text(text, spans, section):
+    """Content of one section given the offsets from segment_sections"""
+    span = spans.get(section)
+    if not span:
+        return ''
+    return text[span[0]:span[1]]
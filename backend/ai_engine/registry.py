@@ -0,0 +1,223 @@
+import gc
+import os
+import threading
+import time
+
+# The engine modules pull in spaCy, scikit-learn, scipy, NLTK and the PDF
+# libraries, which take seconds to import. Each factory imports its module on
+# first use so importing the app (and serving pages such as /login) does not
+# pay for them; warm-up or the first analysis request does.
+
+
+# On-disk parse cache shared by every worker; set RESUME_PARSE_CACHE to an
+# empty string to disable it
+PARSE_CACHE_PATH = os.environ.get(
+    'RESUME_PARSE_CACHE',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'parse_cache.sqlite3')
+)
+PARSE_CACHE_MAX_BYTES = int(os.environ.get('RESUME_PARSE_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+
+# Out-of-process document extraction; set RESUME_EXTRACTION_WORKERS=0 to
+# extract in the request thread instead
+EXTRACTION_WORKERS = int(os.environ.get('RESUME_EXTRACTION_WORKERS', 2))
+EXTRACTION_TIMEOUT = int(os.environ.get('RESUME_EXTRACTION_TIMEOUT', 30))  # seconds per document
+EXTRACTION_MEMORY_MB = int(os.environ.get('RESUME_EXTRACTION_MEMORY_MB', 1024))  # per worker process
+EXTRACTION_MAX_TASKS = int(os.environ.get('RESUME_EXTRACTION_MAX_TASKS', 25))  # documents before recycling
+
+# Components whose state is read-only once built, so a pre-fork master can
+# build them and its workers share the pages copy-on-write. The parser is
+# left out: it owns a process pool and a SQLite connection, which have to be
+# created in each worker after the fork.
+PRELOAD_COMPONENTS = ['extractor', 'matcher', 'gap_analyzer', 'job_index']
+
+
+class EngineRegistry:
+    """Process-wide holder for the AI engine components.
+
+    Building a SkillExtractor loads the spaCy model and the JobMatcher reads
+    the NLTK corpora, so components are created once per worker process and then
+    borrowed by every request instead of being rebuilt each time.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._components = {}
+        self._factories = {
+            'parser': self._new_parser,
+            'extractor': self._new_extractor,
+            'matcher': self._new_matcher,
+            'gap_analyzer': self._new_gap_analyzer,
+            'job_index': self._new_job_index,
+        }
+        self._ready = threading.Event()
+        self.warm_up_seconds = None
+        self.warm_up_error = None
+        self.preloaded = False
+
+    def get(self, name):
+        """Return the shared component, creating it on first use"""
+        component = self._components.get(name)
+        if component is not None:
+            return component
+
+        with self._lock:
+            # Another thread may have built it while we waited for the lock
+            component = self._components.get(name)
+            if component is None:
+                if name not in self._factories:
+                    raise KeyError(f"Unknown engine component: {name}")
+                component = self._factories[name]()
+                self._components[name] = component
+            return component
+
+    @property
+    def parser(self):
+        return self.get('parser')
+
+    @property
+    def extractor(self):
+        return self.get('extractor')
+
+    @property
+    def matcher(self):
+        return self.get('matcher')
+
+    @property
+    def gap_analyzer(self):
+        return self.get('gap_analyzer')
+
+    @property
+    def job_index(self):
+        return self.get('job_index')
+
+    def _new_parser(self):
+        from ai_engine.resume_parser import ResumeParser
+        from ai_engine.parse_cache import ParseCache
+        from ai_engine.extraction_service import ExtractionService
+
+        cache = None
+        if PARSE_CACHE_PATH:
+            try:
+                cache = ParseCache(PARSE_CACHE_PATH, ResumeParser.PARSER_VERSION, max_bytes=PARSE_CACHE_MAX_BYTES)
+            except Exception as e:
+                print(f"Parse cache unavailable, parsing without it: {str(e)}")
+
+        extraction_service = None
+        if EXTRACTION_WORKERS > 0:
+            extraction_service = ExtractionService(
+                max_workers=EXTRACTION_WORKERS,
+                timeout=EXTRACTION_TIMEOUT,
+                memory_limit_mb=EXTRACTION_MEMORY_MB,
+                max_tasks_per_child=EXTRACTION_MAX_TASKS
+            )
+        return ResumeParser(cache=cache, extraction_service=extraction_service)
+
+    def _new_extractor(self):
+        from ai_engine.skill_extractor import SkillExtractor
+        return SkillExtractor()
+
+    def _new_matcher(self):
+        from ai_engine.job_matcher import JobMatcher
+        return JobMatcher()
+
+    def _new_gap_analyzer(self):
+        from ai_engine.skill_gap_analyzer import SkillGapAnalyzer
+        return SkillGapAnalyzer()
+
+    def _new_job_index(self):
+        from ai_engine.job_index import JobIndex
+
+        # Jobs and resumes must go through the same preprocessing
+        return JobIndex(preprocess=self.matcher.preprocess_text)
+
+    @property
+    def is_ready(self):
+        # A warm-up that failed has finished but left no usable engine
+        return self._ready.is_set() and self.warm_up_error is None
+
+    def wait_until_ready(self, timeout=None):
+        """Block until warm-up has finished, returns the readiness flag"""
+        return self._ready.wait(timeout) and self.warm_up_error is None
+
+    def warm_up(self, components=None):
+        """Build the components (all by default) and exercise them once so lazy state is loaded"""
+        start = time.perf_counter()
+        try:
+            with self._lock:
+                for name in components or self._factories:
+                    self.get(name)
+
+                # Run a tiny document through the pipeline so spaCy/NLTK finish
+                # their lazy initialisation before the first real request
+                sample = "Python developer with Docker experience and strong communication skills"
+                self.extractor.extract_skills(sample)
+                self.matcher.preprocess_text(sample)
+            self.warm_up_error = None
+        except Exception as e:
+            self.warm_up_error = str(e)
+            print(f"Error warming up AI engine: {str(e)}")
+        finally:
+            self.warm_up_seconds = time.perf_counter() - start
+            self._ready.set()
+
+    def preload(self, load_state=None):
+        """Build the read-only components in a pre-fork master and freeze them
+
+        `load_state` is called once the components exist to fill in data such
+        as the job index. Afterwards every object is moved to the collector's
+        permanent generation, so collections in the workers never write to
+        these objects and their pages stay shared instead of being copied.
+        """
+        # Collections while loading would free objects in the middle of the
+        # pages about to be shared, so hold them off until everything is frozen
+        gc.disable()
+        try:
+            self.warm_up(PRELOAD_COMPONENTS)
+            if load_state is not None and self.warm_up_error is None:
+                try:
+                    load_state()
+                    # Build the scoring matrices now rather than in each worker
+                    self.job_index.score("")
+                except Exception as e:
+                    self.warm_up_error = str(e)
+                    print(f"Error preloading AI engine state: {str(e)}")
+            gc.freeze()
+            self.preloaded = True
+        finally:
+            gc.enable()
+
+    def start_warm_up(self, background=True):
+        """Kick off warm-up, optionally on a daemon thread so boot is not blocked"""
+        if not background:
+            self.warm_up()
+            return None
+
+        thread = threading.Thread(target=self.warm_up, name='ai-engine-warm-up', daemon=True)
+        thread.start()
+        return thread
+
+    def status(self):
+        """Readiness information suitable for a health endpoint"""
+        parser = self._components.get('parser')
+        return {
+            'ready': self.is_ready,
+            'components': sorted(self._components.keys()),
+            'parse_cache': parser.cache.stats() if parser is not None and parser.cache else None,
+            'warm_up_seconds': round(self.warm_up_seconds, 3) if self.warm_up_seconds is not None else None,
+            'preloaded': self.preloaded,
+            'error': self.warm_up_error
+        }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Return the registry for this worker process"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = EngineRegistry()
+    return _registry
@@ -1,99 +1,317 @@
-import PyPDF2
-import docx
 import os
-import re
+import zipfile
 from io import BytesIO
-from docx import Document
-import pdfplumber
+from xml.etree import ElementTree
+
+from ai_engine import patterns
+from ai_engine.patterns import segment_sections, section_text
+from ai_engine.document_analysis import DocumentAnalysis, clean_text
+from ai_engine.doc_reader import extract_doc_text
+
+
+# WordprocessingML elements read by the streaming DOCX extractor
+_WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+DOCX_PARAGRAPH = _WORD_NS + 'p'
+DOCX_TEXT = _WORD_NS + 't'
+DOCX_INLINE_CHARS = {
+    _WORD_NS + 'tab': '\t',
+    _WORD_NS + 'br': '\n',
+    _WORD_NS + 'cr': '\n',
+    _WORD_NS + 'noBreakHyphen': '-',
+}
+DOCX_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+BULLET_CHARS = '-*\u2022\u25aa\u25cf\u2023\u2043>'
 
 
 class ResumeParser:
-    def __init__(self):
-        pass
+    # Bump whenever extraction or parsing output changes so cached results
+    # from older code are invalidated
+    PARSER_VERSION = '8'
+    
+    # Resumes are almost always 1-4 pages; anything beyond these budgets is
+    # not worth the layout analysis
+    MAX_PDF_PAGES = 10
+    MAX_TEXT_CHARS = 100000
+    
+    # Lines longer than this are description text, not an entry heading
+    MAX_EXPERIENCE_HEADER_CHARS = 200
+    MAX_EXPERIENCE_ENTRIES = 20
+    
+    def __init__(self, cache=None, extraction_service=None):
+        # Optional ParseCache consulted before any extraction work
+        self.cache = cache
+        # Optional ExtractionService that runs text extraction out of process
+        self.extraction_service = extraction_service
+    
+    @staticmethod
+    def _open_source(source):
+        """Return something the PDF/DOCX libraries can open: a path or a fresh stream"""
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            # Every consumer gets its own stream over the same bytes
+            return BytesIO(source)
+        return source
+    
+    @staticmethod
+    def read_source(source):
+        """Return the raw bytes of a path, bytes object or binary file object"""
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            return bytes(source)
+        if hasattr(source, 'read'):
+            if hasattr(source, 'seek'):
+                source.seek(0)
+            return source.read()
+        with open(source, 'rb') as f:
+            return f.read()
+    
+    def iter_pdf_pages(self, file_path, max_pages=None, max_chars=None):
+        """Yield {'page', 'engine', 'text'} for each PDF page until the page or character budget is spent
+
+        Pages are read with PyPDF2's text-stream extraction first; only pages
+        where that result looks broken are re-read with pdfplumber's much
+        slower layout engine.
+        """
+        # Imported here so only processes that actually read PDFs load them
+        import PyPDF2
+        
+        max_pages = max_pages or self.MAX_PDF_PAGES
+        max_chars = max_chars or self.MAX_TEXT_CHARS
+        remaining = max_chars
+        
+        try:
+            reader = PyPDF2.PdfReader(self._open_source(file_path))
+            page_count = min(len(reader.pages), max_pages)
+        except Exception as e:
+            # Unreadable for PyPDF2, so every page goes through pdfplumber
+            print(f"Fast PDF extraction unavailable, using pdfplumber: {str(e)}")
+            reader = None
+            page_count = max_pages
+        
+        plumber = None
+        try:
+            for index in range(page_count):
+                page_text = None
+                engine = 'pypdf2'
+                
+                if reader is not None:
+                    try:
+                        page_text = reader.pages[index].extract_text() or ""
+                    except Exception:
+                        page_text = None
+                
+                if page_text is None or self.looks_broken(page_text):
+                    # Only the first max_pages pages are ever turned into page objects
+                    if plumber is None:
+                        import pdfplumber
+                        plumber = pdfplumber.open(self._open_source(file_path), pages=range(1, max_pages + 1))
+                    if index >= len(plumber.pages):
+                        break
+                    page = plumber.pages[index]
+                    try:
+                        page_text = page.extract_text() or ""
+                    finally:
+                        # Drop the page's parsed objects before moving on
+                        getattr(page, 'close', page.flush_cache)()
+                    engine = 'pdfplumber'
+                
+                page_text = page_text[:remaining]
+                remaining -= len(page_text)
+                yield {'page': index + 1, 'engine': engine, 'text': page_text}
+                
+                if remaining <= 0:
+                    break
+        finally:
+            if plumber is not None:
+                plumber.close()
+    
+    def looks_broken(self, text):
+        """Heuristic check for fast-path page text that needs the layout engine"""
+        visible = [char for char in text if not char.isspace()]
+        
+        # Empty, or too little text to be a real page of a resume
+        word_chars = sum(1 for char in visible if char.isalnum())
+        if word_chars < 20:
+            return True
+        
+        # Mostly symbols or replacement characters: a font without a usable
+        # ToUnicode map
+        if word_chars / len(visible) < 0.6:
+            return True
+        
+        tokens = text.split()
+        # Glyph-by-glyph output ('P y t h o n') from positioned characters
+        if sum(1 for token in tokens if len(token) == 1) / len(tokens) > 0.4:
+            return True
+        
+        # Words run together because the content stream has no spaces
+        if len(visible) / len(tokens) > 20:
+            return True
+        
+        return False
+    
+    def extract_pdf_pages(self, file_path):
+        """Extract every PDF page, reporting which engine produced each one"""
+        return list(self.iter_pdf_pages(file_path))
     
     def extract_text_from_pdf(self, file_path):
         """Extract text from PDF file"""
         try:
-            text = ""
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    text += page.extract_text() or ""
-            return text
+            return "\n".join(page['text'] for page in self.iter_pdf_pages(file_path))
         except Exception as e:
             print(f"Error extracting text from PDF: {str(e)}")
             return ""
     
+    def iter_docx_paragraphs(self, file_path, max_chars=None):
+        """Yield the text of each DOCX paragraph, table cells included, in document order
+
+        word/document.xml is streamed straight out of the zip and every
+        element is discarded as soon as it has been read, so memory stays
+        flat regardless of document size, and embedded media is never
+        decompressed.
+        """
+        remaining = max_chars or self.MAX_TEXT_CHARS
+        
+        with zipfile.ZipFile(self._open_source(file_path)) as archive:
+            with archive.open('word/document.xml') as stream:
+                open_elements = []
+                paragraphs = []  # text runs of the paragraphs being read (text boxes nest)
+                skipping = 0  # inside an mc:Fallback, which repeats the mc:Choice content
+                
+                for event, element in ElementTree.iterparse(stream, events=('start', 'end')):
+                    tag = element.tag
+                    if event == 'start':
+                        open_elements.append(element)
+                        if tag == DOCX_PARAGRAPH:
+                            paragraphs.append([])
+                        elif tag == DOCX_FALLBACK:
+                            skipping += 1
+                        continue
+                    
+                    open_elements.pop()
+                    if tag == DOCX_FALLBACK:
+                        skipping -= 1
+                    elif paragraphs and not skipping:
+                        if tag == DOCX_TEXT:
+                            paragraphs[-1].append(element.text or '')
+                        elif tag in DOCX_INLINE_CHARS:
+                            paragraphs[-1].append(DOCX_INLINE_CHARS[tag])
+                    
+                    if tag == DOCX_PARAGRAPH:
+                        text = ''.join(paragraphs.pop())[:remaining]
+                        if text:
+                            remaining -= len(text)
+                            yield text
+                        if remaining <= 0:
+                            return
+                    
+                    # Detach the finished element so the tree never grows
+                    # beyond the path to the current one
+                    if open_elements:
+                        open_elements[-1].remove(element)
+    
     def extract_text_from_docx(self, file_path):
         """Extract text from DOCX file"""
         try:
-            doc = Document(file_path)
-            text = "\n".join([paragraph.text for paragraph in doc.paragraphs if paragraph.text])
-            return text
+            return "\n".join(self.iter_docx_paragraphs(file_path))
         except Exception as e:
             print(f"Error extracting text from DOCX: {str(e)}")
             return ""
     
     def extract_text_from_doc(self, file_path):
-        """Extract text from DOC file using antiword (requires antiword to be installed on the system)"""
+        """Extract text from DOC file (path or bytes)
+        
+        Uses antiword when it is installed, with a bounded number of
+        concurrent antiword processes and a hard timeout each, and otherwise
+        the built-in pure-Python Word 97-2003 reader.
+        """
         try:
-            import subprocess
-            result = subprocess.run(['antiword', file_path], capture_output=True, text=True)
-            return result.stdout
+            return extract_doc_text(file_path, max_chars=self.MAX_TEXT_CHARS)
         except Exception as e:
             print(f"Error extracting text from DOC: {str(e)}")
-            # Fallback: try using docx library after conversion
-            try:
-                # Convert doc to docx and then extract
-                import win32com.client as win32
-                word = win32com.client.Dispatch("Word.Application")
-                doc = word.Documents.Open(file_path)
-                doc.SaveAs(file_path + "x", FileFormat=16)  # 16 represents docx format
-                doc.Close()
-                word.Quit()
-                
-                # Now extract from the converted docx
-                text = self.extract_text_from_docx(file_path + "x")
-                
-                # Remove the temporary file
-                os.remove(file_path + "x")
-                
-                return text
-            except:
-                return ""
+            return ""
     
-    def parse_resume(self, file_path):
-        """Parse resume file and extract all relevant information"""
+    def parse_resume(self, source, file_extension=None, digest=None):
+        """Parse resume file and extract all relevant information
+
+        `source` is a file path, the raw file bytes or a binary file object.
+        `file_extension` is required unless `source` is a path. When the
+        SHA-256 `digest` of the content is already known (e.g. stored at
+        upload time) a cache hit needs no file read at all.
+        """
         # Determine file type
-        file_extension = os.path.splitext(file_path)[1].lower()
+        if file_extension is None:
+            if not isinstance(source, (str, os.PathLike)):
+                raise ValueError("file_extension is required when parsing bytes or a file object")
+            file_extension = os.path.splitext(source)[1]
+        file_extension = file_extension.lower()
+        
+        if file_extension not in ('.pdf', '.docx', '.doc'):
+            raise ValueError(f"Unsupported file type: {file_extension}")
+        
+        if isinstance(source, (str, os.PathLike)) and self.cache is None:
+            return self._parse_file(source, file_extension)
+        
+        if digest is not None and self.cache is not None:
+            cached = self.cache.get(digest)
+            if cached is not None:
+                return cached
+        
+        # Read the content once; hashing and extraction share the same buffer
+        content = self.read_source(source)
+        
+        if self.cache is None:
+            return self._parse_file(content, file_extension)
+        
+        if digest is None:
+            # Identical file content parses to an identical result
+            digest = self.cache.digest(content)
+            cached = self.cache.get(digest)
+            if cached is not None:
+                return cached
+        
+        result = self._parse_file(content, file_extension)
+        self.cache.put(digest, result)
+        return result
+    
+    def extract_text(self, file_path, file_extension=None):
+        """Extract text from a PDF, DOCX or DOC file (path or bytes) in this process"""
+        if file_extension is None:
+            file_extension = os.path.splitext(file_path)[1].lower()
         
         if file_extension == '.pdf':
-            text = self.extract_text_from_pdf(file_path)
+            return self.extract_text_from_pdf(file_path)
         elif file_extension == '.docx':
-            text = self.extract_text_from_docx(file_path)
+            return self.extract_text_from_docx(file_path)
         elif file_extension == '.doc':
-            text = self.extract_text_from_doc(file_path)
+            return self.extract_text_from_doc(file_path)
         else:
             raise ValueError(f"Unsupported file type: {file_extension}")
+    
+    def _parse_file(self, file_path, file_extension):
+        """Extract and parse a resume file without consulting the cache"""
+        if self.extraction_service is not None:
+            text = self.extraction_service.extract_text(file_path, file_extension)
+        else:
+            text = self.extract_text(file_path, file_extension)
         
-        # Clean the text
-        cleaned_text = self.clean_text(text)
-        
-        # Extract different sections
-        sections = self.extract_sections(cleaned_text)
-        
-        # Extract contact information
-        contact_info = self.extract_contact_info(cleaned_text)
+        # Every view of the text (cleaned, sections, contact details) is
+        # computed once on this object and shared by the extractors below
+        analysis = DocumentAnalysis(text)
+        cleaned_text = analysis.cleaned_text
+        sections = analysis.sections
+        contact_info = analysis.contact_info
         
         # Extract education
         education = self.extract_education(cleaned_text)
         
-        # Extract work experience
-        experience = self.extract_experience(cleaned_text)
+        # Extract work experience (needs the line structure clean_text removes)
+        experience = self.extract_experience(text, analysis.section_spans)
         
         return {
             'raw_text': text,
             'cleaned_text': cleaned_text,
             'sections': sections,
+            'section_spans': analysis.section_spans,
             'contact_info': contact_info,
             'education': education,
             'experience': experience
@@ -101,78 +319,23 @@ class ResumeParser:
     
     def clean_text(self, text):
         """Clean the extracted text"""
-        # Remove extra whitespaces
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove special characters but keep essential ones
-        text = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', text)
-        
-        return text.strip()
+        return clean_text(text)
     
-    def extract_sections(self, text):
+    def extract_sections(self, text, spans=None):
         """Extract different sections from the resume"""
-        sections = {}
-        
-        # Common section headers
-        section_patterns = {
-            'summary': r'(summary|objective|profile):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
-            'experience': r'(experience|work experience|employment history):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
-            'education': r'(education|academic background):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
-            'skills': r'(skills|technical skills|core competencies):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
-            'certifications': r'(certifications|certificates):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
-            'projects': r'(projects|project experience):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
-            'awards': r'(awards|honors):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
-        }
-        
-        for section_name, pattern in section_patterns.items():
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                sections[section_name] = match.group(2).strip()
-        
-        return sections
+        return DocumentAnalysis(text, section_spans=spans).sections
     
     def extract_contact_info(self, text):
         """Extract contact information from the resume"""
-        contact_info = {}
-        
-        # Email pattern
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(email_pattern, text)
-        if emails:
-            contact_info['email'] = emails[0]
-        
-        # Phone number pattern
-        phone_pattern = r'(?:\+?\d{1,3}[\s-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}'
-        phones = re.findall(phone_pattern, text)
-        if phones:
-            contact_info['phone'] = phones[0]
-        
-        # Address patterns (simplified)
-        address_pattern = r'\d+\s+\w+\s+\w+\s*(?:\w+\s*)*,\s*\w+\s+\d{5}'
-        addresses = re.findall(address_pattern, text)
-        if addresses:
-            contact_info['address'] = addresses[0]
-        
-        # LinkedIn URL
-        linkedin_pattern = r'linkedin\.com\/in\/[^\s\/]+|linkedin\.com\/pub\/[^\s\/]+|linkedin\.com\/in\/[^\s]+|linkedin\.com\/pub\/[^\s]+'
-        linkedin_urls = re.findall(linkedin_pattern, text, re.IGNORECASE)
-        if linkedin_urls:
-            contact_info['linkedin'] = linkedin_urls[0]
-        
-        return contact_info
+        return DocumentAnalysis(text, cleaned_text=text).contact_info
     
     def extract_education(self, text):
         """Extract education information from the resume"""
         education = []
         
         # Common degree patterns
-        degree_patterns = [
-            r'((?:Bachelor|Master|Doctor|PhD|B\.?[A-Z]*|M\.?[A-Z]*|B\.Sc|M\.Sc|B\.Tech|M\.Tech|B\.A|M\.A)[^\n]+?)\n',
-            r'((?:Bachelors?|Masters?|Doctorate|PhD)[^\n]+?)(?:\n|\b(?:skills|experience|summary)\b)',
-        ]
-        
-        for pattern in degree_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.DOTALL)
+        for pattern in patterns.DEGREE_LINES:
+            matches = pattern.findall(text)
             for match in matches:
                 # Extract degree, field, institution, and year
                 edu_entry = self.parse_education_entry(match.strip())
@@ -186,41 +349,78 @@ class ResumeParser:
         entry = {}
         
         # Institution
-        institution_pattern = r'(University|College|Institute|School)[\w\s,.-]*'
-        institution_match = re.search(institution_pattern, text, re.IGNORECASE)
+        institution_match = patterns.INSTITUTION.search(text)
         if institution_match:
             entry['institution'] = institution_match.group(0).strip()
         
         # Degree
-        degree_pattern = r'(?:Bachelor|Master|Doctor|PhD|B\.?[A-Z]*|M\.?[A-Z]*|B\.Sc|M\.Sc|B\.Tech|M\.Tech|B\.A|M\.A|Bachelors?|Masters?|Doctorate)[\w\s&-]*'
-        degree_match = re.search(degree_pattern, text, re.IGNORECASE)
+        degree_match = patterns.DEGREE.search(text)
         if degree_match:
             entry['degree'] = degree_match.group(0).strip()
         
         # Year/Date
-        year_pattern = r'(?:\d{4}|\d{2})[\s/-]?(?:present|\d{4}|\d{2})?'
-        year_match = re.search(year_pattern, text)
+        year_match = patterns.YEAR.search(text)
         if year_match:
             entry['year'] = year_match.group(0).strip()
         
         return entry if entry else None
     
-    def extract_experience(self, text):
-        """Extract work experience from the resume"""
-        experiences = []
+    def parse_experience_header(self, line):
+        """Split a 'Title at Company (dates)' line, returns None if it is not one"""
+        duration = None
+        date_match = patterns.EXPERIENCE_DATE_RANGE.search(line)
+        if date_match:
+            duration = date_match.group(0).strip()
+            line = line[:date_match.start()] + ' ' + line[date_match.end():]
+        line = line.strip(' \t()[],|-')
         
-        # Common patterns for work experience
-        # This is a simplified approach - in a real application, you'd want more sophisticated parsing
-        experience_pattern = r'([\w\s]+)\s*(?:-|at|@)\s*([\w\s,.-]+)\s*(?:\(|,|\n)?\s*([\w\s/-]+)?'
-        matches = re.findall(experience_pattern, text, re.IGNORECASE)
-        
-        for match in matches:
-            exp_entry = {
-                'job_title': match[0].strip(),
-                'company': match[1].strip(),
-                'duration': match[2].strip() if match[2] else None
-            }
-            experiences.append(exp_entry)
+        parts = patterns.EXPERIENCE_SEPARATOR.split(line, maxsplit=1)
+        if len(parts) != 2:
+            return {'duration': duration} if duration and not line else None
+        
+        job_title, company = parts[0].strip(' ,|'), parts[1].strip(' ,|')
+        if not job_title or not company or not job_title[0].isupper():
+            return None
+        if len(job_title.split()) > 8 or len(company.split()) > 10 or line.endswith('.'):
+            # Too long for a heading; most likely a sentence in a description
+            return None
+        return {'job_title': job_title, 'company': company, 'duration': duration}
+    
+    def extract_experience(self, text, spans=None):
+        """Extract work experience entries from the experience section
+        
+        Runs a small state machine over the lines of the section: an entry
+        starts at a 'Title at/@/-/| Company' heading, a date range on the
+        heading or on the line right after it becomes its duration, and
+        everything else is description. Each line is looked at once with
+        patterns that cannot backtrack across lines, so the cost is linear in
+        the length of the text, and at most MAX_EXPERIENCE_ENTRIES entries
+        are returned.
+        """
+        if spans is None:
+            spans = segment_sections(text)
+        
+        experiences = []
+        current = None
+        for line in section_text(text, spans, 'experience').splitlines():
+            stripped = line.strip()
+            if not stripped or stripped[0] in BULLET_CHARS or len(stripped) > self.MAX_EXPERIENCE_HEADER_CHARS:
+                # Description text; only a heading can follow on from here
+                continue
+            
+            entry = self.parse_experience_header(stripped)
+            if entry is None:
+                continue
+            if 'job_title' not in entry:
+                # A date line on its own belongs to the entry above it
+                if current is not None and current['duration'] is None:
+                    current['duration'] = entry['duration']
+                continue
+            
+            if len(experiences) == self.MAX_EXPERIENCE_ENTRIES:
+                break
+            current = entry
+            experiences.append(current)
         
         return experiences
 
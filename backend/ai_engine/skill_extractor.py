@@ -3,39 +3,37 @@ import re
 import nltk
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize
-from nltk.tag import pos_tag
 from collections import Counter
 import json
 import os
 
+from ai_engine.skill_matcher import SkillMatcher
+from ai_engine.nlp_resources import configure_nltk, spacy_model_source
+
 
 class SkillExtractor:
+    # Skill extraction only reads token.text, is_stop and is_punct, which come
+    # from the tokenizer and lexeme attributes, so none of these are loaded
+    SPACY_EXCLUDED_COMPONENTS = [
+        'tok2vec', 'tagger', 'parser', 'senter', 'attribute_ruler', 'lemmatizer', 'ner'
+    ]
+    
     def __init__(self):
         self.nlp = None
         self.technical_skills = self.load_technical_skills()
         self.soft_skills = self.load_soft_skills()
         self.industry_keywords = self.load_industry_keywords()
         
-        # Initialize NLTK resources
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt')
-        
-        try:
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('stopwords')
+        # Compile the taxonomy once so each text is scanned in a single pass
+        self.skill_matcher = SkillMatcher(self.technical_skills | self.soft_skills)
         
-        try:
-            nltk.data.find('taggers/averaged_perceptron_tagger')
-        except LookupError:
-            nltk.download('averaged_perceptron_tagger')
+        # The NLTK fallback tokenizer reads the bootstrapped data directory
+        configure_nltk()
         
         # Load spaCy model if available, otherwise use NLTK
         try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
+            self.nlp = spacy.load(spacy_model_source(), exclude=self.SPACY_EXCLUDED_COMPONENTS)
+        except (OSError, ValueError):
             print("spaCy model not found. Using NLTK for NLP processing.")
             self.nlp = None
     
@@ -109,49 +107,28 @@ class SkillExtractor:
             return self.extract_skills_nltk(text)
         
         doc = self.nlp(text.lower())
+        return self.skills_from_doc(text, doc)
+    
+    def skills_from_doc(self, text, doc):
+        """Extract skills from text that has already been run through spaCy"""
+        # Single words that spaCy treats as stop words (e.g. 'go') are not skills
+        stop_tokens = {token.text for token in doc if token.is_stop or token.is_punct}
         
-        # Extract tokens and entities
-        tokens = [token.text for token in doc if not token.is_stop and not token.is_punct]
-        
-        found_skills = []
-        
-        # Check for single-word skills
-        for token in tokens:
-            if token in self.technical_skills or token in self.soft_skills:
-                found_skills.append(token)
-        
-        # Check for multi-word skills (phrases)
-        text_lower = text.lower()
-        for skill in self.technical_skills.union(self.soft_skills):
-            if len(skill.split()) > 1 and skill in text_lower:
-                found_skills.append(skill)
+        # Find single- and multi-word skills in one pass over the text
+        found_skills = [
+            skill for skill in self.skill_matcher.find_all(text)
+            if ' ' in skill or skill not in stop_tokens
+        ]
         
         return list(set(found_skills))
     
     def extract_skills_nltk(self, text):
         """Extract skills using NLTK"""
-        # Tokenize the text
-        tokens = word_tokenize(text.lower())
-        
-        # Get part-of-speech tags
-        pos_tags = pos_tag(tokens)
-        
-        # Extract skills based on keywords
-        found_skills = []
-        
-        # Check for single-word skills
-        for token in tokens:
-            if token in self.technical_skills or token in self.soft_skills:
-                found_skills.append(token)
-        
-        # Check for multi-word skills (phrases)
-        text_lower = text.lower()
-        for skill in self.technical_skills.union(self.soft_skills):
-            if len(skill.split()) > 1 and skill in text_lower:
-                found_skills.append(skill)
+        # Find single- and multi-word skills in one pass over the text
+        found_skills = self.skill_matcher.find_all(text)
         
         # Use regex patterns to find potential skills
-        potential_skills = self.find_potential_skills_regex(text_lower)
+        potential_skills = self.find_potential_skills_regex(text.lower())
         found_skills.extend(potential_skills)
         
         return list(set(found_skills))
@@ -190,6 +167,36 @@ class SkillExtractor:
         else:
             skills = self.extract_skills_nltk(text)
         
+        return self.build_skills_result(skills)
+    
+    def extract_skills_batch(self, texts, batch_size=64, n_process=1):
+        """Extract skills from many texts, streaming them through nlp.pipe
+
+        Returns one result per input text, in the same order, in the format
+        of extract_skills.
+        """
+        texts = list(texts)
+        results = [[] for _ in texts]
+        
+        # Empty texts keep their placeholder, like extract_skills
+        pending = [(i, text) for i, text in enumerate(texts) if text]
+        
+        if self.nlp:
+            docs = self.nlp.pipe(
+                (text.lower() for _, text in pending),
+                batch_size=batch_size,
+                n_process=n_process
+            )
+            for (i, text), doc in zip(pending, docs):
+                results[i] = self.build_skills_result(self.skills_from_doc(text, doc))
+        else:
+            for i, text in pending:
+                results[i] = self.build_skills_result(self.extract_skills_nltk(text))
+        
+        return results
+    
+    def build_skills_result(self, skills):
+        """Package extracted skills in the format returned by extract_skills"""
         # Categorize skills
         categorized_skills = self.categorize_skills(skills)
         
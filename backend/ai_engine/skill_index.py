@@ -0,0 +1,64 @@
+import numpy as np
+import scipy.sparse as sp
+
+
+def normalize_skills(skills):
+    """Lower-cased, stripped, de-duplicated skill names from a list or comma-separated string"""
+    if isinstance(skills, str):
+        skills = skills.split(',')
+    elif not isinstance(skills, (list, tuple, set)):
+        return []
+    return list(dict.fromkeys(str(skill).lower().strip() for skill in skills))
+
+
+class SkillVocabulary:
+    """Interns normalised skill names as dense integer ids.
+
+    Ids are only ever added, so an id handed out once keeps meaning the same
+    skill for the lifetime of the vocabulary; column `i` of a job x skill
+    matrix is the skill `names([i])[0]`.
+    """
+
+    def __init__(self, skills=None):
+        self._ids = {}
+        self._names = []
+        for skill in skills or []:
+            self._ids[skill] = len(self._names)
+            self._names.append(skill)
+
+    def __len__(self):
+        return len(self._names)
+
+    def intern(self, skills):
+        """Sorted ids for the skills, adding any that are new"""
+        ids = []
+        for skill in normalize_skills(skills):
+            skill_id = self._ids.get(skill)
+            if skill_id is None:
+                skill_id = self._ids[skill] = len(self._names)
+                self._names.append(skill)
+            ids.append(skill_id)
+        return np.array(sorted(ids), dtype=np.int32)
+
+    def lookup(self, skills):
+        """Sorted ids of the skills already in the vocabulary; unknown skills cannot match any job"""
+        ids = [self._ids[skill] for skill in normalize_skills(skills) if skill in self._ids]
+        return np.array(sorted(ids), dtype=np.int32)
+
+    def names(self, ids):
+        return [self._names[skill_id] for skill_id in ids]
+
+    def to_list(self):
+        return list(self._names)
+
+
+def stack_skill_rows(rows, n_skills):
+    """Binary job x skill CSR matrix from per-job sorted skill id arrays"""
+    indptr = np.zeros(len(rows) + 1, dtype=np.int32)
+    indptr[1:] = np.cumsum([len(row) for row in rows])
+    if indptr[-1]:
+        indices = np.concatenate(rows).astype(np.int32, copy=False)
+    else:
+        indices = np.zeros(0, dtype=np.int32)
+    data = np.ones(len(indices), dtype=np.float32)
+    return sp.csr_matrix((data, indices, indptr), shape=(len(rows), n_skills))
@@ -0,0 +1,124 @@
+import re
+from collections import deque
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton over a skill taxonomy.
+
+    The taxonomy is compiled once, after which every single- and multi-word
+    skill in a text is found in one linear pass, independent of how many
+    skills the taxonomy holds. Matches must sit on word boundaries, so 'java'
+    does not fire inside 'javascript' and 'c' does not fire inside 'c++' or
+    'objective-c'.
+    """
+
+    # Characters that make a neighbouring character part of the same word
+    JOINER_CHARS = '+#'
+    # Characters that only join words when another word character follows,
+    # as in 'node.js' or 'scikit-learn'
+    INFIX_CHARS = '.-'
+
+    def __init__(self, skills=()):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        self.skills = set()
+        for skill in skills:
+            self._add(skill)
+        self._build_failure_links()
+
+    @staticmethod
+    def normalize(text):
+        """Lowercase and collapse whitespace so phrases match across line breaks"""
+        return re.sub(r'\s+', ' ', text.lower()).strip() if text else ""
+
+    def _add(self, skill):
+        skill = self.normalize(skill)
+        if not skill or skill in self.skills:
+            return
+        self.skills.add(skill)
+
+        state = 0
+        for char in skill:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state] = self._output[state] + (skill,)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+
+                # Inherit the skills that end at the failure state (suffix matches)
+                if self._output[self._fail[next_state]]:
+                    self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    @classmethod
+    def _is_word_char(cls, char):
+        return char.isalnum() or char == '_' or char in cls.JOINER_CHARS
+
+    def _is_boundary_before(self, text, start):
+        if start == 0:
+            return True
+        previous = text[start - 1]
+        if self._is_word_char(previous):
+            return False
+        if previous in self.INFIX_CHARS and start >= 2 and self._is_word_char(text[start - 2]):
+            return False
+        return True
+
+    def _is_boundary_after(self, text, end):
+        if end >= len(text):
+            return True
+        following = text[end]
+        if self._is_word_char(following):
+            return False
+        if following in self.INFIX_CHARS and end + 1 < len(text) and self._is_word_char(text[end + 1]):
+            return False
+        return True
+
+    def iter_matches(self, text, normalized=False):
+        """Yield (start, end, skill) for every skill found in the text"""
+        if not normalized:
+            text = self.normalize(text)
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for skill in output[state]:
+                end = position + 1
+                start = end - len(skill)
+                if self._is_boundary_before(text, start) and self._is_boundary_after(text, end):
+                    yield start, end, skill
+
+    def find_all(self, text):
+        """Return the distinct skills found in the text, in order of first appearance"""
+        found = {}
+        for _, _, skill in self.iter_matches(text):
+            found.setdefault(skill, None)
+        return list(found)
+
+    def __len__(self):
+        return len(self.skills)
+
+    def __contains__(self, skill):
+        return self.normalize(skill) in self.skills
@@ -1,9 +1,13 @@
-import re
 import os
 import json
 from datetime import datetime
 from werkzeug.utils import secure_filename
 
+from ai_engine import patterns
+from ai_engine.patterns import SECTION_HEADERS
+from ai_engine.document_analysis import DocumentAnalysis
+from ai_engine.nlp_resources import configure_nltk
+
 
 def validate_file_type(filename):
     """Validate if the file type is allowed"""
@@ -27,8 +31,12 @@ def generate_unique_filename(original_filename):
 
 
 def calculate_ats_score(text, required_keywords=None):
-    """Calculate a basic ATS score based on keyword presence and resume structure"""
-    if not text:
+    """Calculate a basic ATS score based on keyword presence and resume structure
+
+    `text` is the resume text or a DocumentAnalysis of it.
+    """
+    analysis = text if isinstance(text, DocumentAnalysis) else DocumentAnalysis(text)
+    if not analysis.text:
         return 0
     
     # Default keywords if none provided
@@ -39,16 +47,15 @@ def calculate_ats_score(text, required_keywords=None):
         ]
     
     # Calculate keyword presence score (0-50)
-    text_lower = text.lower()
     keywords_found = 0
     for keyword in required_keywords:
-        if keyword.lower() in text_lower:
+        if analysis.contains(keyword):
             keywords_found += 1
     
     keyword_score = min(50, (keywords_found / len(required_keywords)) * 50)
     
     # Calculate content score (0-30) based on length and structure
-    word_count = len(text.split())
+    word_count = analysis.word_count
     if word_count < 100:
         content_score = 0
     elif word_count < 300:
@@ -59,18 +66,7 @@ def calculate_ats_score(text, required_keywords=None):
         content_score = 30
     
     # Calculate format score (0-20) based on structure indicators
-    format_score = 0
-    structure_indicators = [
-        r'\d{4}',  # years
-        r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b',  # proper names
-        r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\b',  # months
-        r'\b(?:Bachelor|Master|PhD|B\.?[A-Z]*|M\.?[A-Z]*)\b',  # degrees
-        r'\b(?:Inc|LLC|Corp|Company|Ltd)\b'  # company indicators
-    ]
-    
-    for indicator in structure_indicators:
-        if re.search(indicator, text):
-            format_score += 3
+    format_score = 3 * sum(analysis.structure_indicators)
     
     format_score = min(20, format_score)
     
@@ -81,51 +77,36 @@ def calculate_ats_score(text, required_keywords=None):
     return min(100, max(0, round(total_score)))
 
 
-def analyze_resume_sections(text):
-    """Analyze different sections of the resume"""
-    sections = {}
+def analyze_resume_sections(text, spans=None):
+    """Analyze different sections of the resume
     
-    # Define section patterns
-    section_patterns = {
-        'summary': r'(summary|objective|profile):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
-        'experience': r'(experience|work experience|employment history):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
-        'education': r'(education|academic background):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
-        'skills': r'(skills|technical skills|core competencies):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
-        'certifications': r'(certifications|certificates):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
-        'projects': r'(projects|project experience):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
-        'awards': r'(awards|honors):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
-    }
+    `text` is the resume text or a DocumentAnalysis of it. `spans` are the
+    section offsets from segment_sections over the same text, if known.
+    """
+    analysis = text if isinstance(text, DocumentAnalysis) else DocumentAnalysis(text, section_spans=spans)
     
-    for section_name, pattern in section_patterns.items():
-        match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE | re.DOTALL)
-        if match:
-            sections[section_name] = {
-                'found': True,
-                'content': match.group(2).strip(),
-                'length': len(match.group(2).strip())
-            }
-        else:
-            sections[section_name] = {
-                'found': False,
-                'content': '',
-                'length': 0
-            }
+    sections = {}
+    for section_name in SECTION_HEADERS:
+        content = analysis.sections.get(section_name, '')
+        sections[section_name] = {
+            'found': section_name in analysis.sections,
+            'content': content,
+            'length': len(content)
+        }
     
     return sections
 
 
 def extract_keywords(text, top_n=20):
     """Extract top keywords from text"""
-    import nltk
     from nltk.corpus import stopwords
     from nltk.tokenize import word_tokenize
     from collections import Counter
     
+    # NLTK data is bootstrapped ahead of time (ai_engine.nlp_resources) and
+    # never downloaded here
+    configure_nltk()
     try:
-        # Download required NLTK data if not already present
-        nltk.download('punkt', quiet=True)
-        nltk.download('stopwords', quiet=True)
-        
         # Tokenize the text
         tokens = word_tokenize(text.lower())
         
@@ -143,7 +124,7 @@ def extract_keywords(text, top_n=20):
     except:
         # Fallback if NLTK is not available
         # Simple keyword extraction using regex
-        words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
+        words = patterns.FALLBACK_KEYWORD.findall(text.lower())
         word_freq = Counter(words)
         top_keywords = [word for word, freq in word_freq.most_common(top_n)]
         return top_keywords
@@ -170,7 +151,7 @@ def load_analysis_results(filepath):
 def format_phone_number(phone_str):
     """Format phone number to a standard format"""
     # Remove all non-digits
-    digits = re.sub(r'\D', '', phone_str)
+    digits = patterns.NON_DIGITS.sub('', phone_str)
     
     if len(digits) == 10:
         # US format
@@ -185,5 +166,5 @@ def format_phone_number(phone_str):
 def sanitize_text(text):
     """Sanitize text by removing potentially harmful characters"""
     # Remove null bytes and other control characters
-    sanitized = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', text)
+    sanitized = patterns.CONTROL_CHARS.sub('', text)
     return sanitized.strip()
\ No newline at end of file
@@ -18,6 +18,11 @@ app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///resume_analyzer.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 5 * 1024 * 1024  # 5MB max file size
+app.config['AI_ENGINE_WARM_UP'] = os.environ.get('AI_ENGINE_WARM_UP', '1') == '1'
+# Build the engine while importing the app, for servers that import it once in
+# a master process and then fork workers (gunicorn --preload app:app)
+app.config['AI_ENGINE_PRELOAD'] = os.environ.get('AI_ENGINE_PRELOAD', '0') == '1'
+app.config['NLP_RESOURCE_CHECK'] = os.environ.get('NLP_RESOURCE_CHECK', '1') == '1'
 
 # Initialize extensions
 db = SQLAlchemy(app)
@@ -35,6 +40,10 @@ from routes.user import user_bp
 from routes.resume import resume_bp
 from routes.job import job_bp
 from routes.analysis import analysis_bp
+from ai_engine.registry import get_registry
+from ai_engine.nlp_resources import verify_resources
+from services.job_index_sync import sync_job_index
+from services.commands import job_index_cli, match_store_cli
 
 # Register blueprints
 app.register_blueprint(auth_bp, url_prefix='/api/auth')
@@ -43,6 +52,29 @@ app.register_blueprint(resume_bp, url_prefix='/api/resumes')
 app.register_blueprint(job_bp, url_prefix='/api/jobs')
 app.register_blueprint(analysis_bp, url_prefix='/api/analysis')
 
+# Maintenance commands: flask --app app job-index rebuild|check, match-store refresh|apply-job-changes|status
+app.cli.add_command(job_index_cli)
+app.cli.add_command(match_store_cli)
+
+# Refuse to start without the bootstrapped NLTK corpora and spaCy model
+# (python -m ai_engine.nlp_resources bootstrap) instead of failing, or
+# downloading, on the first request
+if app.config['NLP_RESOURCE_CHECK']:
+    verify_resources()
+
+# With preload the spaCy vocab, skill taxonomy, NLTK corpora and job index are
+# loaded once before the fork and shared copy-on-write by every worker.
+# Otherwise the shared AI engine is built once per worker process, and
+# /api/analysis/ready reports 503 until warm-up has finished
+if app.config['AI_ENGINE_PRELOAD']:
+    with app.app_context():
+        get_registry().preload(load_state=lambda: sync_job_index(force=True))
+        # Loading the job index opened pooled connections; close them so no
+        # worker inherits, and shares, a connection of the master's
+        db.engine.dispose()
+elif app.config['AI_ENGINE_WARM_UP']:
+    get_registry().start_warm_up(background=True)
+
 # Create upload directories
 os.makedirs(os.path.join(app.root_path, 'uploads', 'resumes'), exist_ok=True)
 
@@ -0,0 +1,89 @@
+"""Batch matching resumes x jobs: per-resume ranking loop vs blocked BatchMatcher.
+
+The loop is the old JobMatcher.batch_match: rank_jobs for one resume at a
+time, each a transform, a matrix-vector product per component and a pass
+over every job. It is timed on a sample of resumes and extrapolated, since
+the full run takes minutes. BatchMatcher scores blocks of resumes with one
+sparse matrix-matrix product each for text and skills, in-process and in a
+pool of forked workers, streaming top-k results as blocks finish. The top-k
+rankings of the sampled resumes must be identical across all paths.
+
+The matcher is built without NLTK; texts are already plain synthetic words.
+
+Usage: python benchmarks/bench_batch_match.py [n_resumes] [n_jobs] [workers]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_engine.batch_matcher import BatchMatcher
+from ai_engine.job_matcher import JobMatcher
+from benchmarks.bench_job_index import synthetic_text
+
+TOP_K = 10
+LOOP_SAMPLE = 50
+
+SKILLS = [f"skill {i}" for i in range(1000)]
+EDUCATION = ['Bachelor', 'Master', 'PhD', 'High School', '']
+
+
+def synthetic_resumes(rng, n_resumes):
+    return [{'id': i, 'raw_text': synthetic_text(rng, 300), 'extracted_skills': rng.sample(SKILLS, rng.randint(10, 40)),
+             'total_experience_years': rng.randint(0, 12), 'education': rng.choice(EDUCATION)}
+            for i in range(n_resumes)]
+
+
+def synthetic_jobs(rng, n_jobs):
+    return [{'id': i, 'title': f"Job {i}", 'description': synthetic_text(rng, 150),
+             'skills_required': rng.sample(SKILLS, rng.randint(3, 12)),
+             'min_experience_years': rng.choice([0, 1, 2, 3, 5, 8]), 'education_required': rng.choice(EDUCATION)}
+            for i in range(n_jobs)]
+
+
+def top_ids(results):
+    return [[match['job_id'] for match in result['matched_jobs']] for result in results]
+
+
+def streamed(batch, resumes):
+    """Run a batch, noting when the first result arrived"""
+    start = time.perf_counter()
+    first = None
+    results = []
+    for result in batch.iter_matches(resumes):
+        if first is None:
+            first = time.perf_counter() - start
+        results.append(result)
+    return (time.perf_counter() - start) * 1000, first * 1000, results
+
+
+if __name__ == "__main__":
+    n_resumes = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    n_jobs = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else min(4, os.cpu_count() or 1)
+
+    rng = random.Random(13)
+    matcher = object.__new__(JobMatcher)
+    matcher.preprocess_text = lambda text: text or ""
+    jobs = synthetic_jobs(rng, n_jobs)
+    resumes = synthetic_resumes(rng, n_resumes)
+    job_index = matcher.build_job_index(jobs)
+    job_index.score('')  # materialise the matrices outside the timings
+    sample = resumes[:LOOP_SAMPLE]
+
+    start = time.perf_counter()
+    loop_top = top_ids([{'resume_id': resume['id'], 'matched_jobs': matcher.rank_jobs(resume, jobs, TOP_K, job_index)}
+                        for resume in sample])
+    loop_ms = (time.perf_counter() - start) * 1000 / len(sample) * n_resumes
+    print(f"{n_resumes} resumes x {n_jobs} jobs, top {TOP_K}")
+    print(f"  per-resume loop   ~{loop_ms / 1000:8.1f} s   (extrapolated from {len(sample)} resumes)")
+
+    runs = [('blocked, 1 process', 1)] + ([(f'blocked, {workers} workers', workers)] if workers > 1 else [])
+    for label, n_workers in runs:
+        batch = BatchMatcher(matcher, jobs, job_index=job_index, top_k=TOP_K, workers=n_workers)
+        total_ms, first_ms, results = streamed(batch, iter(resumes))
+        same = top_ids(results[:len(sample)]) == loop_top and len(results) == n_resumes
+        print(f"  {label:<20} {total_ms / 1000:8.1f} s   speed-up {loop_ms / total_ms:5.1f}x   "
+              f"({batch.block_size} resumes per block, first result after {first_ms:7.1f} ms)   same top-{TOP_K}: {same}")
@@ -0,0 +1,110 @@
+"""Contact extraction on 50KB resumes: full-text scans vs header region first.
+
+The old extractor ran four findall scans over the whole cleaned text, and its
+address pattern `\\d+\\s+\\w+\\s+\\w+\\s*(?:\\w+\\s*)*,` backtracks exponentially
+on a number followed by a long run of words with no comma. The current one
+searches the first DocumentAnalysis.CONTACT_REGION_CHARS characters with
+bounded patterns and only scans the whole text when that region has nothing.
+
+The old extractor runs in a child process so a runaway match can be cut off.
+
+Usage: python benchmarks/bench_contact_extraction.py [n_chars]
+"""
+import multiprocessing
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_engine.document_analysis import DocumentAnalysis
+
+OLD_PATTERNS = [
+    ('email', r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', 0),
+    ('phone', r'(?:\+?\d{1,3}[\s-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}', 0),
+    ('address', r'\d+\s+\w+\s+\w+\s*(?:\w+\s*)*,\s*\w+\s+\d{5}', 0),
+    ('linkedin', r'linkedin\.com\/in\/[^\s\/]+|linkedin\.com\/pub\/[^\s\/]+|linkedin\.com\/in\/[^\s]+|'
+                 r'linkedin\.com\/pub\/[^\s]+', re.IGNORECASE),
+]
+
+# Seconds the old extractor may run before it is reported as not finishing
+OLD_TIMEOUT = 10
+
+FILLER = (
+    "designed built deployed maintained services for customers across teams using modern tooling "
+    "and led initiatives improving reliability performance and delivery of products in production"
+).split()
+
+HEADER = "Jane Smith jane.smith@example.com (555) 123-4567 12 Oak Tree Lane, Springfield 62701 linkedin.com/in/janesmith"
+
+
+def body(rng, n_chars):
+    words = []
+    size = 0
+    while size < n_chars:
+        word = rng.choice(FILLER)
+        words.append(word)
+        size += len(word) + 1
+    return ' '.join(words)
+
+
+def inputs(n_chars):
+    rng = random.Random(11)
+    return {
+        'contact in header': HEADER + ' ' + body(rng, n_chars - len(HEADER)),
+        'no contact details': body(rng, n_chars),
+        'contact in footer': body(rng, n_chars - len(HEADER)) + ' ' + HEADER,
+        # A house number followed by thousands of words and no comma
+        'address trap': '12 ' + body(rng, n_chars - 3),
+    }
+
+
+def old_contact_info(text):
+    contact_info = {}
+    for field, pattern, flags in OLD_PATTERNS:
+        matches = re.findall(pattern, text, flags)
+        if matches:
+            contact_info[field] = matches[0]
+    return contact_info
+
+
+def new_contact_info(text):
+    return DocumentAnalysis(text, cleaned_text=text).contact_info
+
+
+def time_old(text):
+    start = time.perf_counter()
+    old_contact_info(text)
+    return (time.perf_counter() - start) * 1000
+
+
+def timed(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+if __name__ == "__main__":
+    n_chars = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    print(f"{'input':<20} {'old ms':>10} {'new ms':>8}  fields found")
+
+    pool = multiprocessing.Pool(1)
+    for name, text in inputs(n_chars).items():
+        pending = pool.apply_async(time_old, (text,))
+        try:
+            old_column = f"{pending.get(OLD_TIMEOUT):10.2f}"
+        except multiprocessing.TimeoutError:
+            # Still backtracking: replace the stuck process
+            old_column = f"{'>' + str(OLD_TIMEOUT * 1000):>10}"
+            pool.terminate()
+            pool = multiprocessing.Pool(1)
+
+        new_ms, found = timed(lambda: new_contact_info(text))
+        print(f"{name:<20} {old_column} {new_ms:8.3f}  {', '.join(sorted(found)) or '-'}")
+    pool.terminate()
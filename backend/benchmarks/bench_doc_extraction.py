@@ -0,0 +1,176 @@
+"""Legacy .doc extraction: built-in reader speed, antiword concurrency and timeouts.
+
+Three measurements:
+  1. The pure-Python Word 97-2003 reader on synthetic .doc files of growing
+     size (written by the small generator below: an OLE2 container with a
+     WordDocument stream, a 1Table stream and a two-piece piece table, one
+     8-bit and one UTF-16 piece).
+  2. A batch of .doc extractions on many threads against a stand-in
+     antiword that sleeps: the peak number of converter processes alive at
+     once must not exceed RESUME_ANTIWORD_PROCESSES.
+  3. A stand-in antiword that hangs: it is killed at the timeout and the
+     built-in reader answers instead.
+
+Usage: python benchmarks/bench_doc_extraction.py [n_docs]
+"""
+import math
+import os
+import stat
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_engine import doc_reader
+
+SECTOR = 512
+MINI_SECTOR = 64
+MINI_CUTOFF = 4096
+FREE, END, FAT_MARK = 0xFFFFFFFF, 0xFFFFFFFE, 0xFFFFFFFD
+
+
+def word_streams(paragraphs, unicode_tail):
+    """WordDocument and 1Table streams for a document with two text pieces"""
+    ascii_text = ''.join(paragraph + '\r' for paragraph in paragraphs)
+    # A hyperlink field: only the displayed text should survive
+    ascii_text += '\x13 HYPERLINK "https://example.com" \x14Portfolio\x15\r'
+    text_offset = 0x800
+    word = bytearray(text_offset)
+    struct.pack_into('<H', word, 0, doc_reader.WORD_IDENT)
+    struct.pack_into('<H', word, 0x0A, 0x0200)  # table stream is 1Table
+    struct.pack_into('<I', word, 0x4C, len(ascii_text) + len(unicode_tail))
+    word += ascii_text.encode('cp1252')
+    unicode_offset = len(word)
+    word += unicode_tail.encode('utf-16-le')
+
+    positions = [0, len(ascii_text), len(ascii_text) + len(unicode_tail)]
+    plc = struct.pack('<3I', *positions)
+    plc += struct.pack('<HIH', 0, (text_offset * 2) | 0x40000000, 0)  # compressed piece
+    plc += struct.pack('<HIH', 0, unicode_offset, 0)  # UTF-16 piece
+    table = b'\x02' + struct.pack('<I', len(plc)) + plc
+    struct.pack_into('<II', word, 0x1A2, 0, len(table))
+    return {'WordDocument': bytes(word), '1Table': table}
+
+
+def write_ole(path, streams):
+    """Write an OLE2 compound file; streams under 4096 bytes go to the mini stream"""
+    sectors, fat = [], []
+
+    def allocate(data):
+        if not data:
+            return END
+        start = len(sectors)
+        count = math.ceil(len(data) / SECTOR)
+        for i in range(count):
+            sectors.append(data[i * SECTOR:(i + 1) * SECTOR].ljust(SECTOR, b'\0'))
+            fat.append(start + i + 1 if i + 1 < count else END)
+        return start
+
+    mini_stream, mini_fat, entries = bytearray(), [], []
+    for name, data in streams.items():
+        if len(data) < MINI_CUTOFF:
+            start = len(mini_stream) // MINI_SECTOR
+            count = math.ceil(len(data) / MINI_SECTOR)
+            mini_fat.extend(start + i + 1 if i + 1 < count else END for i in range(count))
+            mini_stream += data.ljust(count * MINI_SECTOR, b'\0')
+        else:
+            start = allocate(data)
+        entries.append((name, 2, start, len(data)))
+
+    root_start = allocate(bytes(mini_stream))
+    mini_fat_start = allocate(struct.pack(f'<{len(mini_fat)}I', *mini_fat))
+    mini_fat_sectors = math.ceil(len(mini_fat) * 4 / SECTOR)
+
+    directory = b''
+    for index, (name, kind, start, size) in enumerate([('Root Entry', 5, root_start, len(mini_stream))] + entries):
+        encoded = (name + '\0').encode('utf-16-le')
+        right = index + 1 if 0 < index < len(entries) else FREE
+        child = 1 if index == 0 and entries else FREE
+        directory += (encoded.ljust(64, b'\0') + struct.pack('<HBBIII', len(encoded), kind, 1, FREE, right, child)
+                      + b'\0' * 36 + struct.pack('<III', start, size, 0))
+    directory_start = allocate(directory)
+
+    fat_count = 1
+    while (len(sectors) + fat_count) * 4 > fat_count * SECTOR:
+        fat_count += 1
+    fat_start = len(sectors)
+    fat.extend([FAT_MARK] * fat_count)
+    fat.extend([FREE] * (fat_count * SECTOR // 4 - len(fat)))
+    fat_bytes = struct.pack(f'<{len(fat)}I', *fat)
+    sectors.extend(fat_bytes[i * SECTOR:(i + 1) * SECTOR] for i in range(fat_count))
+
+    difat = [fat_start + i for i in range(fat_count)] + [FREE] * (109 - fat_count)
+    header = (doc_reader.OLE_SIGNATURE + b'\0' * 16 + struct.pack('<HHHHH', 0x3E, 3, 0xFFFE, 9, 6) + b'\0' * 6
+              + struct.pack('<IIIIIIIII', 0, fat_count, directory_start, 0, MINI_CUTOFF, mini_fat_start,
+                            mini_fat_sectors, END, 0)
+              + struct.pack('<109I', *difat))
+    with open(path, 'wb') as f:
+        f.write(header + b''.join(sectors))
+
+
+def fake_antiword(directory, seconds):
+    """Stand-in antiword that logs start/end times around a sleep"""
+    path = os.path.join(directory, f'antiword-{seconds}')
+    log = os.path.join(directory, 'antiword.log')
+    with open(path, 'w') as f:
+        f.write(f'#!/bin/sh\necho "start $(date +%s.%N)" >> {log}\nsleep {seconds}\n'
+                f'echo "end $(date +%s.%N)" >> {log}\necho "converted by antiword"\n')
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path, log
+
+
+def peak_concurrency(log):
+    events = []
+    with open(log) as f:
+        for line in f:
+            kind, stamp = line.split()
+            events.append((float(stamp), 1 if kind == 'start' else -1))
+    running = peak = 0
+    for _, change in sorted(events, key=lambda event: (event[0], event[1])):
+        running += change
+        peak = max(peak, running)
+    return peak
+
+
+if __name__ == "__main__":
+    n_docs = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    unicode_tail = 'Résumé — Zürich, naïve café\r'
+
+    with tempfile.TemporaryDirectory() as directory:
+        print("built-in reader (no antiword)")
+        doc_reader.ANTIWORD_PATH = ''
+        sample = None
+        for n_paragraphs in [10, 100, 1000, 10000]:
+            path = os.path.join(directory, f'resume{n_paragraphs}.doc')
+            paragraphs = [f'Senior Engineer at Company {i}\x07Python\x07Docker' for i in range(n_paragraphs)]
+            write_ole(path, word_streams(paragraphs, unicode_tail))
+            start = time.perf_counter()
+            text = doc_reader.extract_doc_text(path)
+            elapsed = (time.perf_counter() - start) * 1000
+            sample = sample or text
+            print(f"  {n_paragraphs:>6} paragraphs  {os.path.getsize(path) / 1024:8.1f} KB  {elapsed:8.2f} ms  "
+                  f"{len(text):>8} chars")
+        print("  sample:", repr(sample[:60]), '...', repr(sample[-45:]))
+
+        path = os.path.join(directory, 'resume10.doc')
+        antiword, log = fake_antiword(directory, 0.3)
+        doc_reader.ANTIWORD_PATH = antiword
+        threads = [threading.Thread(target=doc_reader.extract_doc_text, args=(path,)) for _ in range(n_docs)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print(f"\n{n_docs} concurrent extractions, {doc_reader.ANTIWORD_MAX_PROCESSES} antiword slots: "
+              f"peak {peak_concurrency(log)} converter processes, {time.perf_counter() - start:.2f} s")
+
+        hanging, _ = fake_antiword(directory, 60)
+        doc_reader.ANTIWORD_PATH = hanging
+        doc_reader.ANTIWORD_TIMEOUT = 1
+        start = time.perf_counter()
+        text = doc_reader.antiword_text(path)
+        print(f"hanging antiword: gave up after {time.perf_counter() - start:.2f} s (returned {text!r}); "
+              f"extract_doc_text falls back to {len(doc_reader.extract_doc_text(path))} chars from the built-in reader")
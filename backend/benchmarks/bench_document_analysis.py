@@ -0,0 +1,141 @@
+"""Passes over the resume text per analysis request, before and after DocumentAnalysis.
+
+Before, analyze_resume ran the parser's cleaning, section and contact scans,
+then calculate_ats_score lowercased, split and regex-scanned the raw text, and
+analyze_resume_sections re-ran the seven section searches. Now the parser
+builds one DocumentAnalysis, its results are reused by the scoring helpers,
+and nothing is computed twice.
+
+A pass is one whole-text operation: a regex scan, a lower()/split(), a
+substring test, or clean_text (counted as one in both flows). Education and
+experience extraction are unchanged and left out of both counts.
+
+Usage: python benchmarks/bench_document_analysis.py [n_chars]
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_engine.document_analysis import DocumentAnalysis
+from ai_engine.utils import calculate_ats_score, analyze_resume_sections
+
+OLD_SECTION_PATTERNS = {
+    'summary': r'(summary|objective|profile):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
+    'experience': r'(experience|work experience|employment history):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
+    'education': r'(education|academic background):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
+    'skills': r'(skills|technical skills|core competencies):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
+    'certifications': r'(certifications|certificates):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
+    'projects': r'(projects|project experience):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
+    'awards': r'(awards|honors):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
+}
+OLD_CONTACT_PATTERNS = [
+    (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', 0),
+    (r'(?:\+?\d{1,3}[\s-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}', 0),
+    (r'linkedin\.com\/in\/[^\s\/]+|linkedin\.com\/pub\/[^\s\/]+', re.IGNORECASE),
+]
+OLD_ATS_KEYWORDS = [
+    'experience', 'education', 'skills', 'summary', 'objective',
+    'work', 'projects', 'certifications', 'awards', 'contact'
+]
+OLD_STRUCTURE_INDICATORS = [
+    r'\d{4}', r'\b[A-Z][a-z]+\s+[A-Z][a-z]+\b', r'\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\b',
+    r'\b(?:Bachelor|Master|PhD|B\.?[A-Z]*|M\.?[A-Z]*)\b', r'\b(?:Inc|LLC|Corp|Company|Ltd)\b'
+]
+
+FILLER = (
+    "designed built deployed maintained services for customers across teams using modern tooling "
+    "and led initiatives improving reliability performance and delivery of products in production"
+).split()
+
+
+def synthetic_resume(rng, n_chars):
+    parts = ["Jane Smith", "jane.smith@example.com | (555) 123-4567 | linkedin.com/in/janesmith"]
+    for heading in ['Summary', 'Work Experience', 'Projects', 'Education', 'Skills']:
+        parts.append(heading)
+        size = 0
+        while size < n_chars // 5:
+            line = '- ' + ' '.join(rng.choice(FILLER) for _ in range(12))
+            parts.append(line)
+            size += len(line) + 1
+    return '\n'.join(parts)
+
+
+def old_flow(text):
+    """The previous analyze_resume path, counting its passes over the text"""
+    passes = 0
+
+    # ResumeParser: clean_text, extract_sections, extract_contact_info
+    cleaned = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', re.sub(r'\s+', ' ', text)).strip()
+    passes += 1
+    for pattern in OLD_SECTION_PATTERNS.values():
+        re.search(pattern, cleaned, re.IGNORECASE | re.MULTILINE)
+        passes += 1
+    for pattern, flags in OLD_CONTACT_PATTERNS:
+        re.findall(pattern, cleaned, flags)
+        passes += 1
+    passes += 1  # the address pattern, left out here because it can backtrack for seconds
+
+    # calculate_ats_score
+    text_lower = text.lower()
+    passes += 1
+    for keyword in OLD_ATS_KEYWORDS:
+        _ = keyword in text_lower
+        passes += 1
+    len(text.split())
+    passes += 1
+    for indicator in OLD_STRUCTURE_INDICATORS:
+        re.search(indicator, text)
+        passes += 1
+
+    # analyze_resume_sections
+    for pattern in OLD_SECTION_PATTERNS.values():
+        re.search(pattern, text, re.IGNORECASE | re.MULTILINE | re.DOTALL)
+        passes += 1
+
+    return passes
+
+
+def new_flow(text):
+    """The current path: one analysis in the parser, reused by the scoring helpers"""
+    analysis = DocumentAnalysis(text)
+    parsed_data = {
+        'raw_text': text,
+        'cleaned_text': analysis.cleaned_text,
+        'sections': analysis.sections,
+        'section_spans': analysis.section_spans,
+        'contact_info': analysis.contact_info,
+    }
+
+    # store_analysis
+    shared = DocumentAnalysis.from_parsed(parsed_data)
+    calculate_ats_score(shared)
+    analyze_resume_sections(shared)
+
+    return len(analysis.passes) + len(shared.passes), analysis.passes + shared.passes
+
+
+def timed(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+if __name__ == "__main__":
+    n_chars = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    text = synthetic_resume(random.Random(5), n_chars)
+
+    old_passes = old_flow(text)
+    new_passes, labels = new_flow(text)
+    print(f"resume: {len(text)} characters")
+    print(f"passes per request   before {old_passes:3d}   after {new_passes:3d}")
+    print("after:", ', '.join(labels))
+    print(f"time per request     before {timed(lambda: old_flow(text)):7.2f} ms"
+          f"   after {timed(lambda: new_flow(text)):7.2f} ms")
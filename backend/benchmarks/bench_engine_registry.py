@@ -0,0 +1,81 @@
+"""Cold vs warm per-request latency of the AI engine components.
+
+Cold mirrors the old request path, where every request constructed a fresh
+ResumeParser, SkillExtractor, JobMatcher and SkillGapAnalyzer. Warm borrows
+them from the process-wide registry.
+
+Usage: python benchmarks/bench_engine_registry.py [iterations]
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_engine.resume_parser import ResumeParser
+from ai_engine.skill_extractor import SkillExtractor
+from ai_engine.job_matcher import JobMatcher
+from ai_engine.skill_gap_analyzer import SkillGapAnalyzer
+from ai_engine.registry import EngineRegistry
+
+SAMPLE_RESUME = os.path.join(os.path.dirname(__file__), '..', '..', 'test_resume.pdf')
+
+JOB = {
+    'description': 'Senior Python engineer with Docker, Kubernetes and AWS experience.',
+    'skills_required': ['python', 'docker', 'kubernetes', 'aws'],
+    'min_experience_years': 2,
+    'education_required': 'Bachelor'
+}
+
+
+def handle_request(parser, extractor, matcher, gap_analyzer):
+    """The work done by analyze-resume followed by a single job match"""
+    parsed = parser.parse_resume(SAMPLE_RESUME)
+    skills = extractor.extract_skills(parsed['raw_text'])
+    resume_data = {
+        'raw_text': parsed['raw_text'],
+        'extracted_skills': skills['all_skills'] if skills else [],
+        'total_experience_years': len(parsed['experience']),
+        'education': parsed['education']
+    }
+    matcher.match_resume_to_job(resume_data, JOB)
+    gap_analyzer.analyze_skill_gaps(resume_data['extracted_skills'], JOB['skills_required'])
+
+
+def cold_request():
+    handle_request(ResumeParser(), SkillExtractor(), JobMatcher(), SkillGapAnalyzer())
+
+
+def warm_request(registry):
+    handle_request(registry.parser, registry.extractor, registry.matcher, registry.gap_analyzer)
+
+
+def measure(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label, timings):
+    print(f"{label:<6} mean {statistics.mean(timings):9.2f} ms   "
+          f"median {statistics.median(timings):9.2f} ms   max {max(timings):9.2f} ms")
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    registry = EngineRegistry()
+    start = time.perf_counter()
+    registry.warm_up()
+    print(f"registry warm-up: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    cold = measure(cold_request, iterations)
+    warm = measure(lambda: warm_request(registry), iterations)
+
+    report('cold', cold)
+    report('warm', warm)
+    print(f"speed-up (median): {statistics.median(cold) / statistics.median(warm):.1f}x")
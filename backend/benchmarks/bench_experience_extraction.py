@@ -0,0 +1,78 @@
+"""Worst-case cost of experience extraction as the text grows.
+
+The old extractor ran `([\\w\\s]+)\\s*(?:-|at|@)\\s*([\\w\\s,.-]+)...` over the
+whole cleaned text; on text with few separators its nested `[\\w\\s]+` groups
+backtrack and the runtime grows quadratically. The line-based extractor
+should stay linear on the same adversarial inputs: the time per character
+ought to stay roughly flat as the size doubles.
+
+Usage: python benchmarks/bench_experience_extraction.py [max_chars]
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_engine.resume_parser import ResumeParser
+
+OLD_PATTERN = r'([\w\s]+)\s*(?:-|at|@)\s*([\w\s,.-]+)\s*(?:\(|,|\n)?\s*([\w\s/-]+)?'
+
+# The old pattern is only run up to this size; beyond it each doubling takes
+# four times as long
+OLD_MAX_CHARS = 8000
+
+
+def repeat_to(unit, size):
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+def adversarial_inputs(size):
+    """Inputs aimed at the weak spots of each approach"""
+    return {
+        # No separator anywhere: the old pattern retries every split point
+        'words, no separators': "Experience\n" + repeat_to("word ", size),
+        # Heading-sized lines without a separator: every line is examined
+        'short lines, no separators': "Experience\n" + repeat_to("word " * 30 + "\n", size),
+        # One enormous line full of near-miss headings
+        'single long line': "Experience\n" + repeat_to("Engineer at Company 2019 - ", size),
+        # Thousands of genuine headings: the entry cap must kick in
+        'heading per line': "Experience\n" + repeat_to("Engineer at Company Jan 2019 - Present\n", size),
+        # Almost-dates on lines that never qualify as a heading, so the cap
+        # never ends the scan early
+        'near-miss dates': "Experience\n" + repeat_to("title at co 2019 20 jan 2020 - 19 feb 1999 to\n", size),
+    }
+
+
+def timed(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+if __name__ == "__main__":
+    max_chars = int(sys.argv[1]) if len(sys.argv) > 1 else 1600000
+    parser = ResumeParser()
+
+    sizes = []
+    size = 1000
+    while size <= max_chars:
+        sizes.append(size)
+        size *= 2
+
+    for name in adversarial_inputs(1):
+        print(f"\n{name}")
+        print(f"{'chars':>9} {'old ms':>10} {'new ms':>10} {'new us/kchar':>13} {'entries':>8}")
+        for size in sizes:
+            text = adversarial_inputs(size)[name]
+            old_ms = None
+            if size <= OLD_MAX_CHARS:
+                old_ms, _ = timed(lambda: re.findall(OLD_PATTERN, parser.clean_text(text), re.IGNORECASE), 1)
+            new_ms, entries = timed(lambda: parser.extract_experience(text))
+            old_column = f"{old_ms:10.1f}" if old_ms is not None else f"{'-':>10}"
+            print(f"{size:>9} {old_column} {new_ms:10.2f} {new_ms * 1000 / (size / 1000):13.1f} {len(entries):>8}")
@@ -0,0 +1,68 @@
+"""Per-request text scoring cost: pairwise TF-IDF refits vs a corpus JobIndex.
+
+The pairwise path is what JobMatcher.calculate_tfidf_similarity does for each
+resume/job pair. The indexed path fits once over the corpus and then scores a
+resume with one transform and one sparse matrix-vector product.
+
+Usage: python benchmarks/bench_job_index.py [n_jobs ...]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from ai_engine.job_index import JobIndex
+
+VOCABULARY = (
+    "python java javascript react angular django flask docker kubernetes aws azure gcp "
+    "sql postgresql mongodb redis kafka spark hadoop airflow terraform ansible linux "
+    "engineer developer senior junior lead manager team agile scrum design build deploy "
+    "scalable services api microservices data pipeline machine learning cloud security "
+    "testing automation frontend backend fullstack mobile ios android analytics dashboard"
+).split()
+
+
+def synthetic_text(rng, n_words):
+    return ' '.join(rng.choice(VOCABULARY) for _ in range(n_words))
+
+
+def pairwise_scores(resume_text, jobs):
+    vectorizer = TfidfVectorizer(stop_words='english', max_features=5000, ngram_range=(1, 2))
+    scores = []
+    for job in jobs:
+        matrix = vectorizer.fit_transform([resume_text, job['description']])
+        scores.append(float(cosine_similarity(matrix[0:1], matrix[1:2])[0][0]))
+    return scores
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000]
+    rng = random.Random(42)
+    resume_text = synthetic_text(rng, 400)
+
+    for n_jobs in sizes:
+        jobs = [{'id': i, 'description': synthetic_text(rng, 150)} for i in range(n_jobs)]
+
+        start = time.perf_counter()
+        index = JobIndex().build(jobs)
+        index.score('')  # materialise the job matrix
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        index.score(resume_text)
+        indexed_ms = (time.perf_counter() - start) * 1000
+
+        # The pairwise path is linear in jobs, so time a sample and extrapolate
+        sample = jobs[:min(n_jobs, 500)]
+        start = time.perf_counter()
+        pairwise_scores(resume_text, sample)
+        pairwise_ms = (time.perf_counter() - start) * 1000 * n_jobs / len(sample)
+
+        print(f"{n_jobs:>7} jobs   pairwise {pairwise_ms:10.1f} ms   "
+              f"indexed {indexed_ms:8.2f} ms   (one-off build {build_ms:8.1f} ms)   "
+              f"speed-up {pairwise_ms / indexed_ms:8.0f}x")
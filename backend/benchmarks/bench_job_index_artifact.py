@@ -0,0 +1,55 @@
+"""Worker warm start: building the job index from descriptions vs mapping a saved artifact.
+
+The build path is what every worker did on its first sync: vectorise every
+active job description and stack the matrix. The artifact path loads the
+build written by JobIndex.save() with numpy memory-mapping. Scores from the
+two must match exactly. RSS growth is how much the process's resident
+memory grows while loading: mapped pages only become resident when read,
+and are shared with every other process mapping the same build.
+
+Usage: python benchmarks/bench_job_index_artifact.py [n_jobs ...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_engine.job_index import JobIndex
+from benchmarks.bench_job_index import synthetic_text
+
+
+def rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+
+
+def timed(fn):
+    rss = rss_mb()
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, rss_mb() - rss, result
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000]
+    rng = random.Random(42)
+    resume_text = synthetic_text(rng, 400)
+
+    for n_jobs in sizes:
+        jobs = [{'id': i, 'description': synthetic_text(rng, 150)} for i in range(n_jobs)]
+        with tempfile.TemporaryDirectory() as directory:
+            build_ms, build_rss, built = timed(lambda: JobIndex().build(jobs))
+            built.score('')  # materialise the job matrix before saving
+            save_ms, _, build = timed(lambda: built.save(directory))
+            size_mb = sum(os.path.getsize(os.path.join(build, name)) for name in os.listdir(build)) / (1024 * 1024)
+
+            loaded = JobIndex()
+            load_ms, load_rss, _ = timed(lambda: loaded.load(directory))
+            identical = (built.score(resume_text) == loaded.score(resume_text)).all()
+
+        print(f"{n_jobs:>7} jobs   build {build_ms:9.1f} ms (+{build_rss:6.1f} MB RSS)   "
+              f"load {load_ms:7.2f} ms (+{load_rss:5.1f} MB RSS)   artifact {size_mb:6.1f} MB "
+              f"(save {save_ms:6.1f} ms)   identical scores: {identical}")
@@ -0,0 +1,109 @@
+"""Re-ranking one resume's job matches under several weight vectors.
+
+The old path scored every resume/job pair through match_resume_to_job for
+each weighting: four similarity components per job, blended in Python, then
+a full sort. The component path builds the jobs x 4 component array once
+(JobMatcher.component_scores) and re-ranks each weighting with one
+matrix-vector product (weighted_scores). Text and skill similarities come
+from the same job index on both paths, so only the blending differs; the
+top-k rankings must match.
+
+The matcher is built without NLTK since every job is indexed and no text
+needs preprocessing.
+
+Usage: python benchmarks/bench_match_weights.py [n_jobs ...]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_engine.job_index import JobIndex
+from ai_engine.job_matcher import JobMatcher
+from benchmarks.bench_job_index import synthetic_text
+
+TOP_K = 10
+
+WEIGHTINGS = [
+    None,
+    {'text_similarity': 0.5, 'skills_similarity': 0.5},
+    {'skills_similarity': 0.6, 'experience_similarity': 0.3, 'education_similarity': 0.1},
+    {'text_similarity': 1, 'skills_similarity': 1, 'experience_similarity': 1, 'education_similarity': 1},
+    {'experience_similarity': 0.7, 'education_similarity': 0.3},
+]
+
+SKILLS = [f"skill {i}" for i in range(500)]
+EDUCATION = ['Bachelor', 'Master', 'PhD', 'High School', '']
+
+
+def per_pair(matcher, index, resume, jobs, weights):
+    """One weighting the old way: every pair through match_resume_to_job, then sort"""
+    text_scores = index.similarities(resume['raw_text'])
+    skill_scores = index.skill_similarities(resume['extracted_skills'])
+    if weights is not None:
+        weights = matcher.weights_dict(matcher.weight_vector(weights))
+    matches = []
+    for job in jobs:
+        result = matcher.match_resume_to_job(
+            resume, job, weights=weights,
+            text_similarity=text_scores.get(job['id'], 0.0),
+            skills_similarity=skill_scores.get(job['id']),
+            include_skill_lists=False
+        )
+        matches.append((result['match_percentage'], job['id']))
+    matches.sort(key=lambda match: match[0], reverse=True)
+    return [job_id for _, job_id in matches[:TOP_K]]
+
+
+def old_rerank(matcher, index, resume, jobs):
+    return [per_pair(matcher, index, resume, jobs, weights) for weights in WEIGHTINGS]
+
+
+def component_rerank(matcher, index, resume, jobs):
+    components = matcher.component_scores(resume, jobs, job_index=index)
+    rankings = []
+    for weights in WEIGHTINGS:
+        scores = matcher.weighted_scores(components, weights)
+        rankings.append([jobs[row]['id'] for row in matcher.rank_order(scores, TOP_K)])
+    return rankings
+
+
+def timed(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000]
+    rng = random.Random(11)
+    matcher = object.__new__(JobMatcher)
+    resume = {
+        'raw_text': synthetic_text(rng, 400),
+        'extracted_skills': rng.sample(SKILLS, 40),
+        'total_experience_years': 4,
+        'education': 'Master of Science'
+    }
+
+    for n_jobs in sizes:
+        jobs = [{'id': i, 'description': synthetic_text(rng, 150), 'skills_required': rng.sample(SKILLS, rng.randint(3, 12)),
+                 'min_experience_years': rng.choice([0, 1, 2, 3, 5, 8]), 'education_required': rng.choice(EDUCATION)}
+                for i in range(n_jobs)]
+        index = JobIndex().build(jobs)
+        index.score('')  # materialise the matrices outside the timings
+
+        old_ms, old_top = timed(lambda: old_rerank(matcher, index, resume, jobs))
+        new_ms, new_top = timed(lambda: component_rerank(matcher, index, resume, jobs))
+        components_ms, components = timed(lambda: matcher.component_scores(resume, jobs, job_index=index))
+        reweight_ms, _ = timed(lambda: matcher.weighted_scores(components, WEIGHTINGS[1]))
+
+        print(f"{n_jobs:>7} jobs x {len(WEIGHTINGS)} weightings   per-pair {old_ms:9.1f} ms   "
+              f"components {new_ms:7.1f} ms   speed-up {old_ms / new_ms:5.1f}x   "
+              f"(component array {components_ms:6.1f} ms, each re-weighting {reweight_ms:6.3f} ms)   "
+              f"same top-{TOP_K}: {old_top == new_top}")
@@ -0,0 +1,126 @@
+"""Per-worker memory with and without preloading the engine before fork.
+
+Each mode runs in a fresh master process that forks worker processes the
+way a pre-forking server does (gunicorn --preload). Without preload every
+worker builds the extractor, matcher, gap analyzer and job index itself;
+with preload the master builds them through EngineRegistry.preload(), which
+freezes them with gc.freeze(), and the workers only use them. Every worker
+then serves a few requests (skill extraction and job scoring) before its
+memory is read.
+
+Unique RSS (USS) is Private_Clean + Private_Dirty from /proc/<pid>/smaps_rollup:
+the memory that would be freed if that worker exited. PSS splits shared
+pages between the processes using them. Linux only.
+
+Usage: python benchmarks/bench_preload_memory.py [workers] [n_jobs]
+"""
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_engine.registry import EngineRegistry, PRELOAD_COMPONENTS
+
+WORDS = ("python java react docker kubernetes aws sql machine learning data pipelines microservices "
+         "leadership communication agile testing security cloud analytics design backend frontend").split()
+
+RESUME = ("Senior software engineer with Python, Docker, Kubernetes and AWS experience. Led a team "
+          "building data pipelines and machine learning services; strong communication and leadership.")
+
+
+def synthetic_jobs(n_jobs):
+    rng = random.Random(3)
+    return [{'id': i, 'description': ' '.join(rng.choice(WORDS) for _ in range(80))} for i in range(n_jobs)]
+
+
+def memory_kb(pid):
+    """Rss, Pss and unique (private) memory of a process in KB"""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    return {
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'uss': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+    }
+
+
+def serve(registry, jobs, preloaded):
+    """Worker body: build the engine unless preloaded, then handle a few requests"""
+    if not preloaded:
+        registry.warm_up(PRELOAD_COMPONENTS)
+        if registry.warm_up_error is None:
+            registry.job_index.build(jobs)
+    for _ in range(5):
+        registry.extractor.extract_skills(RESUME)
+        if registry.warm_up_error is None:
+            registry.job_index.score(RESUME)
+
+
+def run_master(preload, n_workers, n_jobs):
+    """Fork the workers, print one line per worker and the totals"""
+    jobs = synthetic_jobs(n_jobs)
+    registry = EngineRegistry()
+    if preload:
+        registry.preload(load_state=lambda: registry.job_index.build(jobs))
+    if registry.warm_up_error:
+        # NLTK's lookup errors span a whole banner; the resource line is enough
+        reason = next(line.strip() for line in registry.warm_up_error.splitlines() if line.strip('* '))
+        print(f"  (engine partially built: {reason})")
+
+    children = []
+    for _ in range(n_workers):
+        ready_read, ready_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_read)
+            try:
+                serve(registry, jobs, preload)
+            except Exception as e:
+                print(f"  worker error: {str(e)}")
+            os.write(ready_write, b'1')
+            signal.pause()
+            os._exit(0)
+        os.close(ready_write)
+        children.append((pid, ready_read))
+
+    for _, ready_read in children:
+        os.read(ready_read, 1)
+        os.close(ready_read)
+    time.sleep(0.2)
+
+    totals = {'rss': 0, 'pss': 0, 'uss': 0}
+    for index, (pid, _) in enumerate(children):
+        memory = memory_kb(pid)
+        for key in totals:
+            totals[key] += memory[key]
+        print(f"  worker {index}  rss {memory['rss'] / 1024:8.1f} MB  pss {memory['pss'] / 1024:8.1f} MB  "
+              f"unique {memory['uss'] / 1024:8.1f} MB")
+    master = memory_kb(os.getpid())
+    print(f"  master    rss {master['rss'] / 1024:8.1f} MB  pss {master['pss'] / 1024:8.1f} MB")
+    print(f"  workers   pss {totals['pss'] / 1024:8.1f} MB  unique {totals['uss'] / 1024:8.1f} MB in total, "
+          f"{totals['uss'] / 1024 / n_workers:.1f} MB unique per worker")
+
+    for pid, _ in children:
+        os.kill(pid, signal.SIGTERM)
+        os.waitpid(pid, 0)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--master':
+        run_master(sys.argv[2] == 'preload', int(sys.argv[3]), int(sys.argv[4]))
+        sys.exit(0)
+
+    n_workers = sys.argv[1] if len(sys.argv) > 1 else '4'
+    n_jobs = sys.argv[2] if len(sys.argv) > 2 else '5000'
+    for mode in ['lazy', 'preload']:
+        print(f"{mode}: {n_workers} workers, {n_jobs} jobs")
+        # A fresh interpreter per mode so neither run inherits the other's heap
+        subprocess.run([sys.executable, os.path.abspath(__file__), '--master', mode, n_workers, n_jobs], check=True)
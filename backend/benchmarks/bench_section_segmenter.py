@@ -0,0 +1,94 @@
+"""Section lookup on long resumes: seven pattern scans vs one segmenter pass.
+
+The old code ran one `re.search` per section, each compiled from a string
+pattern at call time and each rescanning the text from the start (the parser
+and analyze_resume_sections did this twice per resume). segment_sections finds
+every heading in a single scan and returns offsets that both consumers reuse.
+
+Usage: python benchmarks/bench_section_segmenter.py [n_chars ...]
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_engine.patterns import segment_sections, section_text
+
+OLD_SECTION_PATTERNS = {
+    'summary': r'(summary|objective|profile):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
+    'experience': r'(experience|work experience|employment history):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
+    'education': r'(education|academic background):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
+    'skills': r'(skills|technical skills|core competencies):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
+    'certifications': r'(certifications|certificates):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
+    'projects': r'(projects|project experience):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
+    'awards': r'(awards|honors):?\s*([^\n]+(?:\n(?![A-Z])[^\n]+)*)',
+}
+
+FILLER = (
+    "designed built deployed maintained services for customers across teams using modern tooling "
+    "and led initiatives improving reliability performance and delivery of products in production"
+).split()
+
+
+def synthetic_resume(rng, n_chars):
+    # Headings appear late and some never do, so the old scans walk most of
+    # the text before finding (or failing to find) each one
+    headings = ['Summary', 'Work Experience', 'Projects', 'Education', 'Skills']
+    body_chars = n_chars // len(headings)
+    parts = []
+    for heading in headings:
+        parts.append(heading)
+        lines = []
+        size = 0
+        while size < body_chars:
+            line = '- ' + ' '.join(rng.choice(FILLER) for _ in range(12))
+            lines.append(line)
+            size += len(line) + 1
+        parts.extend(lines)
+    return '\n'.join(parts)
+
+
+def seven_scans(text):
+    sections = {}
+    for section_name, pattern in OLD_SECTION_PATTERNS.items():
+        match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+        if match:
+            sections[section_name] = match.group(2).strip()
+    return sections
+
+
+def one_pass(text):
+    spans = segment_sections(text)
+    return {section: section_text(text, spans, section) for section in spans}
+
+
+def timed(fn, repeat=5, purge=False):
+    best = None
+    for _ in range(repeat):
+        if purge:
+            re.purge()
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [5000, 20000, 100000, 400000]
+    rng = random.Random(3)
+
+    print(f"{'chars':>8} {'7 scans ms':>11} {'(cold re cache)':>16} {'1 pass ms':>10} {'speed-up':>9}")
+    for size in sizes:
+        text = synthetic_resume(rng, size)
+        # The old flow ran the scans twice: once in the parser, once in
+        # analyze_resume_sections; the offsets are computed once and shared
+        old_ms = timed(lambda: (seven_scans(text), seven_scans(text)))
+        # Purging the re cache adds back the compile the old code paid once
+        # other patterns had churned the cache
+        cold_ms = timed(lambda: (seven_scans(text), seven_scans(text)), purge=True)
+        new_ms = timed(lambda: one_pass(text))
+        print(f"{len(text):>8} {old_ms:11.2f} {cold_ms:16.2f} {new_ms:10.2f} {old_ms / new_ms:8.1f}x")
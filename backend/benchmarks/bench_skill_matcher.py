@@ -0,0 +1,86 @@
+"""Skill lookup cost as the taxonomy grows: substring scan vs SkillMatcher.
+
+The scan mirrors the old extract_skills_* code, which rebuilt the taxonomy
+union on every call and tested `skill in text_lower` for each multi-word
+skill. SkillMatcher compiles the taxonomy once and walks the text once.
+
+Usage: python benchmarks/bench_skill_matcher.py [taxonomy_size ...]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_engine.skill_matcher import SkillMatcher
+
+BASE_SKILLS = [
+    'python', 'java', 'javascript', 'react', 'node.js', 'c++', 'c#', 'docker', 'kubernetes', 'aws',
+    'spring boot', 'machine learning', 'problem solving', 'time management', 'github actions',
+    'power bi', 'sql server', 'critical thinking', 'ci/cd', 'scikit-learn'
+]
+
+FILLER = (
+    "designed built deployed maintained services for customers across teams using modern tooling "
+    "and led initiatives improving reliability performance and delivery of products in production"
+).split()
+
+
+def synthetic_taxonomy(rng, size):
+    taxonomy = set(BASE_SKILLS)
+    while len(taxonomy) < size:
+        n_words = rng.choice([1, 2, 2, 3])
+        taxonomy.add(' '.join(''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(3, 9)))
+                              for _ in range(n_words)))
+    return taxonomy
+
+
+def synthetic_resume(rng, n_words=800):
+    words = [rng.choice(FILLER) for _ in range(n_words)]
+    for skill in BASE_SKILLS:
+        words.insert(rng.randrange(len(words)), skill)
+    return ' '.join(words)
+
+
+def substring_scan(technical, soft, text):
+    found = []
+    text_lower = text.lower()
+    tokens = text_lower.split()
+    for token in tokens:
+        if token in technical or token in soft:
+            found.append(token)
+    for skill in technical.union(soft):
+        if len(skill.split()) > 1 and skill in text_lower:
+            found.append(skill)
+    return set(found)
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) * 1000 / repeat, result
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [200, 5000, 50000]
+    rng = random.Random(7)
+    text = synthetic_resume(rng)
+    print(f"resume: {len(text)} characters")
+
+    for size in sizes:
+        taxonomy = synthetic_taxonomy(rng, size)
+        half = len(taxonomy) // 2
+        technical = set(list(taxonomy)[:half])
+        soft = set(list(taxonomy)[half:])
+
+        start = time.perf_counter()
+        matcher = SkillMatcher(taxonomy)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        scan_ms, _ = timed(lambda: substring_scan(technical, soft, text), 5)
+        matcher_ms, _ = timed(lambda: matcher.find_all(text), 5)
+
+        print(f"{size:>7} skills   scan {scan_ms:9.2f} ms   automaton {matcher_ms:7.2f} ms   "
+              f"(one-off compile {build_ms:8.1f} ms)")
@@ -0,0 +1,89 @@
+"""Skill matching for one resume against every job: per-pair set loop vs job x skill matrix.
+
+The loop is the old per-job path: calculate_skills_similarity,
+get_matched_skills and get_missing_skills each normalise both skill lists
+into fresh sets, three times per resume/job pair. The indexed path counts
+matched skills for every job with one sparse matrix-vector product over the
+JobIndex's binary job x skill matrix, then builds matched/missing lists for
+the top k jobs only.
+
+Jobs are indexed with empty descriptions so only the skill side is built.
+
+Usage: python benchmarks/bench_skill_similarity.py [n_jobs ...]
+"""
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_engine.job_index import JobIndex
+
+TOP_K = 10
+
+# A taxonomy the size of SkillExtractor's, plus a long tail of rarer skills
+SKILLS = [f"skill {i}" for i in range(2000)]
+
+
+def old_skill_sets(resume_skills, job_skills):
+    resume_set = set([skill.lower().strip() for skill in resume_skills])
+    job_set = set([skill.lower().strip() for skill in job_skills])
+    return resume_set, job_set
+
+
+def old_loop(resume_skills, jobs):
+    """Score every job, then sort; lists were built for every job along the way"""
+    matches = []
+    for job in jobs:
+        resume_set, job_set = old_skill_sets(resume_skills, job['skills_required'])
+        similarity = len(resume_set & job_set) / len(job_set) if resume_set and job_set else 0.0
+        matched = list(old_skill_sets(resume_skills, job['skills_required'])[0] & job_set)
+        resume_set, job_set = old_skill_sets(resume_skills, job['skills_required'])
+        missing = list(job_set - resume_set)
+        matches.append((similarity, job['id'], matched, missing))
+    matches.sort(key=lambda match: match[0], reverse=True)
+    return matches[:TOP_K]
+
+
+def indexed(index, resume_skills):
+    scores = index.skill_scores(resume_skills)
+    job_ids = index.job_ids
+    top = np.argsort(-scores, kind='stable')[:TOP_K]
+    return [(scores[i], job_ids[i]) + index.skill_overlap(job_ids[i], resume_skills) for i in top]
+
+
+def timed(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    rng = random.Random(7)
+    # Skewed so popular skills are shared by many jobs
+    weights = [1.0 / (rank + 1) for rank in range(len(SKILLS))]
+    resume_skills = [skill.title() for skill in rng.choices(SKILLS, weights, k=40)]
+
+    for n_jobs in sizes:
+        jobs = [{'id': i, 'description': '', 'skills_required': rng.choices(SKILLS, weights, k=rng.randint(3, 15))}
+                for i in range(n_jobs)]
+
+        start = time.perf_counter()
+        index = JobIndex().build(jobs)
+        index.skill_scores([])  # materialise the job x skill matrix
+        build_ms = (time.perf_counter() - start) * 1000
+
+        loop_ms, loop_top = timed(lambda: old_loop(resume_skills, jobs))
+        index_ms, index_top = timed(lambda: indexed(index, resume_skills))
+        same = [round(match[0], 12) for match in loop_top] == [round(match[0], 12) for match in index_top]
+
+        print(f"{n_jobs:>7} jobs   loop {loop_ms:9.1f} ms   indexed {index_ms:7.2f} ms   "
+              f"speed-up {loop_ms / index_ms:6.0f}x   (one-off build {build_ms:8.1f} ms)   same top-{TOP_K} scores: {same}")
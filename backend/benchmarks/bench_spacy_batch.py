@@ -0,0 +1,72 @@
+"""Skill extraction throughput: full per-document spaCy vs trimmed nlp.pipe.
+
+Before: the full en_core_web_sm pipeline (tagger, parser, NER, lemmatizer)
+run on one resume at a time, as extract_skills_spacy used to do.
+After: SkillExtractor.extract_skills_batch, which loads spaCy without the
+unused components and streams documents through nlp.pipe.
+
+Requires the en_core_web_sm model.
+
+Usage: python benchmarks/bench_spacy_batch.py [n_docs] [batch_size] [n_process]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import spacy
+
+from ai_engine.skill_extractor import SkillExtractor
+
+SKILLS = ['Python', 'Java', 'React', 'Docker', 'Kubernetes', 'AWS', 'SQL', 'machine learning',
+          'problem solving', 'communication', 'Spring Boot', 'Node.js', 'C++', 'team leadership']
+FILLER = ("Designed and delivered scalable services, mentored engineers, improved reliability "
+          "and worked closely with product teams to ship features used by millions of customers.").split()
+
+
+def synthetic_corpus(n_docs, rng):
+    corpus = []
+    for _ in range(n_docs):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(250, 600))]
+        for skill in rng.sample(SKILLS, 6):
+            words.insert(rng.randrange(len(words)), skill + ',')
+        corpus.append(' '.join(words))
+    return corpus
+
+
+def docs_per_second(fn, corpus):
+    start = time.perf_counter()
+    fn(corpus)
+    return len(corpus) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    n_docs = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    batch_size = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    n_process = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+
+    try:
+        full_nlp = spacy.load("en_core_web_sm")
+    except OSError:
+        print("en_core_web_sm is not installed: python -m spacy download en_core_web_sm")
+        sys.exit(1)
+
+    corpus = synthetic_corpus(n_docs, random.Random(3))
+    extractor = SkillExtractor()
+
+    def before(texts):
+        for text in texts:
+            doc = full_nlp(text.lower())
+            extractor.skills_from_doc(text, doc)
+
+    def after(texts):
+        extractor.extract_skills_batch(texts, batch_size=batch_size, n_process=n_process)
+
+    before_rate = docs_per_second(before, corpus)
+    after_rate = docs_per_second(after, corpus)
+    print(f"{n_docs} synthetic resumes")
+    print(f"before (full pipeline, one doc at a time): {before_rate:10.1f} docs/sec")
+    print(f"after  (trimmed, nlp.pipe batch={batch_size}, n_process={n_process}): {after_rate:10.1f} docs/sec")
+    print(f"speed-up: {after_rate / before_rate:.1f}x")
@@ -0,0 +1,57 @@
+"""Picking the top k job matches: full sort of every match vs argpartition on the score array.
+
+The sort path is what the match route used to do: a response dict for
+every active job, a sort of the whole list, then [:k]. The argpartition
+path (JobMatcher.rank_order) selects the k winners from the score array in
+linear time, sorts just those, and builds dicts for them only. Scores are
+rounded to two decimals like match percentages, so ties are common; both
+paths must return the same jobs in the same order.
+
+Usage: python benchmarks/bench_top_k.py [n_jobs ...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_engine.job_matcher import JobMatcher
+
+TOP_KS = [10, 100]
+
+
+def full_sort(job_ids, scores, k):
+    matches = [{'job_id': job_id, 'match_percentage': float(score)} for job_id, score in zip(job_ids, scores)]
+    matches.sort(key=lambda match: match['match_percentage'], reverse=True)
+    return matches[:k]
+
+
+def partitioned(matcher, job_ids, scores, k):
+    return [{'job_id': job_ids[row], 'match_percentage': float(scores[row])} for row in matcher.rank_order(scores, k)]
+
+
+def timed(fn, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, result
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    rng = np.random.default_rng(5)
+    matcher = object.__new__(JobMatcher)
+
+    for n_jobs in sizes:
+        job_ids = list(range(n_jobs))
+        scores = np.round(rng.beta(2, 5, n_jobs) * 100, 2)
+        for k in TOP_KS:
+            sort_ms, sorted_top = timed(lambda: full_sort(job_ids, scores, k))
+            partition_ms, partition_top = timed(lambda: partitioned(matcher, job_ids, scores, k))
+            print(f"{n_jobs:>8} jobs  top {k:>3}   full sort {sort_ms:8.1f} ms   argpartition {partition_ms:7.2f} ms   "
+                  f"speed-up {sort_ms / partition_ms:6.0f}x   identical: {sorted_top == partition_top}")
@@ -0,0 +1,78 @@
+"""Cold-start report for the web workers, and a budget check for `import app`.
+
+Runs `python -X importtime -c "import app"` in a fresh interpreter (best of
+a few runs) and prints the slowest imports by cumulative time plus the
+total per top-level package. Exits non-zero when importing the app takes
+longer than the budget, or when any of the heavy AI dependencies, which the
+engine registry only imports on first use, is loaded at import time.
+
+Warm-up is disabled in the child (AI_ENGINE_WARM_UP=0) so only the import
+itself is measured; everything else, including the NLP resource check,
+runs as configured in the environment.
+
+Usage: python benchmarks/check_startup.py [budget_ms] [runs]
+       (budget defaults to APP_IMPORT_BUDGET_MS, 1500 ms)
+"""
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+APP_IMPORT_BUDGET_MS = int(os.environ.get('APP_IMPORT_BUDGET_MS', 1500))
+
+# Must not be imported until the engine is first used
+DEFERRED_MODULES = ['spacy', 'nltk', 'sklearn', 'scipy', 'pandas', 'pdfplumber', 'PyPDF2', 'thinc']
+
+TOP_N = 15
+
+
+def import_times():
+    """(module, self_us, cumulative_us, depth) for every import of the app"""
+    env = dict(os.environ)
+    env['AI_ENGINE_WARM_UP'] = '0'
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'],
+                            cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        sys.exit(f"import app failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((name.strip(), int(self_us), int(cumulative_us), (len(name) - len(name.lstrip())) // 2))
+    return rows
+
+
+if __name__ == "__main__":
+    budget_ms = int(sys.argv[1]) if len(sys.argv) > 1 else APP_IMPORT_BUDGET_MS
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    best = None
+    for _ in range(runs):
+        rows = import_times()
+        total_ms = next(cumulative for name, _, cumulative, _ in rows if name == 'app') / 1000
+        if best is None or total_ms < best[0]:
+            best = (total_ms, rows)
+    total_ms, rows = best
+
+    print(f"slowest imports (cumulative ms, best of {runs})")
+    for name, _, cumulative, depth in sorted(rows, key=lambda row: -row[2])[:TOP_N]:
+        print(f"  {cumulative / 1000:8.1f}  {'  ' * depth}{name}")
+
+    by_package = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        by_package[name.split('.')[0]] += self_us
+    print("\nself time by top-level package (ms)")
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:TOP_N]:
+        print(f"  {self_us / 1000:8.1f}  {package}")
+
+    loaded = {name.split('.')[0] for name, _, _, _ in rows}
+    eager = [module for module in DEFERRED_MODULES if module in loaded]
+
+    print(f"\nimport app: {total_ms:.1f} ms (budget {budget_ms} ms)")
+    print(f"heavy dependencies loaded at import: {', '.join(eager) or 'none'}")
+    if total_ms > budget_ms or eager:
+        sys.exit(1)
@@ -0,0 +1,32 @@
+"""add resumes.content_hash
+
+Revision ID: 3f1c2a9d5e10
+Revises: 
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d5e10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created by db.create_all() after this column was added already have it
+    columns = [column['name'] for column in sa.inspect(op.get_bind()).get_columns('resumes')]
+    if 'content_hash' in columns:
+        return
+    with op.batch_alter_table('resumes') as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.create_index('ix_resumes_content_hash', ['content_hash'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('resumes') as batch_op:
+        batch_op.drop_index('ix_resumes_content_hash')
+        batch_op.drop_column('content_hash')
@@ -0,0 +1,32 @@
+"""add jobs.updated_at
+
+Revision ID: 7a4e0c3b91d2
+Revises: 3f1c2a9d5e10
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a4e0c3b91d2'
+down_revision = '3f1c2a9d5e10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created by db.create_all() after this column was added already have it
+    columns = [column['name'] for column in sa.inspect(op.get_bind()).get_columns('jobs')]
+    if 'updated_at' in columns:
+        return
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    # Existing jobs count as changed when they were posted
+    op.execute('UPDATE jobs SET updated_at = posted_date')
+
+
+def downgrade():
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.drop_column('updated_at')
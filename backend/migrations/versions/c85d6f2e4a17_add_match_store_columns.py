@@ -0,0 +1,45 @@
+"""add match store columns to resume_job_matches
+
+Revision ID: c85d6f2e4a17
+Revises: 7a4e0c3b91d2
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c85d6f2e4a17'
+down_revision = '7a4e0c3b91d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created by db.create_all() after these columns were added already have them
+    inspector = sa.inspect(op.get_bind())
+    columns = [column['name'] for column in inspector.get_columns('resume_job_matches')]
+    if 'is_stale' in columns:
+        return
+    with op.batch_alter_table('resume_job_matches') as batch_op:
+        batch_op.add_column(sa.Column('detailed_scores', sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column('resume_fingerprint', sa.String(length=16), nullable=True))
+        batch_op.add_column(sa.Column('job_fingerprint', sa.String(length=16), nullable=True))
+        batch_op.add_column(sa.Column('refreshed_at', sa.DateTime(), nullable=True))
+        # Rows written before the store carry no fingerprints; mark them stale
+        # so `flask match-store refresh --stale-only` recomputes them
+        batch_op.add_column(sa.Column('is_stale', sa.Boolean(), nullable=False, server_default=sa.true()))
+        batch_op.create_index('ix_resume_job_matches_resume_score', ['resume_id', 'match_score'], unique=False)
+        batch_op.create_index('ix_resume_job_matches_job', ['job_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('resume_job_matches') as batch_op:
+        batch_op.drop_index('ix_resume_job_matches_job')
+        batch_op.drop_index('ix_resume_job_matches_resume_score')
+        batch_op.drop_column('is_stale')
+        batch_op.drop_column('refreshed_at')
+        batch_op.drop_column('job_fingerprint')
+        batch_op.drop_column('resume_fingerprint')
+        batch_op.drop_column('detailed_scores')
@@ -0,0 +1,38 @@
+"""add match_store_job_changes queue
+
+Revision ID: e4b19a7c3d58
+Revises: c85d6f2e4a17
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b19a7c3d58'
+down_revision = 'c85d6f2e4a17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created by db.create_all() after this table was added already have it
+    inspector = sa.inspect(op.get_bind())
+    if 'match_store_job_changes' in inspector.get_table_names():
+        return
+    op.create_table(
+        'match_store_job_changes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('queued_at', sa.DateTime(), nullable=True),
+        sa.Column('claimed_by', sa.String(length=32), nullable=True),
+        sa.Column('claimed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_match_store_job_changes_job_id', 'match_store_job_changes', ['job_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_match_store_job_changes_job_id', table_name='match_store_job_changes')
+    op.drop_table('match_store_job_changes')
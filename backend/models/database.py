@@ -36,6 +36,7 @@ class Resume(db.Model):
     file_path = db.Column(db.String(500), nullable=False)
     original_filename = db.Column(db.String(255), nullable=False)
     file_size = db.Column(db.Integer)  # in bytes
+    content_hash = db.Column(db.String(64), index=True)  # SHA-256 of the file content
     upload_date = db.Column(db.DateTime, default=db.func.current_timestamp())
     
     # Resume content fields
@@ -72,6 +73,7 @@ class Job(db.Model):
     salary_min = db.Column(db.Integer)  # in USD
     salary_max = db.Column(db.Integer)  # in USD
     posted_date = db.Column(db.DateTime, default=db.func.current_timestamp())
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
     deadline = db.Column(db.DateTime)
     is_active = db.Column(db.Boolean, default=True)
     
@@ -122,15 +124,39 @@ class ResumeJobMatch(db.Model):
     match_score = db.Column(db.Float, nullable=False)  # 0-100 percentage
     skills_match = db.Column(db.JSON)  # JSON object with matched/missing skills
     keyword_match = db.Column(db.Float)  # Keyword matching score
+    detailed_scores = db.Column(db.JSON)  # JSON object with per-component percentages
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
     
-    # Ensure unique resume-job pairs
-    __table_args__ = (db.UniqueConstraint('resume_id', 'job_id', name='unique_resume_job_match'),)
+    # Staleness tracking: what the score was computed from, and when
+    resume_fingerprint = db.Column(db.String(16))  # Resume matching inputs at refresh time
+    job_fingerprint = db.Column(db.String(16))  # Job matching inputs at refresh time
+    refreshed_at = db.Column(db.DateTime)  # Database time taken before the job index was synced
+    is_stale = db.Column(db.Boolean, nullable=False, default=False)  # An input changed since refreshed_at
+    
+    # Ensure unique resume-job pairs; serve a resume's best matches from an index
+    __table_args__ = (
+        db.UniqueConstraint('resume_id', 'job_id', name='unique_resume_job_match'),
+        db.Index('ix_resume_job_matches_resume_score', 'resume_id', 'match_score'),
+        db.Index('ix_resume_job_matches_job', 'job_id'),
+    )
     
     def __repr__(self):
         return f'<Match - Resume: {self.resume_id}, Job: {self.job_id}, Score: {self.match_score}>'
 
 
+class MatchStoreJobChange(db.Model):
+    __tablename__ = 'match_store_job_changes'
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, nullable=False, index=True)  # No foreign key: deleted jobs are queued too
+    queued_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    claimed_by = db.Column(db.String(32))  # Token of the worker applying the change
+    claimed_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<MatchStoreJobChange {self.job_id}>'
+
+
 class SkillGapAnalysis(db.Model):
     __tablename__ = 'skill_gap_analysis'
     
@@ -18,6 +18,7 @@ class Job(db.Model):
     salary_min = db.Column(db.Integer)  # in USD
     salary_max = db.Column(db.Integer)  # in USD
     posted_date = db.Column(db.DateTime, default=db.func.current_timestamp())
+    updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
     deadline = db.Column(db.DateTime)
     is_active = db.Column(db.Boolean, default=True)
     
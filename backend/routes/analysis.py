@@ -3,15 +3,65 @@ from models.resume import Resume
 from models.job import Job
 from models.database import db
 from routes.auth import login_required, role_required
-from ai_engine.resume_parser import ResumeParser
-from ai_engine.skill_extractor import SkillExtractor
-from ai_engine.job_matcher import JobMatcher
-from ai_engine.skill_gap_analyzer import SkillGapAnalyzer
+from ai_engine.registry import get_registry
+from ai_engine.extraction_service import ExtractionError
+from services.job_index_sync import job_match_data, sync_job_index, verify_job_index
+from services.match_store import MATCH_STORE_DEPTH, resume_match_data, resumes_analyzed, stored_matches
 from ai_engine.utils import calculate_ats_score, analyze_resume_sections
+from ai_engine.document_analysis import DocumentAnalysis
 import os
 
 analysis_bp = Blueprint('analysis', __name__)
 
+# Upper bound on resumes analysed by a single bulk request
+MAX_BULK_ANALYSIS = 500
+
+# Job matches returned per resume by default, and the most a request may ask for
+DEFAULT_JOB_MATCHES = 10
+MAX_JOB_MATCHES = 100
+
+
+def parse_match_weights(value):
+    """Weights from a `component:weight,...` query parameter, or None for the defaults"""
+    if not value:
+        return None
+    weights = {}
+    for part in value.split(','):
+        component, separator, weight = part.partition(':')
+        if not separator:
+            raise ValueError(f"Expected component:weight, got '{part.strip()}'")
+        try:
+            weights[component.strip()] = float(weight)
+        except ValueError:
+            raise ValueError(f"Weight for '{component.strip()}' must be a number")
+    return weights
+
+
+def store_analysis(resume, parsed_data, skills_data):
+    """Score a parsed resume and write the analysis results onto its record"""
+    # One analysis object per resume, seeded with what the parser computed
+    analysis = DocumentAnalysis.from_parsed(parsed_data)
+    
+    # Calculate ATS score
+    ats_score = calculate_ats_score(analysis)
+    
+    # Analyze resume sections
+    sections_analysis = analyze_resume_sections(analysis)
+    
+    # Update resume record with analysis results
+    resume.raw_text = parsed_data['raw_text']
+    resume.extracted_skills = skills_data['all_skills'] if skills_data else []
+    resume.extracted_education = parsed_data['education']
+    resume.extracted_experience = parsed_data['experience']
+    resume.extracted_contact = parsed_data['contact_info']
+    resume.ats_score = ats_score
+    resume.sections_analysis = sections_analysis
+    
+    # Set status to completed
+    resume.status = 'completed'
+    
+    return ats_score, sections_analysis
+
 
 @analysis_bp.route('/analyze-resume/<int:resume_id>', methods=['GET'])
 @login_required
@@ -30,38 +80,30 @@ def analyze_resume(resume_id):
         if user_role != 'admin' and resume.user_id != user_id:
             return jsonify({'error': 'Access denied'}), 403
         
-        # Initialize AI components
-        parser = ResumeParser()
-        extractor = SkillExtractor()
-        matcher = JobMatcher()
-        gap_analyzer = SkillGapAnalyzer()
+        # Borrow the shared AI components for this worker
+        engines = get_registry()
+        parser = engines.parser
+        extractor = engines.extractor
         
         # Parse the resume
-        parsed_data = parser.parse_resume(resume.file_path)
+        try:
+            parsed_data = parser.parse_resume(resume.file_path, digest=resume.content_hash)
+        except ExtractionError as e:
+            # Timeouts and memory-capped documents fail cleanly instead of hanging the worker
+            resume.status = 'failed'
+            db.session.commit()
+            return jsonify({'error': f'Resume could not be processed: {str(e)}'}), 422
         
         # Extract skills
         skills_data = extractor.extract_skills(parsed_data['raw_text'])
         
-        # Calculate ATS score
-        ats_score = calculate_ats_score(parsed_data['raw_text'])
-        
-        # Analyze resume sections
-        sections_analysis = analyze_resume_sections(parsed_data['raw_text'])
-        
-        # Update resume record with analysis results
-        resume.raw_text = parsed_data['raw_text']
-        resume.extracted_skills = skills_data['all_skills']
-        resume.extracted_education = parsed_data['education']
-        resume.extracted_experience = parsed_data['experience']
-        resume.extracted_contact = parsed_data['contact_info']
-        resume.ats_score = ats_score
-        resume.sections_analysis = sections_analysis
-        
-        # Set status to completed
-        resume.status = 'completed'
+        ats_score, sections_analysis = store_analysis(resume, parsed_data, skills_data)
         
         db.session.commit()
         
+        # Re-score the resume against every job for the stored matches
+        resumes_analyzed([resume])
+        
         return jsonify({
             'message': 'Resume analyzed successfully',
             'resume_id': resume.id,
@@ -78,6 +120,77 @@ def analyze_resume(resume_id):
         return jsonify({'error': str(e)}), 500
 
 
+@analysis_bp.route('/analyze-resumes', methods=['POST'])
+@login_required
+def analyze_resumes():
+    try:
+        data = request.get_json() or {}
+        resume_ids = data.get('resume_ids')
+        
+        if not isinstance(resume_ids, list) or not resume_ids:
+            return jsonify({'error': 'resume_ids must be a non-empty list'}), 400
+        
+        if len(resume_ids) > MAX_BULK_ANALYSIS:
+            return jsonify({'error': f'At most {MAX_BULK_ANALYSIS} resumes can be analyzed per request'}), 400
+        
+        try:
+            batch_size = max(1, min(int(data.get('batch_size', 64)), 1000))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'batch_size must be an integer'}), 400
+        
+        user_id = session['user_id']
+        user_role = session['user_role']
+        
+        resumes = Resume.query.filter(Resume.id.in_(resume_ids)).all()
+        
+        # Only analyze resumes the user is allowed to access
+        if user_role != 'admin':
+            resumes = [resume for resume in resumes if resume.user_id == user_id]
+        
+        engines = get_registry()
+        parser = engines.parser
+        extractor = engines.extractor
+        
+        parsed = []
+        failed = []
+        for resume in resumes:
+            try:
+                parsed.append((resume, parser.parse_resume(resume.file_path, digest=resume.content_hash)))
+            except Exception as e:
+                resume.status = 'failed'
+                failed.append({'resume_id': resume.id, 'error': str(e)})
+        
+        # Run every resume through spaCy in batches rather than one at a time
+        skills_results = extractor.extract_skills_batch(
+            [parsed_data['raw_text'] for _, parsed_data in parsed],
+            batch_size=batch_size
+        )
+        
+        analyzed = []
+        for (resume, parsed_data), skills_data in zip(parsed, skills_results):
+            ats_score, _ = store_analysis(resume, parsed_data, skills_data)
+            analyzed.append({
+                'resume_id': resume.id,
+                'ats_score': ats_score,
+                'skills_count': skills_data['count'] if skills_data else 0
+            })
+        
+        db.session.commit()
+        
+        # Re-score the analysed resumes in blocks for the stored matches
+        resumes_analyzed([resume for resume, _ in parsed])
+        
+        return jsonify({
+            'message': f'{len(analyzed)} resumes analyzed successfully',
+            'analyzed': analyzed,
+            'failed': failed
+        }), 200
+    
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
 @analysis_bp.route('/match-resume-to-jobs/<int:resume_id>', methods=['GET'])
 @login_required
 def match_resume_to_jobs(resume_id):
@@ -95,49 +208,72 @@ def match_resume_to_jobs(resume_id):
         if user_role != 'admin' and resume.user_id != user_id:
             return jsonify({'error': 'Access denied'}), 403
         
+        # Borrow the shared job matcher
+        matcher = get_registry().matcher
+        
+        try:
+            limit = int(request.args.get('limit', DEFAULT_JOB_MATCHES))
+        except ValueError:
+            return jsonify({'error': 'limit must be an integer'}), 400
+        if limit < 1 or limit > MAX_JOB_MATCHES:
+            return jsonify({'error': f'limit must be between 1 and {MAX_JOB_MATCHES}'}), 400
+        
+        # Optional custom weights, e.g. ?weights=text_similarity:0.5,skills_similarity:0.5
+        try:
+            weights = parse_match_weights(request.args.get('weights'))
+            weight_vector = matcher.weight_vector(weights)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Default-weighted matches are served from the precomputed store,
+        # unless its rows for this resume are outdated or too few
+        if weights is None and limit <= MATCH_STORE_DEPTH:
+            job_matches = stored_matches(resume, limit)
+            if job_matches is not None:
+                return jsonify({
+                    'resume_id': resume.id,
+                    'weights_used': matcher.weights_dict(weight_vector),
+                    'job_matches': job_matches
+                }), 200
+        
         # Get all active jobs
         jobs = Job.query.filter_by(is_active=True).all()
         
-        # Initialize job matcher
-        matcher = JobMatcher()
-        
         # Prepare resume data for matching
-        resume_data = {
-            'raw_text': resume.raw_text,
-            'extracted_skills': resume.extracted_skills or [],
-            'total_experience_years': len(resume.extracted_experience) if resume.extracted_experience else 0,
-            'education': resume.extracted_education
-        }
-        
-        # Match resume to all jobs
-        job_matches = []
-        for job in jobs:
-            job_data = {
-                'id': job.id,
-                'title': job.title,
-                'description': job.description,
-                'skills_required': job.skills_required or [],
-                'min_experience_years': 2,  # Default value, in a real app this would come from the job
-                'education_required': 'Bachelor'  # Default value
-            }
-            
-            match_result = matcher.match_resume_to_job(resume_data, job_data)
-            
-            job_matches.append({
+        resume_data = resume_match_data(resume)
+        
+        jobs_data = [job_match_data(job) for job in jobs]
+        
+        # Score every component against every job once, text and skills with one
+        # pass each over the index, which is kept in sync incrementally rather
+        # than refitted; the weights then blend them with one product
+        job_index = sync_job_index()
+        components = matcher.component_scores(resume_data, jobs_data, job_index=job_index)
+        match_percentages = matcher.weighted_scores(components, weight_vector)
+        
+        # Pick the winners from the score array; skill lists and recruiter names
+        # are only worked out for the jobs returned
+        top_matches = []
+        for row in matcher.rank_order(match_percentages, limit):
+            job, job_data = jobs[row], jobs_data[row]
+            overlap = job_index.skill_overlap(job.id, resume_data['extracted_skills'])
+            if overlap is None:
+                # Not indexed yet (created since the last sync)
+                overlap = matcher.get_skill_overlap(resume_data['extracted_skills'], job_data['skills_required'])
+            top_matches.append({
                 'job_id': job.id,
                 'job_title': job.title,
                 'company': job.recruiter.first_name + ' ' + job.recruiter.last_name if job.recruiter else 'Unknown',
-                'match_percentage': match_result['match_percentage'],
-                'matched_skills': match_result['matched_skills'],
-                'missing_skills': match_result['missing_skills']
+                'match_percentage': float(match_percentages[row]),
+                'detailed_scores': matcher.detailed_scores(components[row]),
+                'matched_skills': overlap[0],
+                'missing_skills': overlap[1]
             })
         
-        # Sort by match percentage
-        job_matches.sort(key=lambda x: x['match_percentage'], reverse=True)
-        
         return jsonify({
             'resume_id': resume.id,
-            'job_matches': job_matches[:10]  # Return top 10 matches
+            'weights_used': matcher.weights_dict(weight_vector),
+            'job_matches': top_matches
         }), 200
     
     except Exception as e:
@@ -162,8 +298,8 @@ def skill_gap_analysis(resume_id, job_id):
         if user_role != 'admin' and resume.user_id != user_id:
             return jsonify({'error': 'Access denied'}), 403
         
-        # Initialize skill gap analyzer
-        gap_analyzer = SkillGapAnalyzer()
+        # Borrow the shared skill gap analyzer
+        gap_analyzer = get_registry().gap_analyzer
         
         # Perform skill gap analysis
         gap_analysis = gap_analyzer.analyze_skill_gaps(
@@ -221,4 +357,20 @@ def get_analysis_summary(resume_id):
         }), 200
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+
+@analysis_bp.route('/ready', methods=['GET'])
+def engine_readiness():
+    status = get_registry().status()
+    return jsonify(status), 200 if status['ready'] else 503
+
+
+@analysis_bp.route('/job-index/verify', methods=['GET'])
+@role_required(['admin'])
+def verify_job_index_consistency():
+    try:
+        report = verify_job_index()
+        return jsonify(report), 200 if report['consistent'] else 409
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -3,6 +3,8 @@ from models.job import Job
 from models.user import User
 from models.database import db
 from routes.auth import login_required, role_required
+from services.job_index_sync import index_job, unindex_job
+from services.match_store import apply_job_changes_later, job_changed, job_match_inputs, remove_job_matches
 
 job_bp = Blueprint('job', __name__)
 
@@ -36,6 +38,10 @@ def create_job():
         db.session.add(job)
         db.session.commit()
         
+        # Make the new posting matchable straight away
+        index_job(job)
+        job_changed(job)
+        
         return jsonify({
             'message': 'Job created successfully',
             'job_id': job.id
@@ -158,6 +164,9 @@ def update_job(job_id):
         
         data = request.get_json()
         
+        # Edits that leave these alone cannot move any stored match
+        previous = job_match_inputs(job)
+        
         # Update allowed fields
         if 'title' in data:
             job.title = data['title']
@@ -184,6 +193,10 @@ def update_job(job_id):
         
         db.session.commit()
         
+        # Re-index the description, or drop the job if it was deactivated
+        index_job(job)
+        job_changed(job, previous)
+        
         return jsonify({
             'message': 'Job updated successfully',
             'job_id': job.id
@@ -210,9 +223,13 @@ def delete_job(job_id):
         if user_role != 'admin' and job.recruiter_id != user_id:
             return jsonify({'error': 'Access denied'}), 403
         
+        remove_job_matches(job_id)
         db.session.delete(job)
         db.session.commit()
         
+        unindex_job(job_id)
+        apply_job_changes_later()
+        
         return jsonify({'message': 'Job deleted successfully'}), 200
     
     except Exception as e:
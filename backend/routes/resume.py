@@ -5,6 +5,9 @@ from models.database import db
 from routes.auth import login_required, role_required
 import os
 from werkzeug.utils import secure_filename
+from ai_engine.registry import get_registry
+from services.match_store import remove_resume_matches
+import hashlib
 import uuid
 
 resume_bp = Blueprint('resume', __name__)
@@ -17,6 +20,17 @@ def allowed_file(filename):
     return os.path.splitext(filename)[1].lower() in ALLOWED_EXTENSIONS
 
 
+def _write_file(file_path, content):
+    """Save an upload, removing the partial file if the write fails"""
+    try:
+        with open(file_path, 'wb') as f:
+            f.write(content)
+    except OSError:
+        if os.path.exists(file_path):
+            os.remove(file_path)
+        raise
+
+
 @resume_bp.route('/', methods=['POST'])
 @login_required
 def upload_resume():
@@ -41,8 +55,22 @@ def upload_resume():
         unique_filename = f"{uuid.uuid4()}_{filename}"
         file_path = os.path.join(upload_dir, unique_filename)
         
-        # Save file
-        file.save(file_path)
+        # Read the upload once; hashing, saving and parsing share this buffer
+        content = file.read()
+        content_hash = hashlib.sha256(content).hexdigest()
+        
+        # Save file before parsing; a failed write ends the request with no record
+        _write_file(file_path, content)
+        
+        # Parse now so analysis is served from the parse cache without
+        # reading the file back from disk
+        try:
+            get_registry().parser.parse_resume(
+                content, file_extension=os.path.splitext(filename)[1], digest=content_hash
+            )
+        except Exception as e:
+            # Analysis parses again and reports the error there
+            print(f"Error pre-parsing resume upload: {str(e)}")
         
         # Create resume record in database
         resume = Resume(
@@ -50,12 +78,18 @@ def upload_resume():
             filename=unique_filename,
             file_path=file_path,
             original_filename=filename,
-            file_size=os.path.getsize(file_path),
+            file_size=len(content),
+            content_hash=content_hash,
             status='uploaded'
         )
         
         db.session.add(resume)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except Exception:
+            # Don't keep a file that no record points to
+            os.remove(file_path)
+            raise
         
         return jsonify({
             'message': 'Resume uploaded successfully',
@@ -206,6 +240,7 @@ def delete_resume(resume_id):
         if os.path.exists(resume.file_path):
             os.remove(resume.file_path)
         
+        remove_resume_matches(resume.id)
         db.session.delete(resume)
         db.session.commit()
         
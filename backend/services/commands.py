@@ -0,0 +1,66 @@
+import json
+import sys
+
+import click
+from flask.cli import AppGroup
+
+from services.job_index_sync import job_index_staleness, rebuild_job_index, save_job_index_artifact
+from services.match_store import apply_job_changes, match_store_status, refresh_all_matches
+
+
+# flask --app app job-index rebuild|check   (from the backend directory)
+job_index_cli = AppGroup('job-index', help='Manage the saved job index artifact.')
+
+
+@job_index_cli.command('rebuild')
+def rebuild_job_index_command():
+    """Index every active job and save the result as the current artifact"""
+    job_index = rebuild_job_index()
+    build = save_job_index_artifact()
+    if build is None:
+        click.echo(f"Indexed {len(job_index)} jobs; artifacts are disabled (JOB_INDEX_ARTIFACTS is empty)")
+        return
+    click.echo(f"Indexed {len(job_index)} jobs into {build}")
+
+
+@job_index_cli.command('check')
+def check_job_index_command():
+    """Report whether the saved artifact is behind the jobs table; exits 1 when stale"""
+    report = job_index_staleness()
+    click.echo(json.dumps(report, indent=2))
+    if report['stale']:
+        sys.exit(1)
+
+
+# flask --app app match-store refresh|apply-job-changes|status   (from the backend directory)
+match_store_cli = AppGroup('match-store', help='Manage the precomputed resume/job match scores.')
+
+
+@match_store_cli.command('refresh')
+@click.option('--stale-only', is_flag=True, help='Only refresh resumes whose stored matches are stale.')
+@click.option('--workers', type=int, default=None, help='Worker processes (default BATCH_MATCH_WORKERS).')
+def refresh_match_store_command(stale_only, workers):
+    """Re-score analysed resumes against every active job and store their top matches"""
+    refreshed = refresh_all_matches(
+        stale_only=stale_only,
+        workers=workers,
+        progress=lambda count: click.echo(f"  {count} resumes refreshed")
+    )
+    click.echo(f"Refreshed stored matches for {refreshed} resumes")
+
+
+@match_store_cli.command('apply-job-changes')
+@click.option('--workers', type=int, default=None, help='Worker processes for the backfill (default BATCH_MATCH_WORKERS).')
+def apply_job_changes_command(workers):
+    """Rescore the stored matches against the queued job writes"""
+    applied = apply_job_changes(workers=workers)
+    click.echo(f"Applied queued changes of {applied} jobs")
+
+
+@match_store_cli.command('status')
+def match_store_status_command():
+    """Report stored and stale matches; exits 1 when any resume, stored row or queued job change is stale"""
+    report = match_store_status()
+    click.echo(json.dumps(report, indent=2))
+    if report['stale']:
+        sys.exit(1)
@@ -0,0 +1,217 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from models.job import Job
+from models.database import db
+from ai_engine.registry import get_registry
+
+# How often a worker polls the jobs table for changes made by other workers
+JOB_INDEX_SYNC_INTERVAL = 5  # seconds
+
+# updated_at is taken when a row is flushed, not when it commits, so a slow
+# transaction can commit a row older than the watermark another sync already
+# moved past; every sync re-checks rows this far below the watermark
+JOB_INDEX_SYNC_LOOKBACK = int(os.environ.get('JOB_INDEX_SYNC_LOOKBACK', '60'))  # seconds
+
+# Saved job index builds, loaded memory-mapped on worker start instead of
+# re-vectorising every job; set JOB_INDEX_ARTIFACTS to an empty string to
+# always build from the jobs table
+JOB_INDEX_ARTIFACT_DIR = os.environ.get(
+    'JOB_INDEX_ARTIFACTS',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache', 'job_index')
+)
+
+_sync_lock = threading.Lock()
+_sync_state = {'synced_at': None, 'watermark': None}
+
+
+def job_match_data(job):
+    """Convert a Job row into the dict the matcher and job index work with"""
+    return {
+        'id': job.id,
+        'title': job.title,
+        'description': job.description,
+        'skills_required': job.skills_required or [],
+        'min_experience_years': 2,  # Default value, in a real app this would come from the job
+        'education_required': 'Bachelor'  # Default value
+    }
+
+
+def index_job(job):
+    """Add, replace or remove a single job in this worker's index after a write"""
+    try:
+        job_index = get_registry().job_index
+        if job.is_active:
+            job_index.upsert_job(job_match_data(job))
+        else:
+            job_index.remove_job(job.id)
+    except Exception as e:
+        # The periodic sync will pick the change up, so never fail the request
+        print(f"Error updating job index for job {job.id}: {str(e)}")
+
+
+def unindex_job(job_id):
+    """Remove a deleted job from this worker's index"""
+    try:
+        get_registry().job_index.remove_job(job_id)
+    except Exception as e:
+        print(f"Error removing job {job_id} from job index: {str(e)}")
+
+
+def rebuild_job_index():
+    """Build this worker's job index from scratch over all active jobs"""
+    with _sync_lock:
+        return _rebuild()
+
+
+def _rebuild():
+    jobs = Job.query.filter_by(is_active=True).all()
+    job_index = get_registry().job_index.build([job_match_data(job) for job in jobs])
+    _sync_state['watermark'] = max((job.updated_at for job in jobs if job.updated_at), default=None)
+    _sync_state['synced_at'] = time.time()
+    return job_index
+
+
+def save_job_index_artifact():
+    """Save this worker's job index for other workers and later restarts, returns the build path"""
+    if not JOB_INDEX_ARTIFACT_DIR:
+        return None
+    watermark = _sync_state['watermark']
+    return get_registry().job_index.save(
+        JOB_INDEX_ARTIFACT_DIR,
+        watermark=watermark.isoformat() if watermark is not None else None
+    )
+
+
+def _load_artifact(job_index):
+    """Start from the saved build, if there is a usable one"""
+    if not JOB_INDEX_ARTIFACT_DIR:
+        return False
+    try:
+        manifest = job_index.load(JOB_INDEX_ARTIFACT_DIR)
+    except Exception as e:
+        print(f"Error loading job index artifact, rebuilding: {str(e)}")
+        return False
+    if manifest is None:
+        return False
+    watermark = manifest.get('watermark')
+    _sync_state['watermark'] = datetime.fromisoformat(watermark) if watermark else None
+    return True
+
+
+def latest_job_change():
+    """Most recent posted_date or updated_at over all jobs, active or not"""
+    latest_update, latest_post = db.session.query(db.func.max(Job.updated_at), db.func.max(Job.posted_date)).one()
+    return max((value for value in (latest_update, latest_post) if value is not None), default=None)
+
+
+def job_index_staleness():
+    """Compare the saved job index artifact with the jobs table"""
+    from ai_engine.job_index import JobIndex
+
+    manifest = JobIndex.read_manifest(JOB_INDEX_ARTIFACT_DIR) if JOB_INDEX_ARTIFACT_DIR else None
+    latest = latest_job_change()
+    active_jobs = Job.query.filter_by(is_active=True).count()
+    report = {
+        'artifact_dir': JOB_INDEX_ARTIFACT_DIR or None,
+        'latest_job_change': latest.isoformat() if latest else None,
+        'active_jobs': active_jobs,
+        'artifact_version': None,
+        'artifact_watermark': None,
+        'artifact_jobs': None,
+        'stale': True,
+        'reason': 'no artifact'
+    }
+    if manifest is None:
+        return report
+
+    watermark = manifest.get('watermark')
+    report.update({
+        'artifact_version': manifest.get('version'),
+        'artifact_watermark': watermark,
+        'artifact_jobs': len(manifest.get('job_ids', [])),
+        'stale': False,
+        'reason': None
+    })
+    if manifest.get('version') != JobIndex.ARTIFACT_VERSION:
+        report.update(stale=True, reason='written by an older index version')
+    elif latest is not None and (watermark is None or latest > datetime.fromisoformat(watermark)):
+        report.update(stale=True, reason='jobs changed since the artifact was built')
+    elif report['artifact_jobs'] != active_jobs:
+        # Hard deletes leave no timestamp behind
+        report.update(stale=True, reason='active job count differs')
+    return report
+
+
+def sync_job_index(force=False):
+    """Bring this worker's job index up to date with the jobs table.
+
+    Only rows changed since the last sync are re-indexed, plus a cheap id-only
+    query to catch deletions, so no request ever waits for a full rebuild once
+    the index exists. A worker's first sync starts from the saved artifact when
+    there is one and catches up from its watermark the same way. Calls within
+    JOB_INDEX_SYNC_INTERVAL of the previous sync return immediately.
+    """
+    job_index = get_registry().job_index
+    synced_at = _sync_state['synced_at']
+    if not force and synced_at is not None and time.time() - synced_at < JOB_INDEX_SYNC_INTERVAL:
+        return job_index
+
+    # If another thread is already syncing, serve the index as it is
+    if not _sync_lock.acquire(blocking=synced_at is None or force):
+        return job_index
+    try:
+        if _sync_state['synced_at'] is None and not _load_artifact(job_index):
+            # No saved build yet: index from the jobs table and leave a build
+            # behind so the other workers and later restarts can map it
+            job_index = _rebuild()
+            try:
+                save_job_index_artifact()
+            except Exception as e:
+                print(f"Error saving job index artifact: {str(e)}")
+            return job_index
+
+        started = time.time()
+        watermark = _sync_state['watermark']
+
+        # Rows edited since the last sync, including is_active toggles, plus the
+        # lookback window for transactions that committed late (and the
+        # watermark second itself, as timestamps have second resolution); rows
+        # whose description and skills are unchanged are skipped by the index
+        changed = Job.query
+        if watermark is not None:
+            changed = changed.filter(Job.updated_at >= watermark - timedelta(seconds=JOB_INDEX_SYNC_LOOKBACK))
+        for job in changed.all():
+            if job.is_active:
+                job_index.upsert_job(job_match_data(job))
+            else:
+                job_index.remove_job(job.id)
+            if job.updated_at and (watermark is None or job.updated_at > watermark):
+                watermark = job.updated_at
+
+        # Hard deletes leave no row behind, and rows without updated_at never
+        # show up above, so reconcile the id sets as well
+        active_ids = {job_id for (job_id,) in db.session.query(Job.id).filter_by(is_active=True)}
+        indexed_ids = set(job_index.job_ids)
+        for job_id in indexed_ids - active_ids:
+            job_index.remove_job(job_id)
+        missing = active_ids - indexed_ids
+        if missing:
+            for job in Job.query.filter(Job.id.in_(missing)).all():
+                job_index.upsert_job(job_match_data(job))
+
+        _sync_state['watermark'] = watermark
+        _sync_state['synced_at'] = started
+        return job_index
+    finally:
+        _sync_lock.release()
+
+
+def verify_job_index(probe_texts=None):
+    """Compare the incrementally maintained index with a from-scratch rebuild"""
+    jobs = [job_match_data(job) for job in Job.query.filter_by(is_active=True).all()]
+    if probe_texts is None:
+        probe_texts = [job['description'] for job in jobs[:20]]
+    return get_registry().job_index.verify_against_rebuild(jobs, probe_texts)
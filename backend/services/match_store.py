@@ -0,0 +1,567 @@
+import hashlib
+import json
+import os
+import threading
+import uuid
+from datetime import timedelta
+
+from flask import current_app
+from models.database import db, MatchStoreJobChange, ResumeJobMatch
+from models.job import Job
+from models.resume import Resume
+from ai_engine.registry import get_registry
+from services.job_index_sync import job_match_data, latest_job_change, sync_job_index
+
+# Matches stored per resume; requests for more, with custom weights, or for a
+# resume whose rows are outdated are scored live instead
+MATCH_STORE_DEPTH = int(os.environ.get('MATCH_STORE_DEPTH', '100'))
+
+# Resumes written per transaction by a bulk refresh
+REFRESH_COMMIT_EVERY = 200
+
+# Apply queued job changes on a background thread of the worker that queued
+# them; with 0 they wait for `flask match-store apply-job-changes`
+MATCH_STORE_BACKGROUND_APPLY = os.environ.get('MATCH_STORE_BACKGROUND_APPLY', '1') == '1'
+
+# Seconds after which a job change claimed by a worker that never finished
+# it can be claimed by another
+JOB_CHANGE_CLAIM_TIMEOUT = int(os.environ.get('MATCH_STORE_CLAIM_TIMEOUT', '600'))
+
+_applier_lock = threading.Lock()
+_applier_state = {'thread': None, 'wanted': False}
+
+
+def resume_match_data(resume):
+    """Convert a Resume row into the dict the matcher works with"""
+    return {
+        'id': resume.id,
+        'raw_text': resume.raw_text,
+        'extracted_skills': resume.extracted_skills or [],
+        'total_experience_years': len(resume.extracted_experience) if resume.extracted_experience else 0,
+        'education': resume.extracted_education
+    }
+
+
+def _fingerprint(values):
+    payload = json.dumps(values, sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def resume_fingerprint(resume_data):
+    """Change marker for the resume fields match scores depend on"""
+    return _fingerprint([resume_data.get(field) for field in
+                         ('raw_text', 'extracted_skills', 'total_experience_years', 'education')])
+
+
+def job_fingerprint(job_data):
+    """Change marker for the job fields match scores depend on"""
+    return _fingerprint([job_data.get(field) for field in
+                         ('description', 'skills_required', 'min_experience_years', 'education_required')])
+
+
+def _database_now():
+    # Row timestamps are compared with Job.updated_at, so take them from the same clock
+    return db.session.query(db.func.current_timestamp(type_=db.DateTime)).scalar()
+
+
+def _match_rows(result, fingerprint, job_fingerprints, refreshed_at):
+    rows = []
+    for match in result['matched_jobs']:
+        details = match['details']
+        rows.append({
+            'resume_id': result['resume_id'],
+            'job_id': match['job_id'],
+            'match_score': match['match_percentage'],
+            'skills_match': {'matched': details['matched_skills'], 'missing': details['missing_skills']},
+            'keyword_match': details['detailed_scores']['text_similarity'],
+            'detailed_scores': details['detailed_scores'],
+            'resume_fingerprint': fingerprint,
+            'job_fingerprint': job_fingerprints[match['job_id']],
+            'refreshed_at': refreshed_at,
+            'is_stale': False
+        })
+    return rows
+
+
+def _replace_matches(results, fingerprints, job_fingerprints, refreshed_at):
+    """Swap the stored rows of these resumes for freshly computed ones (not committed)"""
+    results = list(results)
+    resume_ids = [result['resume_id'] for result in results]
+    ResumeJobMatch.query.filter(ResumeJobMatch.resume_id.in_(resume_ids)).delete(synchronize_session=False)
+    rows = []
+    for result in results:
+        rows.extend(_match_rows(result, fingerprints[result['resume_id']], job_fingerprints, refreshed_at))
+    if rows:
+        db.session.bulk_insert_mappings(ResumeJobMatch, rows)
+
+
+def _batch(workers):
+    """Synced job index and a BatchMatcher over every active job, with the refresh timestamp"""
+    from ai_engine.batch_matcher import BatchMatcher
+
+    # Taken before syncing, so a job changed after this point is always newer
+    # than the rows computed here
+    refreshed_at = _database_now()
+    job_index = sync_job_index(force=True)
+    jobs_data = [job_match_data(job) for job in Job.query.filter_by(is_active=True).all()]
+    job_fingerprints = {job['id']: job_fingerprint(job) for job in jobs_data}
+    batch = BatchMatcher(get_registry().matcher, jobs_data, job_index=job_index, top_k=MATCH_STORE_DEPTH,
+                         workers=workers)
+    return batch, job_fingerprints, refreshed_at
+
+
+def refresh_resume_matches(resumes, workers=1):
+    """Recompute and store the top matches of these resumes against every active job (not committed)"""
+    resumes_data = [resume_match_data(resume) for resume in resumes]
+    if not resumes_data:
+        return 0
+    batch, job_fingerprints, refreshed_at = _batch(workers)
+    fingerprints = {resume['id']: resume_fingerprint(resume) for resume in resumes_data}
+    _replace_matches(batch.iter_matches(resumes_data), fingerprints, job_fingerprints, refreshed_at)
+    return len(resumes_data)
+
+
+def _store_summaries(resume_ids=None):
+    """resume_id -> (rows, oldest refreshed_at, any row marked stale, fingerprints agree, fingerprint)"""
+    query = db.session.query(
+        ResumeJobMatch.resume_id,
+        db.func.count(ResumeJobMatch.id),
+        db.func.min(ResumeJobMatch.refreshed_at),
+        db.func.max(db.cast(ResumeJobMatch.is_stale, db.Integer)),
+        db.func.min(ResumeJobMatch.resume_fingerprint),
+        db.func.max(ResumeJobMatch.resume_fingerprint)
+    ).group_by(ResumeJobMatch.resume_id)
+    if resume_ids is not None:
+        query = query.filter(ResumeJobMatch.resume_id.in_(resume_ids))
+    return {
+        resume_id: (count, refreshed_at, bool(any_stale), low == high, low)
+        for resume_id, count, refreshed_at, any_stale, low, high in query
+    }
+
+
+def _rows_outdated(resume_data, summary):
+    _, _, any_stale, consistent, fingerprint = summary
+    if any_stale:
+        return 'rows marked stale'
+    if not consistent or fingerprint != resume_fingerprint(resume_data):
+        return 'resume changed since the last refresh'
+    return None
+
+
+def match_staleness(resume_data, summary, active_jobs, limit=MATCH_STORE_DEPTH, latest_change=None):
+    """Why a resume's stored matches cannot give its top `limit` jobs, or None if they can.
+
+    With `latest_change`, rows scored before it count as stale too: every job
+    change moves the IDF weights behind all text scores, so such rows no
+    longer match live scoring exactly.
+    """
+    if summary is None:
+        return 'no stored matches' if active_jobs else None
+    reason = _rows_outdated(resume_data, summary)
+    if reason:
+        return reason
+    refreshed_at = summary[1]
+    if latest_change is not None and (refreshed_at is None or refreshed_at < latest_change):
+        return 'scored before the latest job change'
+    if summary[0] < min(limit, active_jobs):
+        # Rows of deactivated, deleted or demoted jobs are dropped without a
+        # replacement; the rows left are still the resume's best matches
+        return 'fewer matches stored than needed'
+    return None
+
+
+def stored_matches(resume, limit):
+    """Top `limit` stored matches of a resume, or None if its stored rows cannot give them.
+
+    Rows scored before later job changes are still served: their ranking
+    holds, but their text scores keep the IDF weights of their last refresh,
+    so they can differ slightly from live scores until the next refresh
+    (`match-store status` reports them as stale).
+    """
+    active_jobs = Job.query.filter_by(is_active=True).count()
+    summary = _store_summaries([resume.id]).get(resume.id)
+    # Requests never write; outdated rows wait for `flask match-store refresh`
+    if match_staleness(resume_match_data(resume), summary, active_jobs, limit):
+        return None
+
+    rows = (db.session.query(ResumeJobMatch, Job)
+            .join(Job, Job.id == ResumeJobMatch.job_id)
+            .filter(ResumeJobMatch.resume_id == resume.id)
+            .order_by(ResumeJobMatch.match_score.desc(), ResumeJobMatch.job_id)
+            .limit(limit)
+            .all())
+    return [{
+        'job_id': job.id,
+        'job_title': job.title,
+        'company': job.recruiter.first_name + ' ' + job.recruiter.last_name if job.recruiter else 'Unknown',
+        'match_percentage': match.match_score,
+        'detailed_scores': match.detailed_scores,
+        'matched_skills': (match.skills_match or {}).get('matched', []),
+        'missing_skills': (match.skills_match or {}).get('missing', [])
+    } for match, job in rows]
+
+
+def resumes_analyzed(resumes):
+    """Refresh the stored matches of freshly analysed resumes, after their analysis is committed"""
+    try:
+        refresh_resume_matches(resumes)
+        db.session.commit()
+    except Exception as e:
+        # The fingerprint check serves them live until `flask match-store refresh`
+        db.session.rollback()
+        print(f"Error refreshing stored matches after analysis: {str(e)}")
+
+
+def _cutoffs(resume_ids, job_id):
+    """resume_id -> (rows of other jobs, (score, job_id) of the lowest ranked of them)"""
+    ranked = db.session.query(
+        ResumeJobMatch.resume_id,
+        ResumeJobMatch.job_id,
+        ResumeJobMatch.match_score,
+        db.func.row_number().over(
+            partition_by=ResumeJobMatch.resume_id,
+            order_by=(ResumeJobMatch.match_score.asc(), ResumeJobMatch.job_id.desc())
+        ).label('position'),
+        db.func.count().over(partition_by=ResumeJobMatch.resume_id).label('rows')
+    ).filter(ResumeJobMatch.resume_id.in_(resume_ids), ResumeJobMatch.job_id != job_id).subquery()
+    lowest = db.session.query(ranked.c.resume_id, ranked.c.rows, ranked.c.match_score, ranked.c.job_id)
+    return {
+        resume_id: (rows, (score, lowest_job_id))
+        for resume_id, rows, score, lowest_job_id in lowest.filter(ranked.c.position == 1)
+    }
+
+
+def refresh_job_matches(job):
+    """Bring the stored matches up to date with one job write, without rescoring the other jobs.
+
+    A deactivated job only loses its rows. An active one is scored against
+    every analysed resume with a BatchMatcher over that job alone, then takes
+    its place in a resume's rows if it ranks above the lowest of them, or if
+    they hold every other active job; past MATCH_STORE_DEPTH the lowest row is
+    evicted. A job that falls below the lowest row of a resume whose rows are
+    only a prefix of its ranking is dropped, and the rows above it stay its
+    best matches. Commits every REFRESH_COMMIT_EVERY resumes; returns the
+    number of resumes whose rows for the job were written or removed.
+    """
+    from ai_engine.batch_matcher import BatchMatcher
+
+    if not job.is_active:
+        return ResumeJobMatch.query.filter_by(job_id=job.id).delete(synchronize_session=False)
+
+    refreshed_at = _database_now()
+    job_index = sync_job_index(force=True)
+    job_data = job_match_data(job)
+    job_fingerprints = {job.id: job_fingerprint(job_data)}
+    other_jobs = Job.query.filter(Job.is_active.is_(True), Job.id != job.id).count()
+    batch = BatchMatcher(get_registry().matcher, [job_data], job_index=job_index, top_k=1, workers=1)
+
+    resume_ids = [resume_id for (resume_id,) in
+                  db.session.query(Resume.id).filter_by(status='completed').order_by(Resume.id)]
+    changed = 0
+    for resumes in _resume_chunks(resume_ids, REFRESH_COMMIT_EVERY):
+        chunk_ids = [resume.id for resume in resumes]
+        summaries = _store_summaries(chunk_ids)
+        cutoffs = _cutoffs(chunk_ids, job.id)
+        stored = {resume_id for (resume_id,) in db.session.query(ResumeJobMatch.resume_id).filter(
+            ResumeJobMatch.job_id == job.id, ResumeJobMatch.resume_id.in_(chunk_ids))}
+
+        # Resumes with outdated rows, or none while there are other jobs, are
+        # left to a full refresh
+        resumes_data, fingerprints = [], {}
+        for resume in resumes:
+            resume_data = resume_match_data(resume)
+            summary = summaries.get(resume.id)
+            if summary is None:
+                if other_jobs:
+                    continue
+            elif _rows_outdated(resume_data, summary):
+                continue
+            fingerprints[resume.id] = resume_fingerprint(resume_data)
+            resumes_data.append(resume_data)
+
+        rows, evicted = [], []
+        for result in batch.iter_matches(resumes_data):
+            resume_id = result['resume_id']
+            row = _match_rows(result, fingerprints[resume_id], job_fingerprints, refreshed_at)[0]
+            count, (lowest_score, lowest_job_id) = cutoffs.get(resume_id, (0, (None, None)))
+            ahead = count > 0 and (row['match_score'], -job.id) > (lowest_score, -lowest_job_id)
+            keep = ahead or count >= other_jobs
+            if keep and count + 1 > MATCH_STORE_DEPTH:
+                # A full store: the job pushes the lowest row out, or stays out itself
+                if ahead:
+                    evicted.append((resume_id, lowest_job_id))
+                else:
+                    keep = False
+            if keep:
+                rows.append(row)
+            if keep or resume_id in stored:
+                changed += 1
+
+        ResumeJobMatch.query.filter(ResumeJobMatch.job_id == job.id,
+                                    ResumeJobMatch.resume_id.in_(list(fingerprints))).delete(synchronize_session=False)
+        if evicted:
+            ResumeJobMatch.query.filter(
+                db.tuple_(ResumeJobMatch.resume_id, ResumeJobMatch.job_id).in_(evicted)
+            ).delete(synchronize_session=False)
+        if rows:
+            db.session.bulk_insert_mappings(ResumeJobMatch, rows)
+        db.session.commit()
+    return changed
+
+
+def job_match_inputs(job):
+    """What a job's stored matches depend on, to tell edits that cannot change any score"""
+    return job.is_active, job_fingerprint(job_match_data(job))
+
+
+def job_changed(job, previous=None):
+    """Queue a committed job create, edit or deactivation for the stored matches.
+
+    `previous` is job_match_inputs(job) from before an edit; edits that leave
+    it unchanged (title, salary, location, ...) are skipped. A deactivated
+    job loses its rows at once, with one indexed delete. Rescoring an active
+    job against every analysed resume happens off the request, on a
+    background thread or in `flask match-store apply-job-changes`; until then
+    `stored_matches` serves the resumes it affects from their previous rows.
+    """
+    if previous is not None and previous == job_match_inputs(job):
+        return
+    try:
+        if not job.is_active:
+            ResumeJobMatch.query.filter_by(job_id=job.id).delete(synchronize_session=False)
+        # The queued change also backfills the resumes a dropped job leaves short
+        db.session.add(MatchStoreJobChange(job_id=job.id))
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error queueing stored match update for job {job.id}: {str(e)}")
+        return
+    apply_job_changes_later()
+
+
+def apply_job_changes_later():
+    """Apply the queued job changes on a background thread of this process"""
+    if not MATCH_STORE_BACKGROUND_APPLY:
+        return
+    app = current_app._get_current_object()
+    with _applier_lock:
+        _applier_state['wanted'] = True
+        if _applier_state['thread'] is None:
+            thread = threading.Thread(target=_apply_in_background, args=(app,),
+                                      name='match-store-job-changes', daemon=True)
+            _applier_state['thread'] = thread
+            thread.start()
+
+
+def _apply_in_background(app):
+    with app.app_context():
+        while True:
+            # Changes queued while a pass runs ask for another one
+            with _applier_lock:
+                if not _applier_state['wanted']:
+                    _applier_state['thread'] = None
+                    return
+                _applier_state['wanted'] = False
+            try:
+                apply_job_changes()
+            except Exception as e:
+                db.session.rollback()
+                print(f"Error applying queued job changes: {str(e)}")
+
+
+def _claimable(now):
+    return db.or_(MatchStoreJobChange.claimed_at.is_(None),
+                  MatchStoreJobChange.claimed_at < now - timedelta(seconds=JOB_CHANGE_CLAIM_TIMEOUT))
+
+
+def _claim_job_changes(job_id, token):
+    """Ids of the queued changes of a job, claimed with `token`, or [] if another worker holds the job"""
+    now = _database_now()
+    MatchStoreJobChange.query.filter(MatchStoreJobChange.job_id == job_id, _claimable(now)).update(
+        {'claimed_by': token, 'claimed_at': now}, synchronize_session=False)
+    db.session.commit()
+    claims = db.session.query(MatchStoreJobChange.id, MatchStoreJobChange.claimed_by).filter(
+        MatchStoreJobChange.job_id == job_id).all()
+    if any(claimed_by != token for _, claimed_by in claims):
+        # Another worker is applying the job; it picks these up when it is done
+        _release_job_changes(token)
+        return []
+    return [change_id for change_id, _ in claims]
+
+
+def _release_job_changes(token):
+    MatchStoreJobChange.query.filter_by(claimed_by=token).update(
+        {'claimed_by': None, 'claimed_at': None}, synchronize_session=False)
+    db.session.commit()
+
+
+def apply_job_changes(workers=1):
+    """Apply the queued job changes to the stored matches, then backfill the resumes they left short.
+
+    Each job is claimed before it is rescored, so workers sharing the queue
+    never apply one job twice at once; a claim left by a worker that died is
+    taken over after JOB_CHANGE_CLAIM_TIMEOUT seconds. A change that fails
+    stays queued for the next pass. Returns the number of jobs applied.
+    """
+    token = uuid.uuid4().hex
+    applied, skipped = 0, set()
+    while True:
+        now = _database_now()
+        held = {job_id for (job_id,) in db.session.query(MatchStoreJobChange.job_id).filter(
+            db.not_(_claimable(now))).distinct()}
+        job_ids = [job_id for (job_id,) in db.session.query(MatchStoreJobChange.job_id).distinct()
+                   if job_id not in held and job_id not in skipped]
+        if not job_ids:
+            break
+        for job_id in job_ids:
+            change_ids = _claim_job_changes(job_id, token)
+            if not change_ids:
+                skipped.add(job_id)
+                continue
+            try:
+                job = db.session.get(Job, job_id)
+                if job is None:
+                    ResumeJobMatch.query.filter_by(job_id=job_id).delete(synchronize_session=False)
+                else:
+                    refresh_job_matches(job)
+                MatchStoreJobChange.query.filter(MatchStoreJobChange.id.in_(change_ids)).delete(
+                    synchronize_session=False)
+                db.session.commit()
+                applied += 1
+            except Exception as e:
+                db.session.rollback()
+                print(f"Error applying queued changes of job {job_id}: {str(e)}")
+                skipped.add(job_id)
+                _release_job_changes(token)
+
+    if applied:
+        # Dropped and demoted jobs leave resumes with fewer rows than they
+        # need, and resumes with no rows at all are only scored in full
+        refresh_all_matches(stale_only=True, include_drifted=False, workers=workers)
+    return applied
+
+
+def remove_job_matches(job_id):
+    """Delete a job's stored matches ahead of deleting the job, and queue the backfill (not committed).
+
+    Handled like a deactivation: the resumes the job leaves short are
+    refilled when the queued change is applied; call apply_job_changes_later
+    once the delete is committed.
+    """
+    ResumeJobMatch.query.filter_by(job_id=job_id).delete(synchronize_session=False)
+    db.session.add(MatchStoreJobChange(job_id=job_id))
+
+
+def remove_resume_matches(resume_id):
+    """Delete a resume's stored matches ahead of deleting the resume (not committed)"""
+    ResumeJobMatch.query.filter_by(resume_id=resume_id).delete(synchronize_session=False)
+
+
+def _resume_chunks(resume_ids, chunk_size):
+    for start in range(0, len(resume_ids), chunk_size):
+        chunk = resume_ids[start:start + chunk_size]
+        yield Resume.query.filter(Resume.id.in_(chunk)).order_by(Resume.id).all()
+
+
+def refresh_all_matches(stale_only=False, workers=None, progress=None, include_drifted=True):
+    """Refresh the stored matches of every analysed resume, or only the stale ones.
+
+    Resumes are scored in blocks by a BatchMatcher across worker processes
+    and written as the results stream back, REFRESH_COMMIT_EVERY resumes per
+    transaction. Without `include_drifted`, stale_only leaves out resumes
+    whose only fault is being scored before the latest job change. Returns
+    the number of resumes refreshed.
+    """
+    resume_ids = [resume_id for (resume_id,) in
+                  db.session.query(Resume.id).filter_by(status='completed').order_by(Resume.id)]
+    if not resume_ids:
+        return 0
+
+    latest_change = latest_job_change() if include_drifted else None
+    active_jobs = Job.query.filter_by(is_active=True).count()
+    summaries = _store_summaries() if stale_only else {}
+    batch, job_fingerprints, refreshed_at = _batch(workers)
+
+    fingerprints = {}
+
+    def resumes_to_refresh():
+        for resumes in _resume_chunks(resume_ids, REFRESH_COMMIT_EVERY):
+            for resume in resumes:
+                resume_data = resume_match_data(resume)
+                if stale_only and not match_staleness(resume_data, summaries.get(resume.id), active_jobs,
+                                                     latest_change=latest_change):
+                    continue
+                fingerprints[resume.id] = resume_fingerprint(resume_data)
+                yield resume_data
+
+    refreshed = 0
+    pending = []
+    for result in batch.iter_matches(resumes_to_refresh()):
+        pending.append(result)
+        if len(pending) == REFRESH_COMMIT_EVERY:
+            _replace_matches(pending, fingerprints, job_fingerprints, refreshed_at)
+            db.session.commit()
+            refreshed += len(pending)
+            pending = []
+            if progress:
+                progress(refreshed)
+    if pending:
+        _replace_matches(pending, fingerprints, job_fingerprints, refreshed_at)
+        db.session.commit()
+        refreshed += len(pending)
+    return refreshed
+
+
+def match_store_status():
+    """Stored matches per analysed resume and row, and how many of them are stale"""
+    latest_change = latest_job_change()
+    active_jobs = Job.query.filter_by(is_active=True).count()
+    summaries = _store_summaries()
+
+    resume_ids = [resume_id for (resume_id,) in
+                  db.session.query(Resume.id).filter_by(status='completed').order_by(Resume.id)]
+    reasons = {}
+    stale_resumes = 0
+    for resumes in _resume_chunks(resume_ids, REFRESH_COMMIT_EVERY):
+        for resume in resumes:
+            reason = match_staleness(resume_match_data(resume), summaries.get(resume.id), active_jobs,
+                                     latest_change=latest_change)
+            if reason:
+                stale_resumes += 1
+                reasons[reason] = reasons.get(reason, 0) + 1
+
+    # A row is stale when it was marked so, or its job changed, was deactivated
+    # or was deleted after the row was computed
+    job_fingerprints = {job.id: job_fingerprint(job_match_data(job)) for job in Job.query.filter_by(is_active=True)}
+    stale_rows = 0
+    for job_id, fingerprint, is_stale, rows in db.session.query(
+            ResumeJobMatch.job_id,
+            ResumeJobMatch.job_fingerprint,
+            ResumeJobMatch.is_stale,
+            db.func.count(ResumeJobMatch.id)
+    ).group_by(ResumeJobMatch.job_id, ResumeJobMatch.job_fingerprint, ResumeJobMatch.is_stale):
+        if is_stale or job_fingerprints.get(job_id) != fingerprint:
+            stale_rows += rows
+
+    # Job writes only rescore the job written; other rows keep the IDF weights
+    # of their last refresh, which drift a little with every change to the
+    # corpus. Their resumes are stale above, and refreshed by --stale-only
+    drifted_rows = 0
+    if latest_change is not None:
+        drifted_rows = (db.session.query(db.func.count(ResumeJobMatch.id))
+                        .filter(ResumeJobMatch.refreshed_at < latest_change).scalar())
+    # Jobs written but not yet rescored against the stored matches
+    queued_jobs = db.session.query(db.func.count(db.distinct(MatchStoreJobChange.job_id))).scalar()
+    return {
+        'depth': MATCH_STORE_DEPTH,
+        'analyzed_resumes': len(resume_ids),
+        'active_jobs': active_jobs,
+        'latest_job_change': latest_change.isoformat() if latest_change else None,
+        'stored_rows': db.session.query(db.func.count(ResumeJobMatch.id)).scalar(),
+        'stale_rows': stale_rows,
+        'rows_scored_before_latest_job_change': drifted_rows,
+        'stale_resumes': stale_resumes,
+        'stale_reasons': reasons,
+        'queued_job_changes': queued_jobs,
+        'stale': stale_resumes > 0 or stale_rows > 0 or queued_jobs > 0
+    }